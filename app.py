@@ -5,8 +5,12 @@ import streamlit as st
 import os
 
 from axpile.models import PileData_alpha, SoilLayer, validate_inputs, SoilBehavior, SoilType, Method
-from axpile.calc import compute_distributions
-from axpile.plots import plot_depth_vs_components, plot_depth_vs_qall, plot_soil_profile, plot_pilecap_layout
+from axpile.cache import cached_compute_capacity, cached_compute_distributions
+from axpile.calc import changed_layer_index, update_distributions
+from axpile.cpt import CptSounding, compute_schmertmann
+from axpile.methods import METHODS
+from axpile.group import EFFICIENCY_METHODS, MIN_SPACING_FACTOR, check_layouts, group_efficiency
+from axpile.plots import plot_cpt, plot_depth_vs_components, plot_depth_vs_qall, plot_soil_profile, plot_pilecap_layout
 from axpile.geometry import (
     compute_pile_perimeter_m_from_diameter,
     compute_pile_tip_area_m2_from_diameter
@@ -21,6 +25,19 @@ SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
+def show_summary(recap: dict) -> None:
+    st.subheader("Summary")
+    colA, colB, colC, colD = st.columns(4)
+    colA.metric("Ab (m²)", f"{recap['Ab_m2']:.4f}")
+    colA.metric("Perimeter (m)", f"{recap['Perimeter_m']:.3f}")
+    colB.metric("Pile Length (m)", f"{recap['Pilelength_m']:.2f}")
+    colB.metric("Cut-off Pile (m)", f"{recap['Cutoff_m']:.2f}")
+    colC.metric("Qb @tip (kN)", f"{recap['Qb_at_tip_kN']:.1f}")
+    colC.metric("Qfs total (kN)", f"{recap['Qfs_total_kN']:.1f}")
+    colD.metric("Qult total (kN)", f"{recap['Qult_total_kN']:.1f}")
+    colD.metric("Qall total (kN)", f"{recap['Qall_total_kN']:.1f}")
+
+
 def main() -> None:
     st.set_page_config(page_title="TerraPile | Pile Bearing Capacity Analysis", layout="wide")
     st.title("TerraPile")    
@@ -74,7 +91,7 @@ def main() -> None:
             )
             fs = st.number_input("Safety Factor (FS)", min_value=0.0, value=2.5, format="%.1f")
 
-            if method == "Decourt-Quaresma" or method =="Mayerhof":
+            if method in METHODS:
                 st.header("Pile Input")
                 diameter_m = st.number_input("Pile Diameter (m)", min_value=0.0, format="%.3f")
                 # share pile diameter across tabs
@@ -102,14 +119,26 @@ def main() -> None:
                         )
                     else:
                         pile_types="Driven Pile"
+                if method == "Reese & Wright":
+                    # Korelasi tiang bor; tidak bergantung tipe/material tiang
+                    pile_material = None
+                    pile_types = None
 
                 dz=st.number_input("Vertical Increment", min_value = 0.05, format ="%.2f" )
+            elif method == "Schmertmann":
+                st.header("Pile Input")
+                diameter_m = st.number_input("Pile Diameter (m)", min_value=0.0, format="%.3f")
+                st.session_state["pile_diameter_m"] = diameter_m
+                pile_depth_m = st.number_input("Depth of Pile (m)", min_value=0.0, format="%.2f")
+                cutoff_m = st.number_input("Cut-Off Pile (m)", min_value=0.0, format="%.2f")
+                ks = st.number_input("Friction Ratio, Ks", min_value=0.0, value=1.0, format="%.2f")
+                dz = st.number_input("Vertical Increment", min_value=0.01, value=0.05, format="%.2f")
             else:
                 st.header("Pile Input")
                 st.subheader("Coming Soon, Under Developement..")
             
         #INPUT
-        if method=="Decourt-Quaresma" or method == "Mayerhof":
+        if method in METHODS:
 
             st.header("Soil Layer Along Pile Shaft")
             st.caption(f"Analysis Method: {method}")
@@ -210,32 +239,64 @@ def main() -> None:
                                     phi=phi
                                 )
                             )
+
+                    # REESE & WRIGHT METHOD INPUT
+                    if method == "Reese & Wright":
+                        soil_behavior = col2.selectbox(
+                            f"Soil Behavior #{i+1}", options=("clay","sand"), key=f"behavior_{i}"
+                        )
+                        if soil_behavior == "clay":
+                            su=col3.number_input(
+                                f"Su #{i+1} (kPa)", min_value=0.0, format="%.2f", key=f"su_{i}"
+                            )
+                            layers.append(
+                                SoilLayer(
+                                    thickness_m=thickness,
+                                    soil_behavior=soil_behavior,
+                                    soil_type=soil_behavior,
+                                    su=su
+                                )
+                            )
+                        if soil_behavior == "sand":
+                            nspt=col3.number_input(
+                                f"NSPT #{i+1}", min_value=1, key=f"nspt_{i}"
+                            )
+                            layers.append(
+                                SoilLayer(
+                                    thickness_m=thickness,
+                                    soil_behavior=soil_behavior,
+                                    soil_type=soil_behavior,
+                                    nspt=nspt
+                                )
+                            )
             st.divider()
             run = st.button("Run")
 
             if run:
                 try:
-                    # Initialize pile_material for Decourt-Quaresma (not used but needed for function call)
-                    if method == "Decourt-Quaresma":
+                    # pile_material hanya dipakai Mayerhof (tetap diperlukan untuk pemanggilan fungsi)
+                    if method != "Mayerhof":
                         pile_material = None
                     
                     validate_inputs(method, diameter_m, pile_depth_m, cutoff_m, fs, dz, layers)
-                    df, recap = compute_distributions(method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers)
+                    inputs = (method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz)
+                    # Bila hanya satu lapisan yang berubah sejak run terakhir, hitung ulang sebagian saja
+                    changed = None
+                    prev_inputs = st.session_state.get("single_inputs")
+                    if prev_inputs is not None and prev_inputs[0] == inputs and "single_df" in st.session_state:
+                        changed = changed_layer_index(prev_inputs[1], layers)
+                    if changed is not None:
+                        previous = (st.session_state["single_df"], st.session_state["single_recap"])
+                        df, recap = update_distributions(previous, changed, *inputs, layers)
+                    else:
+                        df, recap = cached_compute_distributions(*inputs, layers)
                     # simpan hasil single-pile agar persisten antar rerun
                     st.session_state["single_df"] = df
                     st.session_state["single_recap"] = recap
+                    st.session_state["single_inputs"] = (inputs, layers)
     
     
-                    st.subheader("Summary")
-                    colA, colB, colC, colD = st.columns(4)
-                    colA.metric("Ab (m²)", f"{recap['Ab_m2']:.4f}")
-                    colA.metric("Perimeter (m)", f"{recap['Perimeter_m']:.3f}")
-                    colB.metric("Pile Length (m)", f"{recap['Pilelength_m']:.2f}")            
-                    colB.metric("Cut-off Pile (m)", f"{recap['Cutoff_m']:.2f}")
-                    colC.metric("Qb @tip (kN)", f"{recap['Qb_at_tip_kN']:.1f}")
-                    colC.metric("Qfs total (kN)", f"{recap['Qfs_total_kN']:.1f}")
-                    colD.metric("Qult total (kN)", f"{recap['Qult_total_kN']:.1f}")
-                    colD.metric("Qall total (kN)", f"{recap['Qall_total_kN']:.1f}")
+                    show_summary(recap)
     
                     col1A, col2A = st.columns(2)
                     plot_height = 800
@@ -266,6 +327,49 @@ def main() -> None:
                 except Exception as exc:
                     st.error(str(exc))
 
+        elif method == "Schmertmann":
+            st.header("CPT Sounding")
+            st.caption("CSV columns: depth (m), qc, sleeve friction fs (one row per reading).")
+            col1, col2 = st.columns(2)
+            cpt_file = col1.file_uploader("CPT data (.csv)", type=["csv"])
+            cpt_unit = col2.selectbox("qc / fs unit", options=("MPa", "kPa"))
+            run = st.button("Run")
+
+            if run:
+                try:
+                    import pandas as pd
+
+                    if cpt_file is None:
+                        raise ValueError("Upload CPT data first")
+                    raw = pd.read_csv(cpt_file).iloc[:, :3].to_numpy(dtype=float)
+                    scale = 1000.0 if cpt_unit == "MPa" else 1.0
+                    cpt = CptSounding(raw[:, 0], raw[:, 1] * scale, raw[:, 2] * scale)
+                    result = compute_schmertmann(diameter_m, pile_depth_m, cutoff_m, fs, dz, cpt, ks=ks)
+                    df, recap = result.dataframe, result.recap
+                    st.session_state["single_recap"] = recap
+
+                    show_summary(recap)
+                    col1A, col2A = st.columns(2)
+                    plot_height = 800
+                    plot_config = {
+                        "displayModeBar": False,
+                        "staticPlot": False
+                    }
+                    with col1A:
+                        st.subheader("Depth vs Qfs, Qb, Qult, Qall")
+                        fig1 = plot_depth_vs_components(df)
+                        fig1.update_layout(height=plot_height)
+                        st.plotly_chart(fig1, use_container_width=True, config=plot_config)
+                    with col2A:
+                        st.subheader("CPT Profile")
+                        fig2 = plot_cpt(cpt)
+                        fig2.update_layout(height=plot_height)
+                        st.plotly_chart(fig2, use_container_width=True, config=plot_config)
+                    st.subheader("Summary Data")
+                    st.dataframe(df, use_container_width=True, height=800, hide_index=True)
+                except Exception as exc:
+                    st.error(str(exc))
+
         else:
             st.subheader(f"Coming Soon, {method}'s Method is Under Developement..")
 
@@ -273,6 +377,7 @@ def main() -> None:
         st.caption("Group Pile Analysis")
         col1, col2, col3, col4 = st.columns(4)
         spacing = col1.number_input("Spacing (m)", min_value=0.0, value=diameter_m*2.5, format="%.2f", key="spacing")
+        eff_method = col2.selectbox("Efficiency Method", EFFICIENCY_METHODS, key="eff_method")
 
         n_group = st.number_input("Number of Groups", min_value=1, step=1, key="n_groups")
         for g in range(1, int(n_group) + 1):
@@ -317,15 +422,14 @@ def main() -> None:
         st.divider()
         if st.button("Calculate Pile Efficiency", key="calc_eff_all"):
             try:
-                import math
                 import pandas as pd
                 # Jalankan ulang single pile analysis (kalau belum ada di session_state)
-                if "single_recap" not in st.session_state or "single_df" not in st.session_state:
-                    if method == "Decourt-Quaresma":
+                # Hanya recap yang dibutuhkan, jadi DataFrame tidak dibangun
+                if "single_recap" not in st.session_state:
+                    if method != "Mayerhof":
                         pile_material = None
                     validate_inputs(method, diameter_m, pile_depth_m, cutoff_m, fs, dz, layers)
-                    df, recap = compute_distributions(method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers)
-                    st.session_state["single_df"] = df
+                    recap = cached_compute_capacity(method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers).recap
                     st.session_state["single_recap"] = recap
                 else:
                     recap = st.session_state["single_recap"]
@@ -339,53 +443,61 @@ def main() -> None:
                 else:
                     results =[]
                     with st.expander ("Pile Group Summary", expanded=True):
-                        st.caption("Converse – Labarre Method")
+                        st.caption(f"{eff_method} Method")
+                        groups = []
                         for g in range(1, int(n_group) + 1):
-                            
-                                edited = st.session_state.get(f"group_{g}_df", None)
-                                n_pile = st.session_state.get(f"n_pile_{g}", 0)
-
-                                if edited is None or n_pile == 0:
-                                    st.warning(f"Group #{g} data is incomplete.")
-                                    continue
-
-                                # Hitung parameter dasar
-                                alpha_deg = math.degrees(math.atan(d / s))
-                                n_cols = len(edited["X (m)"].unique())
-                                n_rows = len(edited["Y (m)"].unique())
-
-                                # Efisiensi kelompok
-                                η = 1 - (alpha_deg * ((n_cols - 1) * n_rows + (n_rows - 1) * n_cols)) / (90 * n_rows * n_cols)
-                                η = max(0, η)
-
-                                # Kapasitas total
-                                Qgroup_effsingle = η * Qall_single
-                                Qgroup_eff = η * Qall_single * int(n_pile)
-
-                                # Simpan ke list hasil
-                                results.append({
-                                    "Group": g,
-                                    "Rows (m)": n_rows,
-                                    "Columns (n)": n_cols,
-                                    "α (deg)": round(alpha_deg, 2),
-                                    "η (Efficiency)": round(η, 3),
-                                    "Single Pile, Qall (kN)": round(Qall_single, 1),
-                                    "Single Pile After Efficiency, Qall (kN)": round(Qgroup_effsingle, 1),
-                                    "Total Piles": int(n_pile),
-                                    "Group, Qall (kN)": round(Qgroup_eff, 1)
-                                })
-
-                                # Tampilkan hasil per group
-                                st.subheader(f"Group #{g} Efficiency Summary")
-                                colA, colB, colC, colD = st.columns(4)
-                                colA.metric("Rows (m)", f"{n_rows}")
-                                colA.metric("Columns (n)", f"{n_cols}")
-                                colB.metric("α (deg)", f"{alpha_deg:.2f}")
-                                colB.metric("η (Efficiency)", f"{η:.3f}")
-                                colC.metric("Single Pile, Qall (kN)", f"{Qall_single:.1f}")
-                                colC.metric("Total Piles", f"{int(n_pile)}")
-                                colD.metric("Single Pile After Efficiency, Qall (kN)", f"{Qgroup_effsingle:.1f}")
-                                colD.metric("Group, Qall (kN)", f"{Qgroup_eff:.1f}")
+                            edited = st.session_state.get(f"group_{g}_df", None)
+                            n_pile = st.session_state.get(f"n_pile_{g}", 0)
+                            if edited is None or n_pile == 0:
+                                st.warning(f"Group #{g} data is incomplete.")
+                                continue
+                            groups.append((g, edited))
+
+                        # Efisiensi semua group dihitung sekaligus
+                        eff = group_efficiency([edited for _, edited in groups], d, s, method=eff_method)
+                        checks = check_layouts([edited for _, edited in groups], d)
+                        for i, (g, edited) in enumerate(groups):
+                            if checks.n_overlapping[i] > 0:
+                                st.warning(f"Group #{g}: {checks.n_overlapping[i]} pile(s) overlap another pile.")
+                            elif checks.n_too_close[i] > 0:
+                                st.warning(
+                                    f"Group #{g}: {checks.n_too_close[i]} pile(s) closer than "
+                                    f"{MIN_SPACING_FACTOR:g}D ({MIN_SPACING_FACTOR * d:.2f} m)."
+                                )
+                            n_pile = int(eff.n_piles[i])
+                            n_rows = int(eff.n_rows[i])
+                            n_cols = int(eff.n_cols[i])
+                            alpha_deg = float(eff.theta_deg[i])
+                            η = float(eff.efficiency[i])
+
+                            # Kapasitas total
+                            Qgroup_effsingle = η * Qall_single
+                            Qgroup_eff = η * Qall_single * int(n_pile)
+
+                            # Simpan ke list hasil
+                            results.append({
+                                "Group": g,
+                                "Rows (m)": n_rows,
+                                "Columns (n)": n_cols,
+                                "α (deg)": round(alpha_deg, 2),
+                                "η (Efficiency)": round(η, 3),
+                                "Single Pile, Qall (kN)": round(Qall_single, 1),
+                                "Single Pile After Efficiency, Qall (kN)": round(Qgroup_effsingle, 1),
+                                "Total Piles": int(n_pile),
+                                "Group, Qall (kN)": round(Qgroup_eff, 1)
+                            })
+
+                            # Tampilkan hasil per group
+                            st.subheader(f"Group #{g} Efficiency Summary")
+                            colA, colB, colC, colD = st.columns(4)
+                            colA.metric("Rows (m)", f"{n_rows}")
+                            colA.metric("Columns (n)", f"{n_cols}")
+                            colB.metric("α (deg)", f"{alpha_deg:.2f}")
+                            colB.metric("η (Efficiency)", f"{η:.3f}")
+                            colC.metric("Single Pile, Qall (kN)", f"{Qall_single:.1f}")
+                            colC.metric("Total Piles", f"{int(n_pile)}")
+                            colD.metric("Single Pile After Efficiency, Qall (kN)", f"{Qgroup_effsingle:.1f}")
+                            colD.metric("Group, Qall (kN)", f"{Qgroup_eff:.1f}")
 
                     # Setelah semua group dihitung, ubah ke DataFrame dan tampilkan
                     if results:
@@ -1,13 +1,60 @@
-from .models import SoilLayer, SoilBehavior
+from .models import PileConfig, SoilLayer, SoilBehavior, SoilProfile
 from .geometry import compute_pile_perimeter_m_from_diameter, compute_pile_tip_area_m2_from_diameter
-from .calc import compute_distributions
+from .methods import CapacityMethod, get_method, register_method
+from .calc import compute_capacity, compute_distributions, iter_capacity, iter_distribution_rows
+from .result import CapacityResult
+from .curve import CapacityCurve, capacity_curve
+from .cpt import CptSounding, compute_schmertmann
+from .sweep import SweepResult, sweep_distributions
+from .optimize import PileDesign, PileOptimizer
+from .project import run_project
+from .cache import CapacityCache, cached_compute_capacity, cached_compute_distributions
+from .group import GroupEfficiency, LayoutCheck, PileLayouts, check_layouts, group_efficiency, nearest_spacing
+from .reliability import ReliabilityResult, Uncertainty, monte_carlo_capacity
+from .sensitivity import SensitivityResult, sensitivity_analysis
+from .instrument import JsonLinesSink, LoggingSink, RunMetrics
 
 __all__ = [
+    "PileConfig",
     "SoilLayer",
     "SoilBehavior",
+    "SoilProfile",
     "compute_pile_tip_area_m2_from_diameter",
     "compute_pile_perimeter_m_from_diameter",
+    "CapacityMethod",
+    "register_method",
+    "get_method",
     "compute_distributions",
+    "compute_capacity",
+    "iter_capacity",
+    "iter_distribution_rows",
+    "CapacityResult",
+    "CapacityCurve",
+    "capacity_curve",
+    "CptSounding",
+    "compute_schmertmann",
+    "SweepResult",
+    "sweep_distributions",
+    "PileDesign",
+    "PileOptimizer",
+    "run_project",
+    "CapacityCache",
+    "cached_compute_capacity",
+    "cached_compute_distributions",
+    "PileLayouts",
+    "GroupEfficiency",
+    "group_efficiency",
+    "LayoutCheck",
+    "check_layouts",
+    "nearest_spacing",
+    "Uncertainty",
+    "ReliabilityResult",
+    "monte_carlo_capacity",
+    "SensitivityResult",
+    "sensitivity_analysis",
+    "RunMetrics",
+    "LoggingSink",
+    "JsonLinesSink",
 ]
 
 
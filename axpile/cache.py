@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import partial
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+from .calc import compute_capacity
+from .curve import CapacityCurve
+from .models import SOIL_PARAMS, Layers, as_profile
+from .result import CapacityResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Naikkan bila hasil perhitungan berubah supaya entri lama di disk tidak terpakai
+CACHE_VERSION = 4
+
+# Array ``CapacityCurve`` yang ikut disimpan di tier disk (selain ``fs``)
+_CURVE_ARRAYS = ("breaks", "layer", "shaft", "tip_num", "tip_den")
+
+
+def cache_key(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+) -> str:
+    """Hash kanonik (sha256) dari seluruh input ``compute_capacity``.
+
+    Angka dinormalisasi ke float64 sehingga ``nspt=5`` dan ``nspt=5.0``
+    menghasilkan key yang sama, begitu juga daftar ``SoilLayer`` dan
+    ``SoilProfile`` yang isinya sama.
+    """
+    profile = as_profile(layers)
+    h = hashlib.sha256()
+    scalars = [
+        CACHE_VERSION,
+        method,
+        float(diameter_m),
+        float(pile_depth_m),
+        float(cutoff_m),
+        float(fs),
+        float(dz),
+        pile_material,
+        pile_types,
+    ]
+    h.update(json.dumps([repr(v) for v in scalars]).encode())
+    for name in ("thickness_m", "behavior_code") + SOIL_PARAMS:
+        h.update(np.ascontiguousarray(getattr(profile, name), dtype=np.float64).tobytes())
+    h.update(json.dumps([None if t is None else str(t) for t in profile.soil_type]).encode())
+    return h.hexdigest()
+
+
+class CapacityCache:
+    """Cache ``CapacityResult`` dengan tier memori (LRU) dan tier disk opsional.
+
+    Tier memori dilindungi lock sehingga satu instance aman dipakai bersama
+    oleh beberapa sesi Streamlit dalam proses yang sama. Tier disk menyimpan
+    satu file ``.npz`` per key di ``directory`` dan menghapus file yang paling
+    lama tidak dipakai bila total ukurannya melebihi ``max_disk_bytes``.
+    File disk juga menyimpan ``CapacityCurve`` hasilnya, sehingga
+    ``capacity_at`` dari tier disk sama persis dengan hasil yang baru dihitung.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        if maxsize < 0:
+            raise ValueError("maxsize should >= 0")
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CapacityResult] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def compute_capacity(
+        self,
+        method: str,
+        diameter_m: float,
+        pile_depth_m: float,
+        cutoff_m: float,
+        fs: float,
+        pile_material: Optional[str],
+        pile_types: Optional[str],
+        dz: float,
+        layers: Layers,
+    ) -> CapacityResult:
+        """Sama dengan ``calc.compute_capacity``, tetapi memakai cache.
+
+        Hasil dipakai bersama antar pemanggil: kolom dan ``recap``-nya
+        read-only (salin dulu bila perlu diubah).
+        """
+        args = (method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers)
+        key = cache_key(*args)
+        result = self.get(key)
+        if result is None:
+            result = compute_capacity(*args)
+            self.put(key, result)
+        return result
+
+    def compute_distributions(
+        self,
+        method: str,
+        diameter_m: float,
+        pile_depth_m: float,
+        cutoff_m: float,
+        fs: float,
+        pile_material: Optional[str],
+        pile_types: Optional[str],
+        dz: float,
+        layers: Layers,
+    ) -> Tuple[pd.DataFrame, dict]:
+        """Sama dengan ``calc.compute_distributions``, tetapi memakai cache."""
+        result = self.compute_capacity(
+            method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers
+        )
+        return result.dataframe.copy(), dict(result.recap)
+
+    def get(self, key: str) -> Optional[CapacityResult]:
+        """Ambil hasil untuk ``key``, atau None bila belum ada."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if result is None and self.directory is not None:
+            result = self._read_disk(key)
+            if result is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, _freeze(result))
+        if result is None:
+            with self._lock:
+                self.misses += 1
+        return result
+
+    def put(self, key: str, result: CapacityResult) -> None:
+        """Simpan hasil ke tier memori (dan tier disk bila aktif).
+
+        Kolom dan ``recap`` milik ``result`` dijadikan read-only karena
+        objeknya dipakai bersama oleh semua pemanggil berikutnya.
+        """
+        self._remember(key, _freeze(result))
+        if self.directory is not None:
+            self._write_disk(key, result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self, disk: bool = False) -> None:
+        """Kosongkan tier memori (dan tier disk bila ``disk=True``)."""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.directory is not None:
+            for path in self._disk_files():
+                os.remove(path)
+
+    def _remember(self, key: str, result: CapacityResult) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _disk_files(self) -> list[str]:
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".npz")]
+
+    def _read_disk(self, key: str) -> Optional[CapacityResult]:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["__meta__"]))
+                columns = {}
+                for i, name in enumerate(meta["columns"]):
+                    values = data[f"c{i}"]
+                    columns[name] = values.astype(object) if name in meta["text"] else values
+                curve = None
+                if meta["curve_fs"] is not None:
+                    curve = CapacityCurve(**{name: data[f"k_{name}"] for name in _CURVE_ARRAYS}, fs=meta["curve_fs"])
+            os.utime(path)  # tandai baru dipakai untuk eviksi LRU
+        except (OSError, KeyError, ValueError):
+            return None
+        curve_builder = None if curve is None else partial(_stored_curve, curve)
+        return CapacityResult(columns, meta["recap"], curve_builder=curve_builder)
+
+    def _write_disk(self, key: str, result: CapacityResult) -> None:
+        arrays = {}
+        text = []
+        for i, (name, values) in enumerate(result.columns.items()):
+            if values.dtype.kind not in "biuf":
+                values = values.astype(str)
+                text.append(name)
+            arrays[f"c{i}"] = values
+        curve = result.curve
+        if curve is not None:
+            arrays.update({f"k_{name}": getattr(curve, name) for name in _CURVE_ARRAYS})
+        meta = {
+            "columns": list(result.columns),
+            "text": text,
+            "recap": dict(result.recap),
+            "curve_fs": None if curve is None else curve.fs,
+        }
+        arrays["__meta__"] = np.array(json.dumps(meta))
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for path in self._disk_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def _stored_curve(curve: CapacityCurve) -> CapacityCurve:
+    """``curve_builder`` untuk hasil dari tier disk (kurvanya sudah tersimpan)."""
+    return curve
+
+
+def _freeze(result: CapacityResult) -> CapacityResult:
+    """Jadikan kolom dan ``recap`` read-only (entri cache dipakai bersama)."""
+    for values in result.columns.values():
+        values.flags.writeable = False
+    if not isinstance(result.recap, MappingProxyType):
+        result.recap = MappingProxyType(dict(result.recap))
+    return result
+
+
+default_cache = CapacityCache()
+
+
+def cached_compute_distributions(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+) -> Tuple[pd.DataFrame, dict]:
+    """``compute_distributions`` lewat cache bersama tingkat proses (``default_cache``)."""
+    return default_cache.compute_distributions(
+        method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers
+    )
+
+
+def cached_compute_capacity(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+) -> CapacityResult:
+    """``compute_capacity`` lewat cache bersama tingkat proses (``default_cache``)."""
+    return default_cache.compute_capacity(
+        method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers
+    )
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-from math import tan
-from typing import Optional, Tuple
+from functools import partial
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple, Union
 
 import numpy as np
-import pandas as pd
 
 from .geometry import (
     compute_pile_perimeter_m_from_diameter,
     compute_pile_tip_area_m2_from_diameter,
 )
-from .models import PileData_alpha, SoilLayer, PileData_beta, Kdp
+from .instrument import count, run_metrics, stage
+from .methods import get_method
+from .result import ROUNDED_COLUMNS, CapacityResult, _to_dataframe, column_labels
+from .models import Layers, SoilLayer, SoilProfile, as_profile
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def expand_layers_to_depth(layers: list[SoilLayer], pile_depth_m: float) -> list[Tuple[float, SoilLayer]]:
@@ -40,7 +45,11 @@ def compute_nspt_average(
     diameter_m: float,
     layers: list[Tuple[float, SoilLayer]]
 ) -> Optional[float]:
-    """Hitung NSPT rata-rata di zona 4D atas dan bawah ujung tiang."""
+    """Hitung NSPT rata-rata di zona 4D atas dan bawah ujung tiang.
+
+    Satu kedalaman cukup dengan scan linear tanpa membangun profil; untuk
+    banyak kedalaman gunakan ``compute_nspt_averages``.
+    """
     z_top_avg = z_tip - 4 * diameter_m
     z_bot_avg = z_tip + 4 * diameter_m
     total_thickness = 0.0
@@ -49,19 +58,364 @@ def compute_nspt_average(
     for z_top, lyr in layers:
         z_bot = z_top + lyr.thickness_m
         # Cek overlap antara layer dan rentang target
-        overlap_top = max(z_top, z_top_avg)
-        overlap_bot = min(z_bot, z_bot_avg)
-        overlap = overlap_bot - overlap_top
-        if overlap > 0:
-            if lyr.nspt is not None and lyr.nspt > 0:
-                weighted_sum += lyr.nspt * overlap
-                total_thickness += overlap
+        overlap = min(z_bot, z_bot_avg) - max(z_top, z_top_avg)
+        if overlap > 0 and lyr.nspt is not None and lyr.nspt > 0:
+            weighted_sum += lyr.nspt * overlap
+            total_thickness += overlap
 
     if total_thickness == 0:
         # Tidak ada data di sekitar ujung tiang
         return None
     return weighted_sum / total_thickness
 
+
+def compute_nspt_averages(
+    z_tips: np.ndarray,
+    diameter_m: float,
+    layers: Union[list[Tuple[float, SoilLayer]], SoilProfile],
+) -> np.ndarray:
+    """Versi batch ``compute_nspt_average`` untuk seluruh array kedalaman.
+
+    Fungsi kumulatif NSPT x tebal dibangun sekali, lalu rata-rata tiap
+    jendela [z - 4D, z + 4D] dibaca dengan dua lookup. Kedalaman tanpa data
+    NSPT di jendelanya bernilai NaN.
+    """
+    z_tips = np.asarray(z_tips, dtype=float)
+    if len(layers) == 0:
+        return np.full(z_tips.shape, np.nan)
+    if isinstance(layers, SoilProfile):
+        profile = layers
+    else:
+        profile = SoilProfile.from_layers([lyr for _, lyr in layers])
+    return _nspt_window_average(profile, _nspt_cumulative(profile), z_tips - 4 * diameter_m, z_tips + 4 * diameter_m)
+
+
+def _locate_layers(z_vals: np.ndarray, bots: np.ndarray) -> np.ndarray:
+    """Index lapisan untuk setiap kedalaman (batas lapisan ikut lapisan atas)."""
+    count("layer_scans", np.size(z_vals))
+    idx = np.searchsorted(bots + 1e-9, z_vals, side="left")
+    if np.any(idx >= len(bots)):
+        raise ValueError("No layer found at specified depth (check input)")
+    return idx
+
+
+def _cumulative_top(values: np.ndarray) -> np.ndarray:
+    """Jumlah kumulatif per lapisan di puncak tiap lapisan (n_layer + 1 nilai, sumbu terakhir)."""
+    values = np.asarray(values)
+    return np.concatenate((np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)), axis=-1)
+
+
+def _nspt_cumulative(profile: SoilProfile) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fungsi kumulatif NSPT x tebal dan tebal ber-NSPT di puncak tiap lapisan."""
+    nspt = profile.nspt
+    has_nspt = ~np.isnan(nspt) & (nspt > 0)
+    rate = np.where(has_nspt, nspt, 0.0)
+    thk = profile.thickness_m
+    return rate, _cumulative_top(rate * thk), _cumulative_top(has_nspt * thk)
+
+
+def _nspt_window_sums(
+    profile: SoilProfile,
+    nspt_cum: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    z_from: np.ndarray,
+    z_to: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Jumlah NSPT x tebal dan tebal ber-NSPT pada rentang [z_from, z_to]."""
+    rate, weighted_top, thickness_top = nspt_cum
+    tops, bots = profile.top_m, profile.bot_m
+
+    def cumulative(z):
+        count("layer_scans", np.size(z))
+        z = np.clip(z, tops[0], bots[-1])
+        k = np.minimum(np.searchsorted(bots, z, side="left"), len(bots) - 1)
+        dz_in = z - tops[k]
+        return (
+            weighted_top[..., k] + rate[..., k] * dz_in,
+            thickness_top[..., k] + (rate[..., k] > 0) * dz_in,
+        )
+
+    weighted_from, thickness_from = cumulative(z_from)
+    weighted_to, thickness_to = cumulative(z_to)
+    return weighted_to - weighted_from, thickness_to - thickness_from
+
+
+def _nspt_window_average(
+    profile: SoilProfile,
+    nspt_cum: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    z_from: np.ndarray,
+    z_to: np.ndarray,
+) -> np.ndarray:
+    """Rata-rata NSPT berbobot tebal pada rentang [z_from, z_to] (NaN bila kosong)."""
+    weighted, thickness = _nspt_window_sums(profile, nspt_cum, z_from, z_to)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(thickness > 0, weighted / thickness, np.nan)
+
+
+def _sigma_profile(profile: SoilProfile) -> np.ndarray:
+    """Tegangan efektif kumulatif di puncak tiap lapisan (n_layer + 1 nilai)."""
+    return _cumulative_top(np.nan_to_num(profile.gamma_eff) * profile.thickness_m)
+
+
+def _sigma_at(profile: SoilProfile, sigma_top: np.ndarray, z_vals: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Tegangan efektif pada kedalaman z di dalam lapisan idx."""
+    gamma = np.nan_to_num(profile.gamma_eff)
+    z_in = np.minimum(z_vals, profile.bot_m[idx])
+    return sigma_top[..., idx] + gamma[..., idx] * (z_in - profile.top_m[idx])
+
+
+def _shaft_profile(
+    profile: SoilProfile,
+    cutoff_m: float,
+    qs_const: np.ndarray,
+    qs_slope: np.ndarray,
+    sigma_top: np.ndarray,
+) -> np.ndarray:
+    """Gaya selimut kumulatif per meter keliling (kN/m) di puncak tiap lapisan.
+
+    Tahanan selimut satuan tiap lapisan ditulis linear terhadap tegangan
+    efektif: ``qs = qs_const + qs_slope * sigma_eff``. Lapisan penuh memakai
+    tegangan di dasar lapisan, hanya bagian di bawah cutoff yang dihitung.
+    Koefisien dan tegangan boleh memiliki sumbu batch di depan (mis. beberapa
+    tipe tiang atau sampel parameter tanah).
+    """
+    eff_thickness = np.clip(profile.bot_m - np.maximum(profile.top_m, cutoff_m), 0.0, None)
+    return _cumulative_top((qs_const + qs_slope * sigma_top[..., 1:]) * eff_thickness)
+
+
+def _shaft_at(
+    profile: SoilProfile,
+    cutoff_m: float,
+    qs_const: np.ndarray,
+    qs_slope: np.ndarray,
+    shaft_top: np.ndarray,
+    sigma_z: np.ndarray,
+    z_vals: np.ndarray,
+    idx: np.ndarray,
+) -> np.ndarray:
+    """Gaya selimut kumulatif per meter keliling sampai kedalaman z."""
+    z_in = np.minimum(z_vals, profile.bot_m[idx])
+    embedded = np.clip(z_in - np.maximum(profile.top_m[idx], cutoff_m), 0.0, None)
+    return shaft_top[..., idx] + (qs_const[..., idx] + qs_slope[..., idx] * sigma_z) * embedded
+
+
+def _compute_columns(
+    method: str,
+    profile: SoilProfile,
+    z_vals: np.ndarray,
+    diameter_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_type: Optional[str],
+) -> dict[str, np.ndarray]:
+    """Kolom distribusi kapasitas (belum dibulatkan) pada kedalaman ``z_vals``.
+
+    ``profile`` harus sudah dipotong sampai kedalaman tiang.
+    """
+    spec = get_method(method)
+    ab_m2 = compute_pile_tip_area_m2_from_diameter(diameter_m)
+    perim_m = compute_pile_perimeter_m_from_diameter(diameter_m)
+    count("depths", len(z_vals))
+    count("layers", len(profile))
+    with stage("locate_layers"):
+        idx = _locate_layers(z_vals, profile.bot_m)
+
+    # Profil kumulatif tegangan efektif dan gaya selimut, dibangun sekali per run
+    with stage("shaft"):
+        sigma_top = _sigma_profile(profile)
+        sigma_z = _sigma_at(profile, sigma_top, z_vals, idx)
+        qs_const, qs_slope = spec.shaft(profile, pile_type, pile_material)
+        shaft_top = _shaft_profile(profile, cutoff_m, qs_const, qs_slope, sigma_top)
+        qs_vals = _shaft_at(profile, cutoff_m, qs_const, qs_slope, shaft_top, sigma_z, z_vals, idx) * perim_m
+
+    with stage("tip"):
+        qb_vals = spec.tip(profile, pile_type, pile_material)[idx] * ab_m2
+
+    if spec.nspt_window:
+        # Hitung NSPT rata-rata di zona 4D atas dan bawah ujung tiang
+        with stage("nspt_average"):
+            qb_vals = qb_vals * _nspt_window_average(
+                profile, _nspt_cumulative(profile), z_vals - 4 * diameter_m, z_vals + 4 * diameter_m
+            )
+    columns = {"Depth_m": z_vals, **spec.columns(profile, idx, sigma_z, pile_type, pile_material)}
+
+    qult_vals = qb_vals + qs_vals
+    columns.update(
+        {
+            "Qb_kN": qb_vals,
+            "Qfs_kN": qs_vals,
+            "Qult_kN": qult_vals,
+            "Qall_kN": qult_vals / fs,
+        }
+    )
+    return columns
+
+
+def _qall_batch(
+    method: str,
+    profile: SoilProfile,
+    z_vals: np.ndarray,
+    idx: np.ndarray,
+    diameter_m: Union[float, np.ndarray],
+    cutoff_m: Union[float, np.ndarray],
+    fs: float,
+    pile_material: Optional[str],
+    pile_type: Optional[str],
+) -> np.ndarray:
+    """Qall (kN) pada ``z_vals`` untuk sekumpulan varian sekaligus, (n_varian, n_kedalaman).
+
+    Parameter tanah ``profile`` boleh berdimensi (n_varian, n_lapisan),
+    ``diameter_m`` dan ``cutoff_m`` boleh berdimensi (n_varian, 1); geometri
+    lapisan sama untuk semua varian.
+    """
+    spec = get_method(method)
+    sigma_top = _sigma_profile(profile)
+    sigma_z = _sigma_at(profile, sigma_top, z_vals, idx)
+    qs_const, qs_slope = spec.shaft(profile, pile_type, pile_material)
+    shaft_top = _shaft_profile(profile, cutoff_m, qs_const, qs_slope, sigma_top)
+    qs_vals = _shaft_at(profile, cutoff_m, qs_const, qs_slope, shaft_top, sigma_z, z_vals, idx)
+    qb_vals = spec.tip(profile, pile_type, pile_material)[..., idx]
+    if spec.nspt_window:
+        qb_vals = qb_vals * _nspt_window_average(
+            profile, _nspt_cumulative(profile), z_vals - 4 * diameter_m, z_vals + 4 * diameter_m
+        )
+    d = np.asarray(diameter_m, dtype=float)
+    ab_m2 = np.reshape([compute_pile_tip_area_m2_from_diameter(v) for v in d.ravel()], d.shape)
+    perim_m = np.reshape([compute_pile_perimeter_m_from_diameter(v) for v in d.ravel()], d.shape)
+    return (qb_vals * ab_m2 + qs_vals * perim_m) / fs
+
+
+def _recap(
+    columns: dict[str, np.ndarray],
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+) -> dict:
+    return {
+        "Ab_m2": compute_pile_tip_area_m2_from_diameter(diameter_m),
+        "Perimeter_m": compute_pile_perimeter_m_from_diameter(diameter_m),
+        "Depth_m": pile_depth_m,
+        "Cutoff_m": cutoff_m,
+        "Pilelength_m": pile_depth_m - cutoff_m,
+        "FS": fs,
+        "Qb_at_tip_kN": float(columns["Qb_kN"][-1]),
+        "Qfs_total_kN": float(columns["Qfs_kN"][-1]),
+        "Qult_total_kN": float(columns["Qult_kN"][-1]),
+        "Qall_total_kN": float(columns["Qall_kN"][-1]),
+    }
+
+
+def _truncated_profile(layers: Layers, pile_depth_m: float) -> SoilProfile:
+    profile = as_profile(layers).truncate(pile_depth_m)
+    if len(profile) == 0:
+        raise ValueError("Kedalaman tiang berada di atas semua lapisan (periksa input)")
+    return profile
+
+
+def _capacity_curve(*args):
+    # Import di sini: modul curve memakai fungsi-fungsi internal modul ini
+    from .curve import capacity_curve
+
+    return capacity_curve(*args)
+
+
+def compute_capacity(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+) -> CapacityResult:
+    """Seperti ``compute_distributions`` tetapi mengembalikan ``CapacityResult``.
+
+    Tidak ada DataFrame yang dibangun kecuali ``result.dataframe`` diakses.
+    Bila instrumentasi aktif (``axpile.instrument``), waktu dan counter tiap
+    tahap tersedia di ``result.metrics``.
+    """
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz) as metrics:
+        with stage("expand_layers"):
+            profile = _truncated_profile(layers, pile_depth_m)
+            z_vals = np.arange(dz, pile_depth_m + dz, dz)
+        columns = _compute_columns(method, profile, z_vals, diameter_m, cutoff_m, fs, pile_material, pile_types)
+        curve_builder = partial(
+            _capacity_curve, method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, profile
+        )
+        return CapacityResult(
+            columns, _recap(columns, diameter_m, pile_depth_m, cutoff_m, fs), metrics, curve_builder
+        )
+
+
+def _depth_slice(dz: float, pile_depth_m: float, i0: int, i1: int) -> np.ndarray:
+    """Baris ``i0:i1`` dari ``np.arange(dz, pile_depth_m + dz, dz)`` tanpa membangun seluruh array."""
+    n = int(np.ceil(((pile_depth_m + dz) - dz) / dz))
+    # Rumus yang sama dengan np.arange (start + i * delta) agar nilainya identik
+    return dz + np.arange(i0, min(i1, n)) * ((dz + dz) - dz)
+
+
+def iter_capacity(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+    chunk_size: int = 4096,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Kolom distribusi kapasitas per potongan ``chunk_size`` kedalaman, berurutan.
+
+    Gabungan semua potongan sama dengan ``compute_capacity(...).columns``
+    (kolom kategori berupa kode, lihat ``result.column_labels``).
+    Yang disimpan selama iterasi hanya profil kumulatif per lapisan (tegangan
+    efektif, gaya selimut, NSPT) dan satu potongan, sehingga memori tidak
+    bergantung pada jumlah baris. Cocok untuk dz sangat kecil: tulis tiap
+    potongan ke disk atau reduksi langsung, mis.::
+
+        qall_max = max(chunk["Qall_kN"].max() for chunk in iter_capacity(...))
+    """
+    if dz <= 0.0:
+        raise ValueError("Vertical Increment should > 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size should > 0")
+    profile = _truncated_profile(layers, pile_depth_m)
+    i0 = 0
+    while True:
+        z_vals = _depth_slice(dz, pile_depth_m, i0, i0 + chunk_size)
+        if len(z_vals) == 0:
+            return
+        yield _compute_columns(method, profile, z_vals, diameter_m, cutoff_m, fs, pile_material, pile_types)
+        i0 += chunk_size
+
+
+def iter_distribution_rows(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+    chunk_size: int = 4096,
+) -> Iterator[dict]:
+    """Seperti ``iter_capacity`` tetapi satu dict per kedalaman (kolom Q dibulatkan 2 desimal)."""
+    for chunk in iter_capacity(
+        method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers, chunk_size
+    ):
+        names = list(chunk)
+        values = [np.round(chunk[n], 2) if n in ROUNDED_COLUMNS else column_labels(n, chunk[n]) for n in names]
+        for row in zip(*(v.tolist() for v in values)):
+            yield dict(zip(names, row))
+
+
 def compute_distributions(
     method: str,
     diameter_m: float,
@@ -71,219 +425,112 @@ def compute_distributions(
     pile_material: str,
     pile_types: str,    
     dz: float,
-    layers: list[SoilLayer],
+    layers: Layers,
 ):
-    pile_type = pile_types
-    ab_m2 = compute_pile_tip_area_m2_from_diameter(diameter_m)
-    perim_m = compute_pile_perimeter_m_from_diameter(diameter_m)
-    pilelength_m = pile_depth_m - cutoff_m
-    segs = expand_layers_to_depth(layers, pile_depth_m)
-    if len(segs) == 0:
-        raise ValueError("Kedalaman tiang berada di atas semua lapisan (periksa input)")
+    # Satu run instrumentasi mencakup konstruksi DataFrame
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz):
+        result = compute_capacity(method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers)
+        return result.dataframe, result.recap
 
-    z_vals = np.arange(dz, pile_depth_m + dz, dz)
-    alpha_vals= np.zeros_like(z_vals)
-    beta_vals= np.zeros_like(z_vals)
-    kdp_vals= np.zeros_like(z_vals)
-    su_vals= np.zeros_like(z_vals)
-    # ks_vals= np.zeros_like(z_vals)
-    sum_sigma_eff_vals= np.zeros_like(z_vals)
-    soil_vals= np.empty_like(z_vals, dtype=object)
-    soiltype_vals= np.empty_like(z_vals, dtype=object)
-    qb_vals = np.zeros_like(z_vals)
-    qs_vals = np.zeros_like(z_vals)
-    qult_vals = np.zeros_like(z_vals)
-    qall_vals = np.zeros_like(z_vals)
-
-    for i, z in enumerate(z_vals):
-        # defaults to avoid unbound local errors for branches not taken
-        tip_layer: Optional[SoilLayer] = None
-        for z_top, lyr in segs:
-            z_bot = z_top + lyr.thickness_m
-            if z >= z_top and z <= z_bot + 1e-9:
-                tip_layer = lyr
-                break
-
-        if tip_layer is None:
-            raise ValueError("No layer found at specified depth (check input)")
-
-        # Qb Calculation
-        if tip_layer.soil_behavior in ["clay", "silt", "sand"]:
-
-            # Decourt Quaresma
-            if method =="Decourt-Quaresma":
-                alpha = PileData_alpha[pile_type][tip_layer.soil_behavior]
-                kdp = Kdp[tip_layer.soil_type]
-
-                # Hitung NSPT rata-rata di sekitar ujung tiang
-                n_avg = compute_nspt_average(z, diameter_m, segs)
-                if n_avg is None:
-                    # Tidak ada data cukup di 4D atas/bawah
-                    qb_kPa = np.nan
-                else:
-                    qb_kPa = alpha * kdp * n_avg
-
-                qb_kN = qb_kPa * ab_m2
-
-            # Mayerhof
-            if method =="Mayerhof":
-                if tip_layer.soil_behavior == "clay":
-                    if tip_layer.su is not None:
-                        qb_kPa = 9 * tip_layer.su
-                        qb_kN = qb_kPa * ab_m2
-                    else:
-                        qb_kPa = 0.0
-                        qb_kN = 0.0
-                elif tip_layer.soil_behavior == "sand":
-                    # Mayerhof method for sand requires Nq from phi
-                    # For now, placeholder - needs full implementation
-                    if tip_layer.phi <= 42:
-                        f_qb = (280.19 * tip_layer.phi) - 7845.177
-                    else:
-                        f_qb = (280.19 * 42) - 7845.177
-                    qb_kPa = f_qb
-                    qb_kN = qb_kPa * ab_m2
-                else:
-                    qb_kPa = 0.0
-                    qb_kN = 0.0
-
-
-        # Qfs Calculation (exclude part above cutoff)
-        qs_sum_kN = 0.0
-        sum_sigma_eff: Optional[float] = 0.0
-        for z_top, lyr in segs:
-            z_bot = z_top + lyr.thickness_m
-            overlap = max(0.0, min(z_bot, z) - z_top)
-            if method == "Mayerhof":
-                if overlap > 0 and hasattr(lyr, "gamma_eff"):
-                    sum_sigma_eff += lyr.gamma_eff * overlap
-
-            # hanya hitung bagian yang berada DI BAWAH cutoff
-            effective_layer_top = max(z_top, cutoff_m)
-            effective_layer_bot = min(z_bot, z)  # hanya sampai kedalaman z
-            overlap = max(0.0, effective_layer_bot - effective_layer_top)
-
-            if overlap <= 0.0:
-                continue
-
-            if lyr.soil_behavior in ["clay", "silt", "sand"]:
-                # Decourt Quaresma
-                if method == "Decourt-Quaresma":
-                    beta = PileData_beta[pile_type][lyr.soil_behavior]
-                    qs_kPa = beta * 10 * ((lyr.nspt / 3) + 1)
-                    qs_sum_kN += qs_kPa * perim_m * overlap
-
-                # Mayerhof
-                elif method == "Mayerhof":
-                    if lyr.soil_behavior == "clay":
-                        if lyr.alpha_tomlinson is not None and lyr.su is not None:
-                            qs_kPa = lyr.alpha_tomlinson * lyr.su
-                            qs_sum_kN += qs_kPa * perim_m * overlap
-                    elif lyr.soil_behavior == "sand":
-                        # For sand in Mayerhof, need to compute from phi and gamma_eff
-                        # This will be implemented based on Mayerhof's formula
-                        if pile_material == "Steel":
-                            delta=20
-                            if lyr.phi > 45: 
-                                ks=1
-                            ks=0.029412*lyr.phi-0.32353
-                        elif pile_material == "Concrete":
-                            delta=(3/4)*lyr.phi
-                            if lyr.phi > 45: 
-                                ks=2
-                            ks=0.029412*lyr.phi+0.67647059
-                        elif pile_material == "Timber":
-                            delta=(2/3)*lyr.phi
-                            if lyr.phi > 45: 
-                                ks=4
-                            ks=0.1470588*lyr.phi-2.6176470588
-                        # else:
-                        #     delta = 0.75 * lyr.phi
-                        #     ks=1
-                        # gunakan sum_sigma_eff sampai kedalaman z (sudah dihitung di atas)
-                        qs_kPa = ks * sum_sigma_eff * tan(delta * np.pi / 180.0)  # tan expects radians
-                        qs_sum_kN += qs_kPa * perim_m * overlap
-        
-        # Decourt Quaresma
-        if method =="Decourt-Quaresma":
-            alpha=PileData_alpha[pile_type][tip_layer.soil_behavior]
-            alpha_vals[i]=alpha         
-
-            beta=PileData_beta[pile_type][tip_layer.soil_behavior]
-            beta_vals[i]=beta
-
-            kdp=Kdp[tip_layer.soil_type]
-            kdp_vals[i]=kdp
-        
-            soiltype_vals[i]=tip_layer.soil_type
-        
-        # Mayerhof
-        if method =="Mayerhof":
-            alpha_vals[i]=tip_layer.alpha_tomlinson if tip_layer.alpha_tomlinson is not None else 0.0
-            su_vals[i]=tip_layer.su if tip_layer.su is not None else 0.0
-            # ks_vals[i]=ks if ks is not None else 0.0
-            sum_sigma_eff_vals[i]=sum_sigma_eff
-        # else:
-        #     # Ensure arrays stay defined for Decourt-Quaresma path
-        #     ks_vals[i]=0.0
-        #     sum_sigma_eff_vals[i]=0.0
-
-        soil_vals[i]=tip_layer.soil_behavior
-        qs_vals[i] = qs_sum_kN
-        qb_vals[i] = qb_kN
-        qult_vals[i] = qb_vals[i] + qs_vals[i]
-        qall_vals[i] = qult_vals[i] / fs
-        
-    # Decourt Quaresma
-    if method =="Decourt-Quaresma":
-        df = pd.DataFrame(
-            {
-                "Depth_m": z_vals,
-                "Soil Behavior": soil_vals,
-                "Soil Type": soiltype_vals,
-                "Alpha": alpha_vals,
-                "Beta": beta_vals,
-                "kdp_kPa": kdp_vals,
-                "Qb_kN": qb_vals,
-                "Qfs_kN": qs_vals,
-                "Qult_kN": qult_vals,
-                "Qall_kN": qall_vals,
-            }
-        )
 
-    # Mayerhof
-    if method =="Mayerhof":
-        df = pd.DataFrame(
-            {
-                "Depth_m": z_vals,
-                "Soil Behavior": soil_vals,
-                "Alpha": alpha_vals,
-                "Su_kPa": su_vals,
-                # "Ks":ks_vals,
-                "Sigma_eff_kPa": sum_sigma_eff_vals,
-                "Qb_kN": qb_vals,
-                "Qfs_kN": qs_vals,
-                "Qult_kN": qult_vals,
-                "Qall_kN": qall_vals,
-            }
-        )
+def changed_layer_index(old_layers: list[SoilLayer], new_layers: list[SoilLayer]) -> Optional[int]:
+    """Index satu-satunya lapisan yang berbeda, atau None bila bukan tepat satu."""
+    if len(old_layers) != len(new_layers):
+        return None
+    changed = [i for i, (old, new) in enumerate(zip(old_layers, new_layers)) if old != new]
+    return changed[0] if len(changed) == 1 else None
 
-    cols = ["Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN"]
-    df[cols] = df[cols].round(2)
 
-    recap = {
-        "Ab_m2": ab_m2,
-        "Perimeter_m": perim_m,
-        "Depth_m": pile_depth_m,
-        "Cutoff_m": cutoff_m,
-        "Pilelength_m": pilelength_m,
-        "FS": fs,
-        "Qb_at_tip_kN": float(qb_vals[-1]),
-        "Qfs_total_kN": float(qs_vals[-1]),
-        "Qult_total_kN": float(qult_vals[-1]),
-        "Qall_total_kN": float(qall_vals[-1]),
-    }
-    return df, recap
+def _update_rows(
+    n_previous: int,
+    changed_layer: int,
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    dz: float,
+    layers: Layers,
+) -> Tuple[int, np.ndarray, SoilProfile]:
+    """Baris pertama yang harus dihitung ulang setelah ``changed_layer`` diubah."""
+    full = as_profile(layers)
+    if not 0 <= changed_layer < len(full):
+        raise ValueError(f"Layer #{changed_layer + 1} does not exist")
+    profile = _truncated_profile(full, pile_depth_m)
+    z_vals = np.arange(dz, pile_depth_m + dz, dz)
+    if n_previous != len(z_vals):
+        raise ValueError("Previous result does not match pile depth and dz (run a full calculation)")
 
+    z_start = full.top_m[changed_layer]
+    if get_method(method).nspt_window:
+        z_start -= 4 * diameter_m
+    # Baris tepat di batas lapisan ikut dihitung ulang (toleransi lokasi lapisan)
+    i0 = int(np.searchsorted(z_vals, z_start - 1e-9, side="left"))
+    return i0, z_vals, profile
 
 
+def update_capacity(
+    previous: CapacityResult,
+    changed_layer: int,
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+) -> CapacityResult:
+    """Hitung ulang ``CapacityResult`` setelah satu lapisan diubah.
+
+    ``previous`` berasal dari run dengan input yang sama kecuali lapisan
+    ``changed_layer`` (parameter maupun tebalnya). Kedalaman di atas lapisan
+    tersebut tidak berubah, kecuali yang zona 4D NSPT-nya (Decourt-Quaresma)
+    menjangkau lapisan itu, sehingga hanya baris mulai dari puncak lapisan
+    (dikurangi 4D) yang dihitung ulang. Profil kumulatif tegangan efektif dan
+    gaya selimut tetap dibangun penuh (O(n_layer)).
+    """
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz, incremental=True) as metrics:
+        with stage("expand_layers"):
+            i0, z_vals, profile = _update_rows(
+                len(previous), changed_layer, method, diameter_m, pile_depth_m, dz, layers
+            )
+        count("rows_reused", min(i0, len(z_vals)))
+        curve_builder = partial(
+            _capacity_curve, method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, profile
+        )
+        if i0 >= len(z_vals):
+            return CapacityResult(dict(previous.columns), dict(previous.recap), metrics, curve_builder)
+        rows = _compute_columns(method, profile, z_vals[i0:], diameter_m, cutoff_m, fs, pile_material, pile_types)
+        columns = {name: np.concatenate((previous.columns[name][:i0], rows[name])) for name in rows}
+        return CapacityResult(columns, _recap(rows, diameter_m, pile_depth_m, cutoff_m, fs), metrics, curve_builder)
+
+
+def update_distributions(
+    previous: Tuple[pd.DataFrame, dict],
+    changed_layer: int,
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+):
+    """Versi ``(df, recap)`` dari ``update_capacity`` (lihat di sana)."""
+    import pandas as pd
+
+    prev_df, prev_recap = previous
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz, incremental=True):
+        with stage("expand_layers"):
+            i0, z_vals, profile = _update_rows(
+                len(prev_df), changed_layer, method, diameter_m, pile_depth_m, dz, layers
+            )
+        count("rows_reused", min(i0, len(z_vals)))
+        if i0 >= len(z_vals):
+            return prev_df.copy(), dict(prev_recap)
+        rows = _compute_columns(method, profile, z_vals[i0:], diameter_m, cutoff_m, fs, pile_material, pile_types)
+        with stage("dataframe"):
+            df = pd.concat([prev_df.iloc[:i0], _to_dataframe(rows)], ignore_index=True)
+        return df, _recap(rows, diameter_m, pile_depth_m, cutoff_m, fs)
@@ -0,0 +1,262 @@
+"""Command line batch runner: ``python -m axpile cases.jsonl -o hasil.csv``.
+
+Format input (dibaca sebagai stream, satu kasus dalam memori per baris/grup):
+
+- JSON Lines: satu objek per baris berisi field ``PileConfig``, ``case_id``
+  (opsional, default nomor baris) dan ``layers`` (daftar field ``SoilLayer``).
+- CSV: satu baris per lapisan. Baris berurutan dengan ``case_id`` yang sama
+  membentuk satu kasus; kolom ``PileConfig`` dibaca dari baris pertama grup.
+
+Output ditulis bertahap dengan urutan sama seperti input: satu baris recap per
+kasus (default) atau satu baris per kedalaman (``--profiles``). Kasus yang
+gagal validasi atau perhitungan tetap ditulis dengan pesan di kolom ``Error``.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque
+from dataclasses import fields
+from itertools import groupby, islice
+from typing import IO, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from .models import PileConfig, SoilLayer, as_profile
+from .project import compute_case
+from .result import ROUNDED_COLUMNS, column_labels
+
+CONFIG_FIELDS = [f.name for f in fields(PileConfig)]
+LAYER_FIELDS = [f.name for f in fields(SoilLayer)]
+_TEXT_FIELDS = {"method", "pile_material", "pile_types", "soil_behavior", "soil_type"}
+
+RECAP_COLUMNS = [
+    "Ab_m2",
+    "Perimeter_m",
+    "Depth_m",
+    "Cutoff_m",
+    "Pilelength_m",
+    "FS",
+    "Qb_at_tip_kN",
+    "Qfs_total_kN",
+    "Qult_total_kN",
+    "Qall_total_kN",
+]
+# Gabungan kolom distribusi Decourt-Quaresma dan Mayerhof
+PROFILE_COLUMNS = [
+    "Depth_m",
+    "Soil Behavior",
+    "Soil Type",
+    "Alpha",
+    "Beta",
+    "kdp_kPa",
+    "NSPT",
+    "Su_kPa",
+    "Sigma_eff_kPa",
+    "Qb_kN",
+    "Qfs_kN",
+    "Qult_kN",
+    "Qall_kN",
+]
+
+# Satu kasus: (case_id, PileConfig, daftar SoilLayer) atau (case_id, None, pesan error)
+Case = tuple[str, Optional[PileConfig], Union[list[SoilLayer], str]]
+
+
+def _value(name: str, raw):
+    """Nilai field dari CSV/JSON: string kosong -> None, angka -> float."""
+    if raw is None or (isinstance(raw, str) and raw.strip() == ""):
+        return None
+    if name in _TEXT_FIELDS:
+        return str(raw).strip()
+    return float(raw)
+
+
+def _config(record: dict) -> PileConfig:
+    missing = [name for name in CONFIG_FIELDS[:6] if _value(name, record.get(name)) is None]
+    if missing:
+        raise ValueError(f"Missing field(s): {', '.join(missing)}")
+    return PileConfig(**{name: _value(name, record.get(name)) for name in CONFIG_FIELDS})
+
+
+def _layer(record: dict) -> SoilLayer:
+    if _value("thickness_m", record.get("thickness_m")) is None:
+        raise ValueError("Missing field(s): thickness_m")
+    return SoilLayer(**{name: _value(name, record.get(name)) for name in LAYER_FIELDS})
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[Case]:
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        case_id = str(line_no)
+        try:
+            record = json.loads(line)
+            case_id = str(record.get("case_id", case_id))
+            yield case_id, _config(record), [_layer(lyr) for lyr in record.get("layers") or []]
+        except (ValueError, TypeError, AttributeError) as exc:
+            yield case_id, None, str(exc)
+
+
+def read_csv(stream: IO[str]) -> Iterator[Case]:
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None or "case_id" not in reader.fieldnames:
+        raise ValueError("CSV input needs a 'case_id' column")
+    for case_id, rows in groupby(reader, key=lambda row: row["case_id"]):
+        rows = list(rows)
+        try:
+            yield case_id, _config(rows[0]), [_layer(row) for row in rows]
+        except (ValueError, TypeError) as exc:
+            yield case_id, None, str(exc)
+
+
+def _json_value(v):
+    if isinstance(v, (np.floating, float)):
+        v = float(v)
+        return None if math.isnan(v) else v
+    if isinstance(v, np.integer):
+        return int(v)
+    return v
+
+
+def _case_rows(case: Case, profiles: bool) -> list[dict]:
+    """Baris output untuk satu kasus (recap atau profil per kedalaman)."""
+    case_id, config, layers = case
+    if config is None:
+        return [{"case_id": case_id, "Error": layers}]
+    try:
+        result = compute_case(config, as_profile(layers))
+    except Exception as exc:
+        return [{"case_id": case_id, "Error": str(exc)}]
+    if not profiles:
+        return [{"case_id": case_id, **result.recap, "Error": None}]
+    columns = {
+        name: np.round(values, 2) if name in ROUNDED_COLUMNS else column_labels(name, values)
+        for name, values in result.columns.items()
+    }
+    names = list(columns)
+    return [
+        {"case_id": case_id, **dict(zip(names, values)), "Error": None}
+        for values in zip(*(columns[name].tolist() for name in names))
+    ]
+
+
+def _run_cases(cases: list[Case], profiles: bool) -> list[dict]:
+    """Hitung sekelompok kasus (dijalankan di worker)."""
+    rows = []
+    for case in cases:
+        rows.extend(_case_rows(case, profiles))
+    return rows
+
+
+class _Writer:
+    def __init__(self, stream: IO[str], fmt: str, profiles: bool):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            columns = ["case_id"] + (PROFILE_COLUMNS if profiles else RECAP_COLUMNS) + ["Error"]
+            self._csv = csv.DictWriter(stream, fieldnames=columns, restval="", extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, rows: Iterable[dict]) -> None:
+        if self.fmt == "csv":
+            self._csv.writerows(rows)
+        else:
+            for row in rows:
+                self.stream.write(json.dumps({k: _json_value(v) for k, v in row.items()}) + "\n")
+
+
+def _chunks(cases: Iterable[Case], chunksize: int) -> Iterator[list[Case]]:
+    it = iter(cases)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    cases: Iterable[Case],
+    write,
+    profiles: bool = False,
+    workers: int = 1,
+    chunksize: int = 64,
+) -> int:
+    """Hitung ``cases`` dan kirim baris hasil ke ``write`` sesuai urutan input.
+
+    Dengan ``workers > 1`` kasus dikirim per potongan ke ``ProcessPoolExecutor``
+    dan jumlah potongan yang sedang diproses dibatasi ``2 * workers``, sehingga
+    memori tetap datar untuk input sebesar apa pun. Mengembalikan jumlah kasus.
+    """
+    n_cases = 0
+    if workers <= 1:
+        for chunk in _chunks(cases, chunksize):
+            write(_run_cases(chunk, profiles))
+            n_cases += len(chunk)
+        return n_cases
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(cases, chunksize):
+            pending.append(executor.submit(_run_cases, chunk, profiles))
+            n_cases += len(chunk)
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return n_cases
+
+
+def _format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="axpile",
+        description="Hitung kapasitas aksial tiang untuk banyak kasus dari file CSV atau JSON Lines.",
+    )
+    parser.add_argument("input", help="file input (.csv atau .jsonl), '-' untuk stdin")
+    parser.add_argument("-o", "--output", default="-", help="file output (.csv atau .jsonl), default stdout")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="default dari ekstensi file")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="default dari ekstensi file")
+    parser.add_argument("--profiles", action="store_true", help="tulis profil per kedalaman, bukan hanya recap")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="jumlah proses worker (0 = jumlah CPU)")
+    parser.add_argument("--chunksize", type=int, default=64, help="jumlah kasus per potongan kerja")
+    args = parser.parse_args(argv)
+
+    if args.chunksize <= 0:
+        parser.error("--chunksize should > 0")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    in_fmt = _format(args.input, args.input_format)
+    out_fmt = _format(args.output, args.output_format)
+
+    in_stream = out_stream = None
+    try:
+        in_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+        out_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+        cases = read_csv(in_stream) if in_fmt == "csv" else read_jsonl(in_stream)
+        writer = _Writer(out_stream, out_fmt, args.profiles)
+        n_cases = run_batch(cases, writer.write, args.profiles, workers, args.chunksize)
+    except (OSError, ValueError) as exc:
+        print(f"axpile: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if in_stream not in (None, sys.stdin):
+            in_stream.close()
+        if out_stream not in (None, sys.stdout):
+            out_stream.close()
+    print(f"axpile: {n_cases} case(s) processed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Metode Schmertmann (Nottingham & Schmertmann) dari data sondir CPT/CPTu.
+
+Data mentah (qc dan sleeve friction, resolusi 1-2 cm) diproses sebagai array
+utuh: rata-rata zona ujung dan integrasi selimut dihitung untuk semua
+kedalaman sampel sekaligus, lalu dibaca pada grid dz seperti metode lain.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional
+
+import numpy as np
+
+from .calc import _recap
+from .curve import CapacityCurve
+from .geometry import (
+    compute_pile_perimeter_m_from_diameter,
+    compute_pile_tip_area_m2_from_diameter,
+)
+from .instrument import count, run_metrics, stage
+from .models import _readonly
+from .result import CapacityResult
+
+# Batas tahanan ujung satuan Schmertmann (150 tsf)
+SCHMERTMANN_QB_LIMIT_KPA = 15000.0
+
+
+@dataclass(frozen=True)
+class CptSounding:
+    """Satu sondir: kedalaman (m), tahanan konus qc dan sleeve friction (kPa).
+
+    Sleeve friction sengaja tidak dinamai ``fs`` karena ``fs`` di paket ini
+    adalah faktor keamanan.
+    """
+
+    depth_m: np.ndarray
+    qc_kPa: np.ndarray
+    sleeve_kPa: np.ndarray
+
+    def __post_init__(self) -> None:
+        for name in ("depth_m", "qc_kPa", "sleeve_kPa"):
+            values = np.array(getattr(self, name), dtype=float)
+            if values.ndim != 1:
+                raise ValueError(f"CPT {name} should be a 1-D array")
+            if not np.all(np.isfinite(values)):
+                raise ValueError(f"CPT {name} contains missing values")
+            object.__setattr__(self, name, _readonly(values))
+        if not len(self.depth_m) == len(self.qc_kPa) == len(self.sleeve_kPa):
+            raise ValueError("CPT arrays should have the same length")
+        if len(self.depth_m) < 2:
+            raise ValueError("CPT sounding needs at least 2 readings")
+        if self.depth_m[0] < 0.0 or np.any(np.diff(self.depth_m) <= 0.0):
+            raise ValueError("CPT depths should be >= 0 and strictly increasing")
+
+    def __len__(self) -> int:
+        return len(self.depth_m)
+
+    @property
+    def spacing_m(self) -> float:
+        """Jarak median antar bacaan."""
+        return float(np.median(np.diff(self.depth_m)))
+
+    def resample(self, spacing_m: Optional[float] = None) -> "CptSounding":
+        """Interpolasi linear ke grid seragam (default jarak median bacaan)."""
+        h = self.spacing_m if spacing_m is None else float(spacing_m)
+        if h <= 0.0:
+            raise ValueError("CPT spacing should > 0")
+        n = int(np.floor((self.depth_m[-1] - self.depth_m[0]) / h + 1e-9)) + 1
+        z = self.depth_m[0] + h * np.arange(n)
+        return CptSounding(z, np.interp(z, self.depth_m, self.qc_kPa), np.interp(z, self.depth_m, self.sleeve_kPa))
+
+
+def _schmertmann_tip(qc: np.ndarray, h: float, diameter_m: float) -> tuple[np.ndarray, np.ndarray]:
+    """qc1 dan qc2 (kPa) untuk ujung tiang di setiap sampel grid seragam ``h``.
+
+    qc1: zona y = 0.7D..4D di bawah ujung dipilih yang memberi nilai terkecil
+    dari rata-rata (qc rata-rata zona + rata-rata jalur minimum dari dasar
+    zona kembali ke ujung). qc2: rata-rata jalur minimum 8D di atas ujung,
+    dimulai dari qc minimum zona qc1 terpilih. Dekat akhir data, zona di
+    bawah ujung dipotong di bacaan terakhir.
+
+    Semua ujung dihitung bersamaan; loop Python yang tersisa hanya atas
+    panjang zona k (4D/h lalu 8D/h iterasi, mis. 120 + 240 untuk D = 0.6 m
+    dan h = 2 cm, tidak bergantung pada panjang sondir). Tiap iterasi
+    memperbarui jalur minimum k sampel secara in-place dari iterasi
+    sebelumnya, jadi total kerja O(n * 12D/h) dengan memori O(n).
+
+    Versi tanpa loop (jendela ``sliding_window_view`` per dasar zona, lalu
+    ``np.minimum.accumulate`` dan ``cumsum`` sepanjang jendela, diproses per
+    potongan) memberi hasil identik bit per bit tetapi 3-4x lebih lambat
+    (0.41 s vs 0.13 s untuk 100 000 bacaan, D = 0.6 m): ``accumulate``
+    numpy sepanjang sumbu tidak tervektorisasi SIMD, sedangkan loop ini
+    hanya berisi operasi elemen penuh sepanjang n.
+    """
+    n = len(qc)
+    n07 = max(1, int(round(0.7 * diameter_m / h)))
+    n4 = max(n07, int(round(4.0 * diameter_m / h)))
+    n8 = max(1, int(round(8.0 * diameter_m / h)))
+    prefix = np.concatenate(([0.0], np.cumsum(qc)))
+
+    # Jalur minimum per dasar zona e: path_min[e] = min(qc[e-k..e]), path_sum[e] = jumlahnya dari e ke e-k
+    path_min = qc.copy()
+    path_sum = qc.copy()
+    qc1 = np.full(n, np.inf)
+    zone_min = qc.copy()
+    qc1[-1] = qc[-1]
+    for k in range(1, min(n4, n - 1) + 1):
+        path_min[k:] = np.minimum(path_min[k:], qc[: n - k])
+        path_sum[k:] += path_min[k:]
+        # Ujung t = e - k untuk e = k..n-1; zona lebih pendek dari 0.7D hanya untuk ujung di akhir data
+        lo = 0 if k >= n07 else n - 1 - k
+        t = slice(lo, n - k)
+        e = slice(lo + k, n)
+        mean_zone = (prefix[lo + k + 1 :] - prefix[lo : n - k]) / (k + 1)
+        cand = 0.5 * (mean_zone + path_sum[e] / (k + 1))
+        better = cand < qc1[t]
+        qc1[t] = np.where(better, cand, qc1[t])
+        zone_min[t] = np.where(better, path_min[e], zone_min[t])
+    count("cpt_zone_lengths", min(n4, n - 1))
+
+    # Jalur minimum ke atas sepanjang 8D (dipotong di bacaan pertama)
+    up_min = zone_min.copy()
+    up_sum = zone_min.copy()
+    for k in range(1, min(n8, n - 1) + 1):
+        up_min[k:] = np.minimum(up_min[k:], qc[: n - k])
+        up_sum[k:] += up_min[k:]
+    qc2 = up_sum / (np.minimum(np.arange(n), n8) + 1)
+    return qc1, qc2
+
+
+def _schmertmann_shaft(z: np.ndarray, sleeve: np.ndarray, diameter_m: float) -> np.ndarray:
+    """Integral kumulatif sleeve friction berbobot (kN/m keliling) di setiap sampel.
+
+    Bobot z/8D untuk kedalaman z < 8D dari muka tanah, 1 di bawahnya;
+    integrasi trapesium dimulai dari bacaan pertama (tanpa friksi di atasnya).
+    """
+    g = np.clip(z / (8.0 * diameter_m), 0.0, 1.0) * sleeve
+    return np.concatenate(([0.0], np.cumsum(0.5 * (g[1:] + g[:-1]) * np.diff(z))))
+
+
+def _schmertmann_curve(
+    depth_m: np.ndarray,
+    qb_kN: np.ndarray,
+    qs_kN: np.ndarray,
+    qs_cut_kN: float,
+    end_m: float,
+    cutoff_m: float,
+    fs: float,
+) -> CapacityCurve:
+    """``CapacityCurve`` linear per segmen dari nilai Qb dan Qfs di setiap bacaan sondir.
+
+    Kolom ``compute_schmertmann`` adalah interpolasi linear antar bacaan,
+    jadi dengan titik patah di setiap bacaan, di cutoff dan di titik nol
+    ``Qfs - Qfs(cutoff)`` (awal pemotongan ``max(., 0)``) kurva ini sama
+    persis dengan kolom tersebut di kedalaman mana pun. ``layer`` berisi index
+    bacaan di dasar segmen.
+    """
+    points = np.concatenate(([0.0, end_m, cutoff_m], depth_m))
+    points = np.unique(points[(points >= 0.0) & (points <= end_m)])
+    qfs = np.interp(points, depth_m, qs_kN) - qs_cut_kN
+    cross = np.flatnonzero(qfs[:-1] * qfs[1:] < 0.0)
+    if len(cross):
+        roots = points[cross] - qfs[cross] * (points[cross + 1] - points[cross]) / (qfs[cross + 1] - qfs[cross])
+        points = np.unique(np.concatenate((points, roots)))
+    # Titik yang hampir berimpit (selisih pembulatan) digabung
+    points = points[np.concatenate(([True], np.diff(points) > 1e-12))]
+    qfs = np.maximum(np.interp(points, depth_m, qs_kN) - qs_cut_kN, 0.0)
+    qb = np.interp(points, depth_m, qb_kN)
+
+    width = np.diff(points)
+    shaft = np.zeros((len(width), 3))
+    shaft[:, 0] = qfs[:-1]
+    shaft[:, 1] = np.diff(qfs) / width
+    tip_num = np.column_stack((qb[:-1], np.diff(qb) / width))
+    tip_den = np.zeros((len(width), 2))
+    tip_den[:, 0] = 1.0
+    layer = np.minimum(np.searchsorted(depth_m, points[1:], side="left"), len(depth_m) - 1)
+    return CapacityCurve(breaks=points, layer=layer, shaft=shaft, tip_num=tip_num, tip_den=tip_den, fs=fs)
+
+
+def compute_schmertmann(
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    dz: float,
+    cpt: CptSounding,
+    ks: float = 1.0,
+    qb_limit_kPa: float = SCHMERTMANN_QB_LIMIT_KPA,
+    spacing_m: Optional[float] = None,
+) -> CapacityResult:
+    """Kapasitas aksial metode Schmertmann dari sondir ``cpt``.
+
+    Qb = Ab * min((qc1 + qc2) / 2, ``qb_limit_kPa``) dan
+    Qfs = ``ks`` * keliling * integral sleeve friction berbobot dari cutoff
+    sampai kedalaman. ``ks`` adalah rasio friksi tiang/sleeve (Ks pasir
+    bergantung L/D dan material, atau alpha' untuk lempung). Data dibuat
+    seragam dengan ``CptSounding.resample(spacing_m)``. Kolom dan recap sama
+    dengan ``compute_capacity`` (ditambah qc, sleeve friction, qc1, qc2);
+    ``capacity_at`` memakai kurva linear antar bacaan sondir
+    (``_schmertmann_curve``), sama dengan kolom pada dz berapa pun.
+    """
+    if diameter_m <= 0.0:
+        raise ValueError("Pile Diameter should > 0")
+    if pile_depth_m <= 0.0:
+        raise ValueError("Depth of Pile should > 0")
+    if cutoff_m < 0.0:
+        raise ValueError("Cut Off Should have positive number")
+    if fs <= 0.0:
+        raise ValueError("Safety of Factor should > 0")
+    if dz <= 0.0:
+        raise ValueError("Vertical Increment should > 0")
+    if ks <= 0.0:
+        raise ValueError("Ks should > 0")
+
+    with run_metrics(method="Schmertmann", diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz) as metrics:
+        with stage("resample"):
+            grid = cpt.resample(spacing_m)
+            z_vals = np.arange(dz, pile_depth_m + dz, dz)
+            if z_vals[-1] > grid.depth_m[-1] + 1e-9:
+                raise ValueError("CPT sounding does not reach pile depth")
+            if z_vals[0] < grid.depth_m[0] - 1e-9:
+                raise ValueError("CPT sounding starts below the first depth increment")
+        count("depths", len(z_vals))
+        count("cpt_readings", len(grid))
+        h = float(grid.depth_m[1] - grid.depth_m[0])
+
+        with stage("tip"):
+            qc1, qc2 = _schmertmann_tip(grid.qc_kPa, h, diameter_m)
+            qb_kPa = np.minimum(0.5 * (qc1 + qc2), qb_limit_kPa)
+        with stage("shaft"):
+            shaft = _schmertmann_shaft(grid.depth_m, grid.sleeve_kPa, diameter_m)
+            shaft_cut = np.interp(cutoff_m, grid.depth_m, shaft, left=0.0)
+            shaft_z = np.maximum(np.interp(z_vals, grid.depth_m, shaft) - shaft_cut, 0.0)
+
+        ab_m2 = compute_pile_tip_area_m2_from_diameter(diameter_m)
+        shaft_kN = ks * compute_pile_perimeter_m_from_diameter(diameter_m)
+        qb_vals = np.interp(z_vals, grid.depth_m, qb_kPa) * ab_m2
+        qs_vals = shaft_kN * shaft_z
+        qult_vals = qb_vals + qs_vals
+        columns = {
+            "Depth_m": z_vals,
+            "qc_kPa": np.interp(z_vals, grid.depth_m, grid.qc_kPa),
+            "Sleeve_kPa": np.interp(z_vals, grid.depth_m, grid.sleeve_kPa),
+            "qc1_kPa": np.interp(z_vals, grid.depth_m, qc1),
+            "qc2_kPa": np.interp(z_vals, grid.depth_m, qc2),
+            "Qb_kN": qb_vals,
+            "Qfs_kN": qs_vals,
+            "Qult_kN": qult_vals,
+            "Qall_kN": qult_vals / fs,
+        }
+        curve_builder = partial(
+            _schmertmann_curve,
+            grid.depth_m,
+            qb_kPa * ab_m2,
+            shaft_kN * shaft,
+            shaft_kN * shaft_cut,
+            float(z_vals[-1]),
+            cutoff_m,
+            fs,
+        )
+        return CapacityResult(columns, _recap(columns, diameter_m, pile_depth_m, cutoff_m, fs), metrics, curve_builder)
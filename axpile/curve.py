@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .calc import (
+    _locate_layers,
+    _nspt_cumulative,
+    _nspt_window_sums,
+    _shaft_profile,
+    _sigma_profile,
+    _truncated_profile,
+)
+from .geometry import (
+    compute_pile_perimeter_m_from_diameter,
+    compute_pile_tip_area_m2_from_diameter,
+)
+from .methods import get_method
+from .models import Layers
+
+# Zona 4D dengan tebal ber-NSPT di bawah nilai ini dianggap kosong (Qb = NaN)
+_MIN_WINDOW_THICKNESS_M = 1e-9
+
+
+@dataclass
+class CapacityCurve:
+    """Kurva kapasitas vs kedalaman dalam bentuk piecewise analitik.
+
+    Segmen ``j`` berlaku untuk ``breaks[j] < z <= breaks[j + 1]`` (kedalaman
+    tepat di batas ikut segmen atas, sama seperti batas lapisan). Dengan
+    ``u = z - breaks[j]``:
+
+    - ``Qfs = shaft[j, 0] + shaft[j, 1] * u + shaft[j, 2] * u**2``
+      (linear untuk Decourt-Quaresma dan lempung, kuadrat untuk pasir
+      Mayerhof karena tegangan efektif naik linear),
+    - ``Qb = (tip_num[j, 0] + tip_num[j, 1] * u) / (tip_den[j, 0] + tip_den[j, 1] * u)``
+      (rata-rata NSPT zona 4D Decourt-Quaresma adalah rasio dua fungsi
+      linear; untuk Mayerhof penyebutnya 1).
+
+    Titik patah ada di batas lapisan, cutoff, dan (Decourt-Quaresma) di
+    kedalaman tempat tepi zona +-4D melewati batas lapisan, sehingga evaluasi
+    di kedalaman mana pun tepat (bukan interpolasi) dan O(log n).
+    """
+
+    breaks: np.ndarray
+    layer: np.ndarray
+    shaft: np.ndarray
+    tip_num: np.ndarray
+    tip_den: np.ndarray
+    fs: float
+
+    def __len__(self) -> int:
+        return len(self.layer)
+
+    @property
+    def max_depth_m(self) -> float:
+        return float(self.breaks[-1])
+
+    def segment_index(self, depths) -> np.ndarray:
+        """Index segmen untuk setiap kedalaman (bisection atas titik patah)."""
+        z = np.asarray(depths, dtype=float)
+        if np.any(z < 0.0):
+            raise ValueError("Depth should >= 0")
+        return _locate_layers(z, self.breaks[1:])
+
+    def evaluate(self, depths) -> dict[str, np.ndarray]:
+        """Qb, Qfs, Qult dan Qall (kN) pada kedalaman ``depths`` (skalar atau array)."""
+        z = np.asarray(depths, dtype=float)
+        j = self.segment_index(z)
+        u = z - self.breaks[j]
+        shaft = self.shaft[j]
+        qfs = shaft[..., 0] + u * (shaft[..., 1] + u * shaft[..., 2])
+        num = self.tip_num[j, 0] + self.tip_num[j, 1] * u
+        den = self.tip_den[j, 0] + self.tip_den[j, 1] * u
+        with np.errstate(invalid="ignore", divide="ignore"):
+            qb = np.where(den > _MIN_WINDOW_THICKNESS_M, num / den, np.nan)[()]
+        qult = qb + qfs
+        return {"Qb_kN": qb, "Qfs_kN": qfs, "Qult_kN": qult, "Qall_kN": qult / self.fs}
+
+    def __call__(self, depths) -> np.ndarray:
+        """Qall (kN) pada kedalaman ``depths``."""
+        return self.evaluate(depths)["Qall_kN"]
+
+    def sample(self, dz: float) -> dict[str, np.ndarray]:
+        """Kolom Q pada grid ``dz`` yang sama dengan ``compute_capacity`` (untuk tampilan)."""
+        if dz <= 0.0:
+            raise ValueError("Vertical Increment should > 0")
+        z_vals = np.arange(dz, self.max_depth_m + dz, dz)
+        return {"Depth_m": z_vals, **self.evaluate(z_vals)}
+
+
+def _breakpoints(
+    nspt_window: bool, tops: np.ndarray, bots: np.ndarray, cutoff_m: float, diameter_m: float
+) -> np.ndarray:
+    end = bots[-1]
+    points = [np.array([0.0, end, cutoff_m]), tops[1:]]
+    if nspt_window:
+        # Tepi zona [z - 4D, z + 4D] melewati batas lapisan (termasuk permukaan dan dasar profil)
+        edges = np.concatenate((tops, [end]))
+        points += [edges - 4 * diameter_m, edges + 4 * diameter_m]
+    points = np.unique(np.concatenate(points))
+    points = points[(points >= 0.0) & (points <= end)]
+    # Titik yang hampir berimpit (selisih pembulatan) digabung
+    keep = np.concatenate(([True], np.diff(points) > 1e-12))
+    return points[keep]
+
+
+def capacity_curve(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    layers: Layers,
+) -> CapacityCurve:
+    """Bangun ``CapacityCurve`` untuk input yang sama dengan ``compute_capacity`` (tanpa dz).
+
+    ``curve.evaluate(z)`` sama dengan baris ``compute_capacity`` di
+    kedalaman z (sebelum pembulatan), untuk z berapa pun sampai dasar tiang.
+    """
+    if fs <= 0.0:
+        raise ValueError("Safety of Factor should > 0")
+    spec = get_method(method)
+    profile = _truncated_profile(layers, pile_depth_m)
+    tops, bots = profile.top_m, profile.bot_m
+    breaks = _breakpoints(spec.nspt_window, tops, bots, cutoff_m, diameter_m)
+    x0, x1 = breaks[:-1], breaks[1:]
+    width = x1 - x0
+    k = _locate_layers(x1, bots)
+
+    ab_m2 = compute_pile_tip_area_m2_from_diameter(diameter_m)
+    perim_m = compute_pile_perimeter_m_from_diameter(diameter_m)
+
+    # Selimut: shaft_top[k] + (A + B (z - top)) * (z - e) untuk z >= e = max(top, cutoff)
+    sigma_top = _sigma_profile(profile)
+    qs_const, qs_slope = spec.shaft(profile, pile_types, pile_material)
+    shaft_top = _shaft_profile(profile, cutoff_m, qs_const, qs_slope, sigma_top)
+    gamma = np.nan_to_num(profile.gamma_eff)
+    e = np.maximum(tops[k], cutoff_m)
+    active = x1 > e
+    a = qs_const[k] + qs_slope[k] * sigma_top[k] + qs_slope[k] * gamma[k] * (x0 - tops[k])
+    b = qs_slope[k] * gamma[k]
+    d = np.where(active, x0 - e, 0.0)
+    shaft = np.zeros((len(k), 3))
+    shaft[:, 0] = shaft_top[k] + np.where(active, a * d, 0.0)
+    shaft[:, 1] = np.where(active, a + b * d, 0.0)
+    shaft[:, 2] = np.where(active, b, 0.0)
+    shaft *= perim_m
+
+    tip = spec.tip(profile, pile_types, pile_material)[k] * ab_m2
+    tip_num = np.zeros((len(k), 2))
+    tip_den = np.zeros((len(k), 2))
+    if spec.nspt_window:
+        # Jumlah zona 4D linear di dalam tiap segmen: cukup dievaluasi di kedua ujung
+        nspt_cum = _nspt_cumulative(profile)
+        r = 4 * diameter_m
+        w0, t0 = _nspt_window_sums(profile, nspt_cum, x0 - r, x0 + r)
+        w1, t1 = _nspt_window_sums(profile, nspt_cum, x1 - r, x1 + r)
+        tip_num[:, 0] = tip * w0
+        tip_num[:, 1] = tip * (w1 - w0) / width
+        tip_den[:, 0] = t0
+        tip_den[:, 1] = (t1 - t0) / width
+    else:
+        tip_num[:, 0] = tip
+        tip_den[:, 0] = 1.0
+    return CapacityCurve(breaks=breaks, layer=k, shaft=shaft, tip_num=tip_num, tip_den=tip_den, fs=fs)
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+@dataclass(frozen=True)
+class PileLayouts:
+    """Banyak layout tiang sekaligus sebagai array ragged (format CSR).
+
+    Koordinat tiang layout ``g`` adalah ``x[offsets[g]:offsets[g + 1]]`` dan
+    ``y[offsets[g]:offsets[g + 1]]``.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    offsets: np.ndarray
+
+    def __post_init__(self):
+        x = np.asarray(self.x, dtype=float)
+        y = np.asarray(self.y, dtype=float)
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("x and y should be 1-D arrays of the same length")
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(x):
+            raise ValueError("offsets should start at 0 and end at the number of piles")
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets should be non-decreasing")
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "offsets", offsets)
+
+    @classmethod
+    def from_layouts(cls, layouts: Sequence) -> "PileLayouts":
+        """Dari daftar layout; tiap layout berupa array (n, 2) atau DataFrame kolom ``X (m)``/``Y (m)``."""
+        xs, ys, counts = [], [], []
+        for layout in layouts:
+            if hasattr(layout, "columns"):
+                xy = np.column_stack((layout["X (m)"].to_numpy(float), layout["Y (m)"].to_numpy(float)))
+            else:
+                xy = np.asarray(layout, dtype=float).reshape(-1, 2)
+            xs.append(xy[:, 0])
+            ys.append(xy[:, 1])
+            counts.append(len(xy))
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        if not counts:
+            return cls(np.zeros(0), np.zeros(0), offsets)
+        return cls(np.concatenate(xs), np.concatenate(ys), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_piles(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def layout_index(self) -> np.ndarray:
+        """Index layout untuk setiap tiang."""
+        return np.repeat(np.arange(len(self)), self.n_piles)
+
+
+# Koordinat yang selisihnya tidak lebih dari ini dianggap satu baris/kolom (toleransi survei)
+DEFAULT_TOLERANCE_M = 0.01
+# Spasi minimum antar tiang sebagai kelipatan diameter
+MIN_SPACING_FACTOR = 2.5
+
+
+def _count_clusters(values: np.ndarray, group: np.ndarray, n_groups: int, tol_m: float) -> np.ndarray:
+    """Jumlah klaster nilai per grup; klaster baru dimulai bila celah terurut > ``tol_m``.
+
+    Dengan ``tol_m=0`` hasilnya sama dengan ``len(unique())`` per layout.
+    """
+    order = np.lexsort((values, group))
+    v, g = values[order], group[order]
+    new = np.ones(len(v), dtype=bool)
+    new[1:] = (g[1:] != g[:-1]) | (np.diff(v) > tol_m)
+    return np.bincount(g[new], minlength=n_groups)
+
+
+def grid_shape(layouts: PileLayouts, tol_m: float = DEFAULT_TOLERANCE_M) -> tuple[np.ndarray, np.ndarray]:
+    """Jumlah baris (klaster Y) dan kolom (klaster X) untuk setiap layout."""
+    if tol_m < 0.0:
+        raise ValueError("Tolerance should >= 0")
+    group = layouts.layout_index
+    n_rows = _count_clusters(layouts.y, group, len(layouts), tol_m)
+    n_cols = _count_clusters(layouts.x, group, len(layouts), tol_m)
+    return n_rows, n_cols
+
+
+def _ragged_ranges(lo: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pasangan (index query, posisi) untuk semua rentang ``lo[i]:lo[i] + counts[i]``."""
+    owner = np.repeat(np.arange(len(lo)), counts)
+    start = np.cumsum(counts) - counts
+    return owner, np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(start, counts)
+
+
+def nearest_spacing(layouts: PileLayouts) -> np.ndarray:
+    """Jarak ke tiang terdekat di layout yang sama, untuk setiap tiang (inf bila sendirian).
+
+    Memakai spatial hash grid seragam: tiap layout dibagi sel berukuran
+    ~sqrt(luas / jumlah tiang) sehingga rata-rata satu tiang per sel. Setiap
+    tiang memeriksa 3 x 3 sel di sekitarnya; hanya tiang yang tetangganya
+    lebih jauh dari satu sel yang melanjutkan ke cincin sel berikutnya.
+    Total O(n log n) untuk layout yang wajar (tanpa pairwise O(n^2)).
+    """
+    n = len(layouts.x)
+    best = np.full(n, np.inf)
+    if n == 0:
+        return best
+    group = layouts.layout_index
+    counts = layouts.n_piles
+    starts = layouts.offsets[:-1]
+    nonempty = counts > 0
+
+    # Ukuran sel dan jumlah sel per layout
+    x_min = np.full(len(layouts), np.inf)
+    y_min = np.full(len(layouts), np.inf)
+    x_max = np.full(len(layouts), -np.inf)
+    y_max = np.full(len(layouts), -np.inf)
+    x_min[nonempty] = np.minimum.reduceat(layouts.x, starts[nonempty])
+    y_min[nonempty] = np.minimum.reduceat(layouts.y, starts[nonempty])
+    x_max[nonempty] = np.maximum.reduceat(layouts.x, starts[nonempty])
+    y_max[nonempty] = np.maximum.reduceat(layouts.y, starts[nonempty])
+    width = np.where(nonempty, x_max - x_min, 0.0)
+    height = np.where(nonempty, y_max - y_min, 0.0)
+    n_safe = np.maximum(counts, 1)
+    cell = np.maximum.reduce([np.sqrt(width * height / n_safe), width / n_safe, height / n_safe])
+    cell = np.where(cell > 0.0, cell, 1.0)  # semua tiang berimpit
+    n_cx = (np.floor(width / cell) + 1).astype(np.int64)
+    n_cy = (np.floor(height / cell) + 1).astype(np.int64)
+
+    cx = np.minimum(np.floor((layouts.x - x_min[group]) / cell[group]).astype(np.int64), n_cx[group] - 1)
+    cy = np.minimum(np.floor((layouts.y - y_min[group]) / cell[group]).astype(np.int64), n_cy[group] - 1)
+    m = int(max(n_cx.max(), n_cy.max())) + 1
+
+    def encode(g, ix, iy):
+        return (g * m + ix) * m + iy
+
+    keys = encode(group, cx, cy)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    pending = np.flatnonzero(counts[group] > 1)
+    ring = 1
+    while len(pending):
+        pg, px, py = group[pending], cx[pending], cy[pending]
+        r = np.arange(-ring, ring + 1)
+        ox, oy = np.meshgrid(r, r, indexing="ij")
+        # Iterasi pertama memeriksa blok 3 x 3 penuh (termasuk sel sendiri), berikutnya hanya cincin luar
+        chebyshev = np.maximum(np.abs(ox), np.abs(oy))
+        on_ring = chebyshev <= ring if ring == 1 else chebyshev == ring
+        for dx, dy in zip(ox[on_ring], oy[on_ring]):
+            qx, qy = px + dx, py + dy
+            valid = (qx >= 0) & (qx < n_cx[pg]) & (qy >= 0) & (qy < n_cy[pg])
+            k = encode(pg, qx, qy)
+            lo = np.searchsorted(sorted_keys, k, side="left")
+            hi = np.searchsorted(sorted_keys, k, side="right")
+            owner, pos = _ragged_ranges(lo, np.where(valid, hi - lo, 0))
+            if len(owner) == 0:
+                continue
+            i, j = pending[owner], order[pos]
+            d = np.hypot(layouts.x[i] - layouts.x[j], layouts.y[i] - layouts.y[j])
+            d[i == j] = np.inf
+            np.minimum.at(best, i, d)
+        # Tiang di luar cincin ini berjarak > ring * cell, jadi hasil yang lebih dekat sudah pasti
+        done = (best[pending] <= ring * cell[pg]) | (ring >= np.maximum(n_cx[pg], n_cy[pg]))
+        pending = pending[~done]
+        ring += 1
+    return best
+
+
+@dataclass
+class LayoutCheck:
+    """Hasil pemeriksaan spasi per layout; ``nearest_m`` per tiang."""
+
+    nearest_m: np.ndarray
+    min_spacing_m: np.ndarray
+    n_too_close: np.ndarray
+    n_overlapping: np.ndarray
+
+
+def check_layouts(
+    layouts: Union[PileLayouts, Sequence],
+    diameter_m: ArrayLike,
+    min_spacing_m: ArrayLike = None,
+) -> LayoutCheck:
+    """Periksa spasi minimum dan tiang yang saling tumpang tindih.
+
+    Tiang dihitung terlalu dekat bila jarak ke tetangga terdekatnya kurang
+    dari ``min_spacing_m`` (default ``MIN_SPACING_FACTOR`` x diameter) dan
+    tumpang tindih bila kurang dari diameter.
+    """
+    if not isinstance(layouts, PileLayouts):
+        layouts = PileLayouts.from_layouts(layouts)
+    diameter_m = np.broadcast_to(np.asarray(diameter_m, dtype=float), (len(layouts),))
+    if min_spacing_m is None:
+        min_spacing_m = MIN_SPACING_FACTOR * diameter_m
+    min_spacing_m = np.broadcast_to(np.asarray(min_spacing_m, dtype=float), (len(layouts),))
+
+    nearest = nearest_spacing(layouts)
+    group = layouts.layout_index
+    layout_min = np.full(len(layouts), np.inf)
+    np.minimum.at(layout_min, group, nearest)
+    too_close = np.bincount(group, weights=nearest < min_spacing_m[group], minlength=len(layouts))
+    overlapping = np.bincount(group, weights=nearest < diameter_m[group], minlength=len(layouts))
+    return LayoutCheck(
+        nearest_m=nearest,
+        min_spacing_m=layout_min,
+        n_too_close=too_close.astype(np.int64),
+        n_overlapping=overlapping.astype(np.int64),
+    )
+
+
+def converse_labarre(n_rows: ArrayLike, n_cols: ArrayLike, diameter_m: ArrayLike, spacing_m: ArrayLike) -> np.ndarray:
+    """Efisiensi Converse-Labarre: 1 - theta [(n-1) m + (m-1) n] / (90 m n), theta = atan(D/s) (derajat)."""
+    m = np.asarray(n_rows, dtype=float)
+    n = np.asarray(n_cols, dtype=float)
+    theta_deg = np.degrees(np.arctan(np.asarray(diameter_m, dtype=float) / np.asarray(spacing_m, dtype=float)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        eta = 1 - theta_deg * ((n - 1) * m + (m - 1) * n) / (90 * m * n)
+    return np.maximum(eta, 0.0)
+
+
+def feld(n_rows: ArrayLike, n_cols: ArrayLike) -> np.ndarray:
+    """Efisiensi Feld: kapasitas tiap tiang berkurang 1/16 per tiang tetangga (termasuk diagonal)."""
+    m = np.asarray(n_rows, dtype=float)
+    n = np.asarray(n_cols, dtype=float)
+    # Jumlah pasangan bertetangga pada grid m x n: horizontal, vertikal, dua diagonal
+    pairs = m * (n - 1) + n * (m - 1) + 2 * (m - 1) * (n - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        eta = 1 - 2 * pairs / (16 * m * n)
+    return np.maximum(eta, 0.0)
+
+
+def los_angeles(n_rows: ArrayLike, n_cols: ArrayLike, diameter_m: ArrayLike, spacing_m: ArrayLike) -> np.ndarray:
+    """Efisiensi Los Angeles Group Action: 1 - D / (pi s m n) [m(n-1) + n(m-1) + sqrt(2)(m-1)(n-1)]."""
+    m = np.asarray(n_rows, dtype=float)
+    n = np.asarray(n_cols, dtype=float)
+    d = np.asarray(diameter_m, dtype=float)
+    s = np.asarray(spacing_m, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        eta = 1 - d / (np.pi * s * m * n) * (m * (n - 1) + n * (m - 1) + np.sqrt(2) * (m - 1) * (n - 1))
+    return np.maximum(eta, 0.0)
+
+
+EFFICIENCY_METHODS = ["Converse-Labarre", "Feld", "Los Angeles"]
+
+
+@dataclass
+class GroupEfficiency:
+    """Efisiensi kelompok tiang per layout (satu elemen array per layout)."""
+
+    method: str
+    n_piles: np.ndarray
+    n_rows: np.ndarray
+    n_cols: np.ndarray
+    theta_deg: np.ndarray
+    efficiency: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.efficiency)
+
+    def group_capacity(self, qall_single_kN: ArrayLike) -> np.ndarray:
+        """Qall kelompok (kN): efisiensi x Qall satu tiang x jumlah tiang."""
+        return self.efficiency * np.asarray(qall_single_kN, dtype=float) * self.n_piles
+
+
+def group_efficiency(
+    layouts: Union[PileLayouts, Sequence],
+    diameter_m: ArrayLike,
+    spacing_m: ArrayLike,
+    method: str = "Converse-Labarre",
+    tol_m: float = DEFAULT_TOLERANCE_M,
+) -> GroupEfficiency:
+    """Efisiensi kelompok untuk banyak layout sekaligus.
+
+    ``diameter_m`` dan ``spacing_m`` boleh skalar atau satu nilai per layout.
+    Jumlah baris dan kolom dihitung dari klaster koordinat Y dan X; koordinat
+    yang berselisih tidak lebih dari ``tol_m`` dianggap satu baris/kolom.
+    Layout tanpa tiang menghasilkan efisiensi NaN.
+    """
+    if not isinstance(layouts, PileLayouts):
+        layouts = PileLayouts.from_layouts(layouts)
+    diameter_m = np.broadcast_to(np.asarray(diameter_m, dtype=float), (len(layouts),))
+    spacing_m = np.broadcast_to(np.asarray(spacing_m, dtype=float), (len(layouts),))
+    if np.any(diameter_m <= 0.0):
+        raise ValueError("Pile Diameter should > 0")
+    if np.any(spacing_m <= 0.0):
+        raise ValueError("Spacing should > 0")
+
+    n_rows, n_cols = grid_shape(layouts, tol_m)
+    if method == "Converse-Labarre":
+        eta = converse_labarre(n_rows, n_cols, diameter_m, spacing_m)
+    elif method == "Feld":
+        eta = feld(n_rows, n_cols)
+    elif method == "Los Angeles":
+        eta = los_angeles(n_rows, n_cols, diameter_m, spacing_m)
+    else:
+        raise ValueError(f"Efficiency method '{method}' is not supported")
+    # Rumus Feld/Los Angeles memberi -inf (lalu 0) untuk m = n = 0
+    eta = np.where(layouts.n_piles > 0, eta, np.nan)
+    return GroupEfficiency(
+        method=method,
+        n_piles=layouts.n_piles,
+        n_rows=n_rows,
+        n_cols=n_cols,
+        theta_deg=np.degrees(np.arctan(diameter_m / spacing_m)),
+        efficiency=eta,
+    )
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+Sink = Callable[[dict], None]
+
+
+@dataclass
+class RunMetrics:
+    """Waktu (detik) dan counter per tahap untuk satu run perhitungan."""
+
+    info: dict = field(default_factory=dict)
+    timings_s: dict[str, float] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.timings_s[name] = self.timings_s.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def as_dict(self) -> dict:
+        return {"info": dict(self.info), "timings_s": dict(self.timings_s), "counters": dict(self.counters)}
+
+
+class Instrumentation:
+    """Sesi instrumentasi: menjumlahkan metrik semua run dan meneruskannya ke sink.
+
+    ``sink`` dipanggil sekali per run dengan ``RunMetrics.as_dict()``.
+    """
+
+    def __init__(self, sink: Optional[Sink] = None):
+        self.sink = sink
+        self.runs = 0
+        self.totals = RunMetrics()
+        self._lock = threading.Lock()
+
+    def record(self, metrics: RunMetrics) -> None:
+        with self._lock:
+            self.runs += 1
+            for name, seconds in metrics.timings_s.items():
+                self.totals.add_time(name, seconds)
+            for name, n in metrics.counters.items():
+                self.totals.count(name, n)
+        if self.sink is not None:
+            self.sink(metrics.as_dict())
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"runs": self.runs, **self.totals.as_dict()}
+
+
+class LoggingSink:
+    """Sink yang menulis metrik tiap run sebagai JSON ke ``logging``."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger if logger is not None else logging.getLogger("axpile.instrument")
+        self.level = level
+
+    def __call__(self, record: dict) -> None:
+        self.logger.log(self.level, "axpile run %s", json.dumps(record))
+
+
+class JsonLinesSink:
+    """Sink yang menambahkan satu baris JSON per run ke file ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+# Sesi aktif (per thread/konteks) dan sesi global dari enable(); None = nonaktif
+_session: ContextVar[Optional[Instrumentation]] = ContextVar("axpile_instrumentation", default=None)
+_global_session: Optional[Instrumentation] = None
+_run: ContextVar[Optional[RunMetrics]] = ContextVar("axpile_run_metrics", default=None)
+
+
+def current_session() -> Optional[Instrumentation]:
+    session = _session.get()
+    return session if session is not None else _global_session
+
+
+@contextmanager
+def instrument(sink: Optional[Sink] = None) -> Iterator[Instrumentation]:
+    """Aktifkan instrumentasi di dalam blok ``with``.
+
+    Contoh::
+
+        with instrument(JsonLinesSink("runs.jsonl")) as session:
+            result = compute_capacity(...)
+        result.metrics.timings_s, session.summary()
+    """
+    session = Instrumentation(sink)
+    token = _session.set(session)
+    try:
+        yield session
+    finally:
+        _session.reset(token)
+
+
+def enable(sink: Optional[Sink] = None) -> Instrumentation:
+    """Aktifkan instrumentasi untuk seluruh proses sampai ``disable()`` dipanggil."""
+    global _global_session
+    _global_session = Instrumentation(sink)
+    return _global_session
+
+
+def disable() -> None:
+    global _global_session
+    _global_session = None
+
+
+@contextmanager
+def run_metrics(**info) -> Iterator[Optional[RunMetrics]]:
+    """Lingkup satu run; menghasilkan None bila instrumentasi nonaktif.
+
+    Run bersarang (mis. ``compute_distributions`` memanggil
+    ``compute_capacity``) memakai ``RunMetrics`` yang sama dan hanya run
+    terluar yang dikirim ke sink.
+    """
+    outer = _run.get()
+    if outer is not None:
+        yield outer
+        return
+    session = current_session()
+    if session is None:
+        yield None
+        return
+    metrics = RunMetrics(info=info)
+    token = _run.set(metrics)
+    t0 = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.add_time("total", time.perf_counter() - t0)
+        _run.reset(token)
+        session.record(metrics)
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics: RunMetrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_time(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, metrics: Optional[RunMetrics] = None):
+    """Context manager pencatat waktu tahap ``name`` pada run aktif (atau ``metrics``)."""
+    if metrics is None:
+        metrics = _run.get()
+        if metrics is None:
+            return _NULL_STAGE
+    return _Stage(metrics, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Tambah counter ``name`` pada run aktif (tidak melakukan apa-apa bila nonaktif)."""
+    metrics = _run.get()
+    if metrics is not None:
+        metrics.count(name, n)
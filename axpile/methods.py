@@ -0,0 +1,242 @@
+"""Registry metode kapasitas berbasis lapisan tanah.
+
+Setiap metode menyediakan kernel array untuk tahanan selimut dan ujung satuan
+per lapisan; ``compute_capacity``, sweep, kurva, Monte Carlo dan sensitivitas
+mencari metode sekali per run lalu hanya memanggil kernelnya. Metode baru
+cukup didaftarkan dengan ``register_method``::
+
+    register_method(CapacityMethod(
+        name="Metode Saya",
+        shaft=my_shaft,        # (profile, pile_type, pile_material) -> (qs_const, qs_slope)
+        tip=my_tip,            # (profile, pile_type, pile_material) -> qb per lapisan (kPa)
+        columns=my_columns,    # kolom deskriptif tabel distribusi
+        required={"clay": ("su",), "sand": ("nspt",)},
+    ))
+
+Kernel harus menerima parameter tanah dengan sumbu batch di depan
+(n_varian, n_lapisan) seperti yang dipakai ``axpile.reliability``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .models import (
+    KDP_KPA,
+    PILE_ALPHA,
+    PILE_BETA,
+    PILE_TYPES,
+    PileMaterial,
+    SoilProfile,
+    pile_type_code,
+    soil_type_table_index,
+)
+
+ShaftKernel = Callable[[SoilProfile, Optional[str], Optional[str]], Tuple[np.ndarray, np.ndarray]]
+TipKernel = Callable[[SoilProfile, Optional[str], Optional[str]], np.ndarray]
+ColumnsKernel = Callable[[SoilProfile, np.ndarray, np.ndarray, Optional[str], Optional[str]], dict]
+
+# 1 ton/ft2 dalam kPa (korelasi Reese & Wright dalam tsf)
+TSF_KPA = 95.76
+
+
+@dataclass(frozen=True)
+class CapacityMethod:
+    """Satu metode kapasitas aksial berbasis lapisan.
+
+    - ``shaft``: koefisien tahanan selimut satuan per lapisan
+      ``qs = qs_const + qs_slope * sigma_eff`` (kPa).
+    - ``tip``: tahanan ujung satuan per lapisan (kPa); bila ``nspt_window``
+      nilainya per satuan NSPT rata-rata zona [z - 4D, z + 4D].
+    - ``columns``: kolom deskriptif tabel distribusi pada index lapisan
+      ``idx`` (tanpa Depth_m dan kolom Q); kolom kategori
+      (``result.CATEGORY_COLUMNS``) berisi kode, bukan nama.
+    - ``required``: parameter wajib (> 0) per perilaku tanah, diperiksa
+      ``validate_inputs``.
+    - ``variant``/``variants``: sumbu varian sweep ("pile_type" atau
+      "pile_material") dan nilai default-nya; None bila metode tidak
+      bergantung pada tipe maupun material tiang.
+    """
+
+    name: str
+    shaft: ShaftKernel
+    tip: TipKernel
+    columns: ColumnsKernel
+    required: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    nspt_window: bool = False
+    variant: Optional[str] = None
+    variants: Tuple[str, ...] = ()
+
+
+METHODS: dict[str, CapacityMethod] = {}
+
+
+def register_method(method: CapacityMethod) -> CapacityMethod:
+    """Daftarkan (atau ganti) metode berdasarkan ``method.name``."""
+    METHODS[method.name] = method
+    return method
+
+
+def get_method(name: str) -> CapacityMethod:
+    try:
+        return METHODS[name]
+    except KeyError:
+        raise ValueError(f"Method '{name}' is not supported") from None
+
+
+# Decourt Quaresma
+
+
+def _dq_tables(profile: SoilProfile, pile_type: Optional[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Alpha, beta dan Kdp per lapisan dari tabel terkompilasi (fancy indexing)."""
+    p = pile_type_code(pile_type)
+    alpha = PILE_ALPHA[p, profile.behavior_code]
+    beta = PILE_BETA[p, profile.behavior_code]
+    kdp = KDP_KPA[soil_type_table_index(profile.soil_type_code)]
+    unknown = np.isnan(alpha) | np.isnan(kdp)
+    if np.any(unknown):
+        i = int(np.argmax(unknown)) + 1
+        raise ValueError(f"Layer #{i}: soil behavior/type is not supported for Decourt-Quaresma")
+    return alpha, beta, kdp
+
+
+def _dq_shaft(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]):
+    _, beta_seg, _ = _dq_tables(profile, pile_type)
+    qs_const = beta_seg * 10 * ((profile.nspt / 3) + 1)
+    return qs_const, np.zeros(np.shape(qs_const))
+
+
+def _dq_tip(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]) -> np.ndarray:
+    alpha_seg, _, kdp_seg = _dq_tables(profile, pile_type)
+    return alpha_seg * kdp_seg
+
+
+def _dq_columns(profile: SoilProfile, idx: np.ndarray, sigma_z: np.ndarray, pile_type, pile_material) -> dict:
+    alpha_seg, beta_seg, kdp_seg = _dq_tables(profile, pile_type)
+    return {
+        "Soil Behavior": profile.behavior_code[idx],
+        "Soil Type": profile.soil_type_code[idx],
+        "Alpha": alpha_seg[idx],
+        "Beta": beta_seg[idx],
+        "kdp_kPa": kdp_seg[idx],
+    }
+
+
+# Mayerhof
+
+
+def _mayerhof_sand_factor(phi: np.ndarray, pile_material: Optional[str]) -> np.ndarray:
+    """Faktor Ks * tan(delta) selimut pasir Mayerhof per material tiang."""
+    if pile_material == "Steel":
+        delta = np.full_like(phi, 20.0)
+        ks = 0.029412 * phi - 0.32353
+    elif pile_material == "Concrete":
+        delta = (3 / 4) * phi
+        ks = 0.029412 * phi + 0.67647059
+    elif pile_material == "Timber":
+        delta = (2 / 3) * phi
+        ks = 0.1470588 * phi - 2.6176470588
+    else:
+        raise ValueError(f"Pile material '{pile_material}' is not supported for Mayerhof sand layers")
+    return ks * np.tan(delta * np.pi / 180.0)
+
+
+def _mayerhof_shaft(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]):
+    behavior = profile.behavior
+    is_clay = behavior == "clay"
+    is_sand = behavior == "sand"
+    qs_const = np.where(is_clay, np.nan_to_num(profile.alpha_tomlinson * profile.su), 0.0)
+    qs_slope = np.zeros(np.shape(profile.phi))
+    if np.any(is_sand):
+        qs_slope[..., is_sand] = _mayerhof_sand_factor(profile.phi[..., is_sand], pile_material)
+    return qs_const, qs_slope
+
+
+def _mayerhof_tip(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]) -> np.ndarray:
+    behavior = profile.behavior
+    is_clay = behavior == "clay"
+    is_sand = behavior == "sand"
+    qb_seg = np.zeros(np.broadcast_shapes(np.shape(profile.su), np.shape(profile.phi)))
+    qb_seg[..., is_clay] = np.nan_to_num(9 * profile.su[..., is_clay])
+    qb_seg[..., is_sand] = (280.19 * np.minimum(profile.phi[..., is_sand], 42)) - 7845.177
+    return qb_seg
+
+
+def _mayerhof_columns(profile: SoilProfile, idx: np.ndarray, sigma_z: np.ndarray, pile_type, pile_material) -> dict:
+    return {
+        "Soil Behavior": profile.behavior_code[idx],
+        "Alpha": np.nan_to_num(profile.alpha_tomlinson)[idx],
+        "Su_kPa": np.nan_to_num(profile.su)[idx],
+        "Sigma_eff_kPa": sigma_z,
+    }
+
+
+# Reese & Wright (1977), tiang bor: lempung dari Su, pasir dari NSPT
+
+
+def _reese_wright_shaft(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]):
+    behavior = profile.behavior
+    # Pasir: f = N/34 tsf (N <= 53), (N - 53)/450 + 1.6 tsf (53 < N <= 100)
+    n = np.minimum(profile.nspt, 100.0)
+    f_sand = np.where(n <= 53.0, n / 34.0, (n - 53.0) / 450.0 + 1.6) * TSF_KPA
+    qs_const = np.where(
+        behavior == "clay",
+        np.nan_to_num(0.55 * profile.su),
+        np.where(behavior == "sand", np.nan_to_num(f_sand), 0.0),
+    )
+    return qs_const, np.zeros(np.shape(qs_const))
+
+
+def _reese_wright_tip(profile: SoilProfile, pile_type: Optional[str], pile_material: Optional[str]) -> np.ndarray:
+    behavior = profile.behavior
+    # Pasir: qp = 2N/3 tsf (N <= 60), 40 tsf di atasnya
+    qp_sand = np.minimum(2.0 * profile.nspt / 3.0, 40.0) * TSF_KPA
+    return np.where(
+        behavior == "clay",
+        np.nan_to_num(9.0 * profile.su),
+        np.where(behavior == "sand", np.nan_to_num(qp_sand), 0.0),
+    )
+
+
+def _reese_wright_columns(profile: SoilProfile, idx: np.ndarray, sigma_z: np.ndarray, pile_type, pile_material) -> dict:
+    return {
+        "Soil Behavior": profile.behavior_code[idx],
+        "NSPT": np.nan_to_num(profile.nspt)[idx],
+        "Su_kPa": np.nan_to_num(profile.su)[idx],
+    }
+
+
+register_method(
+    CapacityMethod(
+        name="Decourt-Quaresma",
+        shaft=_dq_shaft,
+        tip=_dq_tip,
+        columns=_dq_columns,
+        required={"clay": ("nspt",), "silt": ("nspt",), "sand": ("nspt",)},
+        nspt_window=True,
+        variant="pile_type",
+        variants=PILE_TYPES,
+    )
+)
+register_method(
+    CapacityMethod(
+        name="Mayerhof",
+        shaft=_mayerhof_shaft,
+        tip=_mayerhof_tip,
+        columns=_mayerhof_columns,
+        required={"clay": ("su", "alpha_tomlinson"), "sand": ("gamma_eff", "phi")},
+        variant="pile_material",
+        variants=tuple(PileMaterial),
+    )
+)
+register_method(
+    CapacityMethod(
+        name="Reese & Wright",
+        shaft=_reese_wright_shaft,
+        tip=_reese_wright_tip,
+        columns=_reese_wright_columns,
+        required={"clay": ("su",), "sand": ("nspt",)},
+    )
+)
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
-from typing import Literal, Optional
+from dataclasses import dataclass, field
+from typing import Literal, Optional, Sequence, Union
 
-from pandas.core.computation.ops import Op
+import numpy as np
 
 Method =[
     "Decourt-Quaresma",
@@ -10,6 +10,8 @@ Method =[
     "Schmertmann"
 ]
 
+PileMaterial = ["Steel", "Concrete", "Timber"]
+
 PileData_alpha = {
     "Prefabricated driven piles or steel piles": {"sand": 1.0, "clay": 1.0, "silt": 1.0},
     "Franki piles": {"sand": 1.0, "clay": 1.0, "silt": 1.0},
@@ -73,18 +75,187 @@ class SoilLayer:
     thickness_m: float
     soil_behavior: SoilBehavior
     soil_type:Optional[str]
-    # Clay params
+    # Clay, silt and sand params (Decourt-Quaresma)
     nspt: Optional[float] = None
+    # Clay params
     su:Optional[float] = None
     alpha_tomlinson:Optional[float] = None
+    # Clay and sand params
     gamma_eff: Optional[float] = None
-    # Silt params
-    nspt: Optional[float] = None
     # Sand params
-    nspt: Optional[float] = None
-    gamma_eff: Optional[float] = None
     phi: Optional[float] = None
 
+
+SOIL_PARAMS = ("nspt", "su", "alpha_tomlinson", "gamma_eff", "phi")
+
+# Label parameter untuk pesan validasi
+PARAM_LABELS = {
+    "nspt": "NSPT",
+    "su": "Su",
+    "alpha_tomlinson": "Alpha",
+    "gamma_eff": "Effective Unit Weight",
+    "phi": "Friction Angle",
+}
+
+# Tabel di atas dikompilasi menjadi kode integer (indeks ke tuple nama) dan
+# array lookup, sehingga koefisien semua lapisan/kedalaman dibaca dengan
+# fancy indexing. Kode -1 (tidak dikenal) jatuh ke elemen terakhir (None/NaN).
+# Jenis tanah di luar ``Kdp`` (teks bebas) mendapat kode setelah sentinel None
+# per profil (lihat ``SoilProfile.soil_type_names``); ``soil_type_table_index``
+# memetakannya ke sentinel untuk lookup tabel.
+SOIL_TYPES = tuple(Kdp)
+PILE_TYPES = tuple(PileData_alpha)
+
+_BEHAVIOR_NAMES = np.array(SoilBehavior + [None], dtype=object)
+_SOIL_TYPE_NAMES = np.array(list(SOIL_TYPES) + [None], dtype=object)
+_SOIL_TYPE_NAMES.flags.writeable = False
+
+KDP_KPA = np.array([Kdp[t] for t in SOIL_TYPES] + [np.nan], dtype=float)
+# (n_tipe_tiang, n_perilaku + 1), kolom mengikuti urutan SoilBehavior
+PILE_ALPHA = np.array([[PileData_alpha[p][b] for b in SoilBehavior] + [np.nan] for p in PILE_TYPES])
+PILE_BETA = np.array([[PileData_beta[p][b] for b in SoilBehavior] + [np.nan] for p in PILE_TYPES])
+
+
+def soil_type_table_index(codes: np.ndarray) -> np.ndarray:
+    """Indeks baris ``KDP_KPA`` untuk kode jenis tanah (teks bebas -> NaN)."""
+    return np.minimum(codes, len(SOIL_TYPES))
+
+
+def pile_type_code(pile_type: Optional[str]) -> int:
+    """Kode tipe tiang (indeks ke ``PILE_TYPES``)."""
+    try:
+        return PILE_TYPES.index(pile_type)
+    except ValueError:
+        raise ValueError(f"Pile type '{pile_type}' is not supported") from None
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+@dataclass(frozen=True)
+class SoilProfile:
+    """Profil tanah kolumnar (struct-of-arrays), satu elemen per lapisan.
+
+    Dibangun sekali lalu dipakai bersama (read-only) oleh perhitungan,
+    validasi dan grafik. Parameter yang tidak diisi bernilai NaN; kode
+    perilaku tanah adalah indeks ke ``SoilBehavior`` (-1 bila tidak dikenal).
+    Kode jenis tanah adalah indeks ke ``soil_type_names``: ``SOIL_TYPES``,
+    None, lalu jenis tanah teks bebas profil ini, sehingga namanya tetap utuh.
+    """
+
+    top_m: np.ndarray
+    thickness_m: np.ndarray
+    behavior_code: np.ndarray
+    soil_type_code: np.ndarray
+    nspt: np.ndarray
+    su: np.ndarray
+    alpha_tomlinson: np.ndarray
+    gamma_eff: np.ndarray
+    phi: np.ndarray
+    soil_type_names: np.ndarray = field(default_factory=lambda: _SOIL_TYPE_NAMES, repr=False)
+    bot_m: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "bot_m", self.top_m + self.thickness_m)
+        for name in ("top_m", "thickness_m", "behavior_code", "soil_type_code", "bot_m") + SOIL_PARAMS:
+            _readonly(getattr(self, name))
+
+    @classmethod
+    def from_layers(cls, layers: Sequence[SoilLayer]) -> "SoilProfile":
+        """Bangun profil dari daftar ``SoilLayer`` (urut dari atas)."""
+        thickness = np.array([layer.thickness_m for layer in layers], dtype=float)
+        codes = {name: i for i, name in enumerate(SoilBehavior)}
+        type_names = list(_SOIL_TYPE_NAMES)
+        type_codes = {name: i for i, name in enumerate(type_names)}
+        for layer in layers:
+            if layer.soil_type not in type_codes:
+                type_codes[layer.soil_type] = len(type_names)
+                type_names.append(layer.soil_type)
+        params = {
+            name: np.array(
+                [np.nan if getattr(layer, name) is None else float(getattr(layer, name)) for layer in layers],
+                dtype=float,
+            )
+            for name in SOIL_PARAMS
+        }
+        return cls(
+            top_m=np.concatenate(([0.0], np.cumsum(thickness)[:-1])) if len(layers) else np.zeros(0),
+            thickness_m=thickness,
+            behavior_code=np.array([codes.get(layer.soil_behavior, -1) for layer in layers], dtype=np.int8),
+            soil_type_code=np.array([type_codes[layer.soil_type] for layer in layers], dtype=np.int16),
+            **params,
+            soil_type_names=_readonly(np.array(type_names, dtype=object)),
+        )
+
+    def to_layers(self) -> list[SoilLayer]:
+        """Kembalikan profil sebagai daftar ``SoilLayer`` (NaN -> None)."""
+        behavior = self.behavior
+        layers = []
+        for i in range(len(self)):
+            params = {name: getattr(self, name)[i] for name in SOIL_PARAMS}
+            layers.append(
+                SoilLayer(
+                    thickness_m=float(self.thickness_m[i]),
+                    soil_behavior=behavior[i],
+                    soil_type=self.soil_type[i],
+                    **{k: None if np.isnan(v) else float(v) for k, v in params.items()},
+                )
+            )
+        return layers
+
+    def __len__(self) -> int:
+        return len(self.thickness_m)
+
+    @property
+    def behavior(self) -> np.ndarray:
+        """Nama perilaku tanah tiap lapisan (array object)."""
+        return _BEHAVIOR_NAMES[self.behavior_code]
+
+    @property
+    def soil_type(self) -> np.ndarray:
+        """Nama jenis tanah tiap lapisan (array object)."""
+        return self.soil_type_names[self.soil_type_code]
+
+    def truncate(self, pile_depth_m: float) -> "SoilProfile":
+        """Potong profil sampai kedalaman tiang (setara ``expand_layers_to_depth``)."""
+        n = int(np.searchsorted(self.top_m, pile_depth_m, side="left"))
+        top = self.top_m[:n]
+        return SoilProfile(
+            top_m=top.copy(),
+            thickness_m=np.minimum(self.bot_m[:n], pile_depth_m) - top,
+            behavior_code=self.behavior_code[:n].copy(),
+            soil_type_code=self.soil_type_code[:n].copy(),
+            **{name: getattr(self, name)[:n].copy() for name in SOIL_PARAMS},
+            soil_type_names=self.soil_type_names,
+        )
+
+
+Layers = Union[Sequence[SoilLayer], SoilProfile]
+
+
+def as_profile(layers: Layers) -> SoilProfile:
+    """Terima ``SoilProfile`` atau daftar ``SoilLayer`` dan kembalikan ``SoilProfile``."""
+    if isinstance(layers, SoilProfile):
+        return layers
+    return SoilProfile.from_layers(layers)
+
+
+@dataclass(frozen=True)
+class PileConfig:
+    """Konfigurasi tiang; nama field sama dengan argumen ``compute_distributions``."""
+
+    method: str
+    diameter_m: float
+    pile_depth_m: float
+    cutoff_m: float
+    fs: float
+    dz: float
+    pile_material: Optional[str] = None
+    pile_types: Optional[str] = None
+
+
 def validate_inputs(
     method:str,
     diameter_m: float,
@@ -92,7 +263,7 @@ def validate_inputs(
     cutoff_m:float,
     fs: float,
     dz: float,
-    layers: list[SoilLayer],
+    layers: Layers,
 ) -> None:
     if diameter_m <= 0.0:
         raise ValueError("Pile Diameter should > 0")
@@ -104,47 +275,22 @@ def validate_inputs(
         raise ValueError("Safety of Factor should > 0")
     if dz <= 0.0:
         raise ValueError("Vertical Increment should > 0")
-    if len(layers) == 0:
+    profile = as_profile(layers)
+    if len(profile) == 0:
         raise ValueError("1 layer minimun required")
-    for i, layer in enumerate(layers, start=1):
-        if layer.thickness_m <= 0.0:
-            raise ValueError(f"layer #{i} thickness should > 0")
-
-        if method == "Decourt-Quaresma":
-            if layer.soil_behavior == "clay":
-                if layer.nspt is None:
-                    raise ValueError(f"Clay Layer #{i}: Fill NSPT")
-                if layer.nspt <= 0.0:
-                    raise ValueError(f"Clay Layer #{i}: NSPT should > 0")
-            if layer.soil_behavior == "silt":
-                if layer.nspt is None:
-                    raise ValueError(f"Silt Layer #{i}: Fill NSPT")
-                if layer.nspt <= 0.0:
-                    raise ValueError(f"Silt Layer #{i}: NSPT should > 0")
-            if layer.soil_behavior == "sand":
-                if layer.nspt is None:
-                    raise ValueError(f"Sand Layer #{i}: Fill NSPT")
-                if layer.nspt <= 0.0:
-                    raise ValueError(f"Sand Layer #{i}: NSPT should > 0")
-
-        if method == "Mayerhof":
-            if layer.soil_behavior == "clay":
-                if layer.su is None:
-                    raise ValueError(f"Clay Layer #{i}: Fill Su")
-                if layer.su <= 0.0:
-                    raise ValueError(f"Clay Layer #{i}: Su should > 0")
-                if layer.alpha_tomlinson is None:
-                    raise ValueError(f"Clay Layer #{i}: Fill Alpha")
-                if layer.alpha_tomlinson <= 0.0:
-                    raise ValueError(f"Clay Layer #{i}: Alpha should > 0")
-            if layer.soil_behavior == "sand":
-                if layer.gamma_eff is None:
-                    raise ValueError(f"Sand Layer #{i}: Fill Effective Unit Weight")
-                if layer.gamma_eff <= 0.0:
-                    raise ValueError(f"Sand Layer #{i}: Effective Unit Weight should > 0")
-                if layer.phi is None:
-                    raise ValueError(f"Sand Layer #{i}: Fill Friction Angle")
-                if layer.phi <= 0.0:
-                    raise ValueError(f"Sand Layer #{i}: Fill Friction Angle should > 0")
-
+    # Import di sini: modul methods memakai tabel dari modul ini
+    from .methods import METHODS
 
+    required = METHODS[method].required if method in METHODS else {}
+    behavior = profile.behavior
+    for i in range(1, len(profile) + 1):
+        soil_behavior = behavior[i - 1]
+        if profile.thickness_m[i - 1] <= 0.0:
+            raise ValueError(f"layer #{i} thickness should > 0")
+        for name in required.get(soil_behavior, ()):
+            value = getattr(profile, name)[i - 1]
+            label = PARAM_LABELS[name]
+            if np.isnan(value):
+                raise ValueError(f"{soil_behavior.capitalize()} Layer #{i}: Fill {label}")
+            if value <= 0.0:
+                raise ValueError(f"{soil_behavior.capitalize()} Layer #{i}: {label} should > 0")
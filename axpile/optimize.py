@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .methods import get_method
+from .models import Layers, as_profile
+from .sweep import sweep_distributions
+
+
+@dataclass
+class PileDesign:
+    """Tiang terpilih hasil optimasi."""
+
+    diameter_m: float
+    pile_depth_m: float
+    pilelength_m: float
+    volume_m3: float
+    qall_kN: float
+
+
+class PileOptimizer:
+    """Cari tiang termurah (volume beton terkecil) yang memikul beban kerja target.
+
+    Kurva Qall vs kedalaman tiang (nilai ``recap["Qall_total_kN"]`` dari
+    ``compute_distributions`` untuk tiap kedalaman kelipatan ``dz``) dihitung
+    sekali per diameter lalu disimpan. Selubung maksimum kumulatif kurva
+    tersebut monoton, sehingga kedalaman minimum untuk beban apa pun
+    ditemukan dengan bisection (``searchsorted``) tanpa menghitung ulang.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        layers: Layers,
+        cutoff_m: float,
+        fs: float,
+        max_depth_m: float,
+        dz: float,
+        pile_material: Optional[str] = None,
+        pile_types: Optional[str] = None,
+    ):
+        if max_depth_m <= 0.0:
+            raise ValueError("Depth of Pile should > 0")
+        if dz <= 0.0:
+            raise ValueError("Vertical Increment should > 0")
+        self.method = method
+        self.profile = as_profile(layers)
+        self.cutoff_m = cutoff_m
+        self.fs = fs
+        self.pile_material = pile_material
+        self.pile_types = pile_types
+
+        # Kedalaman kandidat: kelipatan dz di bawah cutoff, tidak melewati dasar lapisan
+        max_depth_m = min(max_depth_m, float(self.profile.thickness_m.sum()))
+        depths = np.round(dz * np.arange(1, int(np.floor(max_depth_m / dz + 1e-9)) + 1), 9)
+        self.depths = depths[depths > cutoff_m]
+        if len(self.depths) == 0:
+            raise ValueError("No candidate pile depth below the cut-off (check max depth and dz)")
+        self._curves: dict[float, tuple[np.ndarray, np.ndarray]] = {}
+
+    def curve(self, diameter_m: float) -> np.ndarray:
+        """Qall (kN) untuk tiap kedalaman di ``self.depths``."""
+        return self._ensure_curves([diameter_m])[float(diameter_m)][0]
+
+    def _ensure_curves(self, diameters: Sequence[float]) -> dict[float, tuple[np.ndarray, np.ndarray]]:
+        missing = [float(d) for d in dict.fromkeys(diameters) if float(d) not in self._curves]
+        if missing:
+            variant = [self.pile_material if get_method(self.method).variant == "pile_material" else self.pile_types]
+            sweep = sweep_distributions(
+                self.method,
+                missing,
+                self.depths,
+                self.cutoff_m,
+                [self.fs],
+                self.profile,
+                pile_types=variant,
+                pile_materials=variant,
+            )
+            # Satu varian dan satu FS: (n_diameter, n_kedalaman), dengan atau tanpa sumbu varian
+            qall = sweep.data["Qall_kN"].reshape(len(missing), len(self.depths))
+            for d, curve in zip(missing, qall):
+                # NaN (tanpa data NSPT) tidak pernah memenuhi beban target
+                envelope = np.maximum.accumulate(np.nan_to_num(curve, nan=-np.inf))
+                self._curves[d] = (curve, envelope)
+        return self._curves
+
+    def minimum_depth(self, diameter_m: float, target_kN: float) -> Optional[float]:
+        """Kedalaman tiang terdangkal dengan Qall >= target, atau None bila tidak ada."""
+        _, envelope = self._ensure_curves([diameter_m])[float(diameter_m)]
+        i = int(np.searchsorted(envelope, target_kN, side="left"))
+        if i >= len(envelope):
+            return None
+        return float(self.depths[i])
+
+    def optimize(self, target_kN: float, diameters: Sequence[float]) -> Optional[PileDesign]:
+        """Tiang dengan volume beton (di bawah cutoff) terkecil, atau None bila tidak ada."""
+        curves = self._ensure_curves(diameters)
+        best: Optional[PileDesign] = None
+        for d in diameters:
+            depth = self.minimum_depth(d, target_kN)
+            if depth is None:
+                continue
+            length = depth - self.cutoff_m
+            volume = np.pi * d**2 / 4.0 * length
+            if best is None or (volume, depth) < (best.volume_m3, best.pile_depth_m):
+                qall = curves[float(d)][0][np.searchsorted(self.depths, depth)]
+                best = PileDesign(
+                    diameter_m=float(d),
+                    pile_depth_m=depth,
+                    pilelength_m=length,
+                    volume_m3=float(volume),
+                    qall_kN=float(qall),
+                )
+        return best
@@ -1,11 +1,29 @@
-import plotly.graph_objects as go
-import pandas as pd
-from typing import List
+from __future__ import annotations
 
-from .models import SoilLayer
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .models import Layers, as_profile
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from .cpt import CptSounding
+    from .sensitivity import SensitivityResult
+
+# Di atas jumlah tiang ini layout digambar sebagai satu trace (bukan satu shape per tiang)
+PILECAP_SHAPES_MAX_PILES = 150
+# Di atas jumlah tiang ini label nomor tiang disembunyikan (nomor tetap ada di hover)
+PILECAP_LABELS_MAX_PILES = 300
+# Jumlah segmen poligon per lingkaran tiang pada mode trace
+_CIRCLE_SEGMENTS = 16
 
 
 def plot_depth_vs_qall(df: pd.DataFrame):
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     fig.add_trace(
         go.Scatter(x=df["Qall_kN"], y=df["Depth_m"], mode="lines", name="Qall")
@@ -17,6 +35,8 @@ def plot_depth_vs_qall(df: pd.DataFrame):
 
 
 def plot_depth_vs_components(df: pd.DataFrame):
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     fig.add_trace(
         go.Scatter(x=df["Qfs_kN"], y=df["Depth_m"], mode="lines", name="Qfs")
@@ -35,7 +55,38 @@ def plot_depth_vs_components(df: pd.DataFrame):
     fig.update_layout(dragmode=False)
     return fig
 
-def plot_pilecap_layout(piles_df: pd.DataFrame, width_m: float, length_m: float, pile_diameter_m: float = 0.0):
+def _circle_polygons(x: np.ndarray, y: np.ndarray, r: float) -> tuple[np.ndarray, np.ndarray]:
+    """Semua lingkaran sebagai satu polyline, dipisah NaN (gap) antar tiang."""
+    theta = np.linspace(0.0, 2.0 * np.pi, _CIRCLE_SEGMENTS + 1)
+    gap = np.full((len(x), 1), np.nan)
+    px = np.hstack((x[:, None] + r * np.cos(theta), gap)).ravel()
+    py = np.hstack((y[:, None] + r * np.sin(theta), gap)).ravel()
+    # Presisi milimeter cukup untuk gambar dan memperkecil payload figure
+    return np.round(px, 3), np.round(py, 3)
+
+
+def plot_pilecap_layout(
+    piles_df: pd.DataFrame,
+    width_m: float,
+    length_m: float,
+    pile_diameter_m: float = 0.0,
+    mode: str = "auto",
+    labels: Optional[bool] = None,
+):
+    """Layout tiang di atas pilecap.
+
+    ``mode="shapes"`` menggambar satu shape lingkaran per tiang;
+    ``mode="trace"`` menggambar semua lingkaran (dalam satuan data) sebagai
+    satu trace scatter poligon, sehingga ukuran figure dan waktu render tetap
+    kecil untuk ribuan tiang. ``mode="auto"`` memilih ``trace`` bila jumlah
+    tiang melebihi ``PILECAP_SHAPES_MAX_PILES``. ``labels=None`` menampilkan
+    nomor tiang hanya sampai ``PILECAP_LABELS_MAX_PILES`` tiang.
+    """
+    import plotly.graph_objects as go
+
+    if mode not in ("auto", "shapes", "trace"):
+        raise ValueError(f"Layout mode '{mode}' is not supported")
+
     fig = go.Figure()
 
     w = float(width_m)
@@ -59,17 +110,24 @@ def plot_pilecap_layout(piles_df: pd.DataFrame, width_m: float, length_m: float,
 
     # Plot piles (as circles) and labels
     if not piles_df.empty:
-        x_vals = piles_df["X (m)"].astype(float).tolist()
-        y_vals = piles_df["Y (m)"].astype(float).tolist()
-        labels = piles_df["Pile Number"].astype(int).astype(str).tolist()
+        x_vals = piles_df["X (m)"].to_numpy(dtype=float)
+        y_vals = piles_df["Y (m)"].to_numpy(dtype=float)
+        numbers = piles_df["Pile Number"].astype(int).astype(str).tolist()
+        n_piles = len(x_vals)
+        if mode == "auto":
+            mode = "trace" if n_piles > PILECAP_SHAPES_MAX_PILES else "shapes"
+        if labels is None:
+            labels = n_piles <= PILECAP_LABELS_MAX_PILES
 
         circle_edge = "#2b6cb0"
         circle_fill = "#90cdf4"
         label_color = circle_edge
 
         r = max(float(pile_diameter_m), 0.0) / 2.0
-        for x, y in zip(x_vals, y_vals):
-            if r > 0.0:
+        if r <= 0.0:
+            r = 0.05
+        if mode == "shapes":
+            for x, y in zip(x_vals, y_vals):
                 fig.add_shape(
                     type="circle",
                     x0=x - r,
@@ -79,29 +137,47 @@ def plot_pilecap_layout(piles_df: pd.DataFrame, width_m: float, length_m: float,
                     line=dict(color=circle_edge, width=2),
                     fillcolor=circle_fill,
                 )
-            else:
-                fig.add_shape(
-                    type="circle",
-                    x0=x - 0.05,
-                    x1=x + 0.05,
-                    y0=y - 0.05,
-                    y1=y + 0.05,
-                    line=dict(color=circle_edge, width=2),
+        else:
+            px, py = _circle_polygons(x_vals, y_vals, r)
+            fig.add_trace(
+                go.Scatter(
+                    x=px,
+                    y=py,
+                    mode="lines",
+                    fill="toself",
                     fillcolor=circle_fill,
+                    line=dict(color=circle_edge, width=1),
+                    hoverinfo="skip",
+                    showlegend=False,
                 )
+            )
 
-        # labels only (keep axis labels, hide grid)
-        fig.add_trace(
-            go.Scatter(
-                x=x_vals,
-                y=y_vals,
-                mode="text",
-                text=labels,
-                textposition="top center",
-                textfont=dict(color=label_color),
-                showlegend=False,
+        if labels:
+            # labels only (keep axis labels, hide grid)
+            fig.add_trace(
+                go.Scatter(
+                    x=x_vals,
+                    y=y_vals,
+                    mode="text",
+                    text=numbers,
+                    textposition="top center",
+                    textfont=dict(color=label_color),
+                    showlegend=False,
+                )
+            )
+        else:
+            # Tanpa label: nomor tiang tetap bisa dibaca lewat hover di pusat tiang
+            fig.add_trace(
+                go.Scatter(
+                    x=x_vals,
+                    y=y_vals,
+                    mode="markers",
+                    marker=dict(size=4, color=circle_edge),
+                    text=numbers,
+                    hovertemplate="Pile #%{text}<br>X=%{x:.3f} m<br>Y=%{y:.3f} m<extra></extra>",
+                    showlegend=False,
+                )
             )
-        )
 
     # Equal aspect ratio and margins
     max_extent = max(w, l) / 2.0
@@ -116,7 +192,50 @@ def plot_pilecap_layout(piles_df: pd.DataFrame, width_m: float, length_m: float,
     )
     return fig
 
-def plot_soil_profile(layers: List[SoilLayer], pile_depth_m: float, cutoff_m: float) -> go.Figure:
+def plot_cpt(cpt: CptSounding) -> go.Figure:
+    """Profil sondir: qc (sumbu bawah) dan sleeve friction (sumbu atas) vs kedalaman."""
+    import plotly.graph_objects as go
+
+    # Scattergl: puluhan ribu bacaan per sondir
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=cpt.qc_kPa, y=cpt.depth_m, mode="lines", name="qc"))
+    fig.add_trace(go.Scattergl(x=cpt.sleeve_kPa, y=cpt.depth_m, mode="lines", name="Sleeve friction", xaxis="x2"))
+    fig.update_yaxes(autorange="reversed", title_text="Depth (m)", fixedrange=True)
+    fig.update_layout(
+        xaxis=dict(title="qc (kPa)", fixedrange=True),
+        xaxis2=dict(title="Sleeve friction (kPa)", overlaying="x", side="top", fixedrange=True),
+        dragmode=False,
+    )
+    return fig
+
+
+def plot_tornado(result: SensitivityResult, top_n: int = 15) -> go.Figure:
+    """Diagram tornado Qall di ujung tiang (``top_n`` parameter dengan swing terbesar)."""
+    import plotly.graph_objects as go
+
+    keep = ~np.isnan(result.swing_kN)
+    labels = np.array(result.labels, dtype=object)[keep][:top_n]
+    low = result.qall_low_kN[keep][:top_n] - result.base_qall_kN
+    high = result.qall_high_kN[keep][:top_n] - result.base_qall_kN
+    step = f"{result.rel_step * 100:g}%"
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(y=labels, x=low, base=result.base_qall_kN, orientation="h", name=f"-{step}", marker_color="#5b8ff9")
+    )
+    fig.add_trace(
+        go.Bar(y=labels, x=high, base=result.base_qall_kN, orientation="h", name=f"+{step}", marker_color="#f6903d")
+    )
+    fig.add_vline(x=result.base_qall_kN, line=dict(color="#444444", width=1, dash="dash"))
+    fig.update_yaxes(autorange="reversed", fixedrange=True)
+    fig.update_xaxes(title_text="Qall at tip (kN)", fixedrange=True)
+    fig.update_layout(barmode="overlay", height=max(300, 28 * len(labels) + 120), dragmode=False)
+    return fig
+
+
+def plot_soil_profile(layers: Layers, pile_depth_m: float, cutoff_m: float) -> go.Figure:
+    import plotly.graph_objects as go
+
     # Canvas x-domain [0, 1]; pile centered at 0.5
     fig = go.Figure()
 
@@ -128,10 +247,11 @@ def plot_soil_profile(layers: List[SoilLayer], pile_depth_m: float, cutoff_m: fl
     }
 
     # Draw soil layers as horizontal rectangles filling width
+    profile = as_profile(layers)
     z_top = 0.0
     annotations = []
-    for idx, layer in enumerate(layers):
-        z_bot = z_top - layer.thickness_m
+    for thickness_m, soil_behavior, soil_type in zip(profile.thickness_m, profile.behavior, profile.soil_type):
+        z_bot = z_top - thickness_m
         # stop at pile depth visual extent
         if z_top >= pile_depth_m:
             break
@@ -144,7 +264,7 @@ def plot_soil_profile(layers: List[SoilLayer], pile_depth_m: float, cutoff_m: fl
             y0=y0,
             y1=y1,
             line=dict(color="#999999", width=1),
-            fillcolor=behavior_color.get(layer.soil_behavior, "#eeeeee"),
+            fillcolor=behavior_color.get(soil_behavior, "#eeeeee"),
             layer="below",
         )
         # Layer label
@@ -152,7 +272,7 @@ def plot_soil_profile(layers: List[SoilLayer], pile_depth_m: float, cutoff_m: fl
             dict(
                 x=0.8,
                 y=((y0 + y1) / 2.0)+0.2,
-                text=f"{layer.soil_type}",
+                text=f"{soil_type}",
                 showarrow=False,
                 font=dict(size=12, color="#303030"),
             )
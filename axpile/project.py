@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict
+from itertools import repeat
+from math import ceil
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence, Union
+
+from .calc import compute_capacity
+from .models import Layers, PileConfig, SoilProfile, as_profile, validate_inputs
+from .result import CapacityResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Configs = Union[Mapping[str, PileConfig], Sequence[PileConfig]]
+
+
+def compute_case(config: PileConfig, layers: Layers) -> CapacityResult:
+    """Validasi lalu hitung satu kasus tiang (``ValueError`` bila input tidak valid)."""
+    validate_inputs(
+        config.method,
+        config.diameter_m,
+        config.pile_depth_m,
+        config.cutoff_m,
+        config.fs,
+        config.dz,
+        layers,
+    )
+    return compute_capacity(layers=layers, **asdict(config))
+
+
+def _run_chunk(
+    boreholes: list[tuple[str, SoilProfile]],
+    configs: list[tuple[str, PileConfig]],
+) -> list[dict]:
+    """Hitung semua konfigurasi untuk sekelompok borehole (dijalankan di worker)."""
+    rows = []
+    for borehole_id, layers in boreholes:
+        for config_id, config in configs:
+            row = {"Borehole": borehole_id, "Config": config_id}
+            try:
+                row.update(compute_case(config, layers).recap)
+                row["Error"] = None
+            except Exception as exc:
+                row["Error"] = str(exc)
+            rows.append(row)
+    return rows
+
+
+def run_project(
+    profiles: Mapping[str, Layers],
+    configs: Configs,
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> pd.DataFrame:
+    """Hitung rekap kapasitas untuk setiap kombinasi borehole x konfigurasi tiang.
+
+    Borehole dibagi menjadi potongan (chunk) dan tiap potongan dikirim ke satu
+    proses ``ProcessPoolExecutor`` bersama seluruh konfigurasi, sehingga
+    overhead IPC hanya sekali per potongan. Kasus yang gagal validasi atau
+    perhitungan tidak menghentikan proyek; pesannya dicatat di kolom ``Error``.
+    ``max_workers=1`` menjalankan semuanya di proses saat ini.
+    """
+    import pandas as pd
+
+    if isinstance(configs, Mapping):
+        config_items = [(str(k), c) for k, c in configs.items()]
+    else:
+        config_items = [(str(i), c) for i, c in enumerate(configs)]
+    # Profil kolumnar dibangun sekali per borehole dan dipakai semua konfigurasi
+    boreholes = [(str(k), as_profile(v)) for k, v in profiles.items()]
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        # Sekitar 4 potongan per worker: cukup untuk load balancing, IPC tetap kecil
+        chunksize = max(1, ceil(len(boreholes) / (workers * 4)))
+    chunks = [boreholes[i:i + chunksize] for i in range(0, len(boreholes), chunksize)]
+
+    rows: list[dict] = []
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            rows.extend(_run_chunk(chunk, config_items))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_rows in executor.map(_run_chunk, chunks, repeat(config_items)):
+                rows.extend(chunk_rows)
+    return pd.DataFrame(rows)
@@ -0,0 +1,375 @@
+"""Analisis keandalan Monte Carlo kapasitas tiang.
+
+Parameter tanah tiap lapisan (NSPT, Su, alpha, gamma_eff, phi) diambil
+sebagai variabel acak dengan nilai rata-rata dari input lapisan. Semua sampel
+satu blok dihitung sekaligus sebagai array (sampel x kedalaman) memakai rumus
+yang sama dengan ``compute_capacity``, lalu langsung direduksi ke statistik
+per kedalaman.
+"""
+from __future__ import annotations
+
+import math
+import warnings
+from dataclasses import dataclass, replace
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .calc import _locate_layers, _qall_batch, _truncated_profile
+from .instrument import count, run_metrics, stage
+from .models import SOIL_PARAMS, Layers, SoilProfile, validate_inputs
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DISTRIBUTIONS = ("normal", "lognormal")
+DEFAULT_BLOCK_SIZE = 1024
+DEFAULT_HISTOGRAM_BINS = 512
+# Batas atas histogram per kedalaman sebagai kelipatan Qall deterministik
+HISTOGRAM_RANGE = 4.0
+
+
+@dataclass(frozen=True)
+class Uncertainty:
+    """Sebaran satu parameter tanah: koefisien variasi terhadap nilai lapisan.
+
+    ``distribution`` "lognormal" (selalu positif) atau "normal" (sampel
+    negatif dipotong di nol).
+    """
+
+    cov: float
+    distribution: str = "lognormal"
+
+    def __post_init__(self) -> None:
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution '{self.distribution}' is not supported")
+        if self.cov < 0.0:
+            raise ValueError("Coefficient of variation should >= 0")
+
+    def transform(self, mean: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Nilai parameter dari variabel normal standar ``z`` (rata-rata ``mean``)."""
+        if self.distribution == "normal":
+            return np.maximum(mean * (1.0 + self.cov * z), 0.0)
+        sigma_ln = math.sqrt(math.log1p(self.cov**2))
+        return mean * np.exp(sigma_ln * z - 0.5 * sigma_ln**2)
+
+
+def _reliability_index(pf: float) -> float:
+    if pf <= 0.0:
+        return math.inf
+    if pf >= 1.0:
+        return -math.inf
+    return -NormalDist().inv_cdf(pf)
+
+
+def _merge_moments(
+    n_a: np.ndarray, mean_a: np.ndarray, m2_a: np.ndarray, n_b: np.ndarray, mean_b: np.ndarray, m2_b: np.ndarray
+):
+    """Gabungkan rata-rata dan jumlah kuadrat deviasi dua kelompok sampel (Chan dkk.).
+
+    Jumlah sampel per kedalaman; kedalaman tanpa sampel bernilai NaN.
+    """
+    n = n_a + n_b
+    a = np.nan_to_num(mean_a)
+    w = n_b / np.maximum(n, 1)
+    delta = np.nan_to_num(mean_b) - a
+    m2 = np.nan_to_num(m2_a) + np.nan_to_num(m2_b) + delta**2 * (n_a * w)
+    return n, np.where(n > 0, a + delta * w, np.nan), np.where(n > 0, m2, np.nan)
+
+
+@dataclass
+class ReliabilityResult:
+    """Statistik Qall (kN) per kedalaman yang direduksi per blok sampel.
+
+    Yang disimpan berukuran tetap terhadap jumlah sampel: jumlah kegagalan
+    (Qall < beban rencana), rata-rata dan jumlah kuadrat deviasi, nilai
+    minimum/maksimum dan histogram per kedalaman (tepi ``hist_edges``,
+    ``hist_counts`` termasuk underflow di kolom pertama dan overflow di kolom
+    terakhir). Persentil dibaca dari histogram (resolusi satu lebar bin),
+    kecuali sampel lengkap ``qall_kN`` (n_sampel, n_kedalaman) ikut disimpan
+    dengan ``keep_samples=True``.
+
+    Sampel dengan Qall NaN (mis. tidak ada NSPT di zona 4D) dihitung di
+    ``undefined`` dan sebagai kegagalan (kapasitas tidak terbukti), tetapi
+    tidak ikut rata-rata, simpangan baku, min/maks, histogram maupun persentil.
+    """
+
+    depth_m: np.ndarray
+    design_load_kN: float
+    entropy: int
+    first_block: int
+    block_size: int
+    n_samples: int
+    failures: np.ndarray
+    undefined: np.ndarray
+    qall_mean_kN: np.ndarray
+    qall_m2: np.ndarray
+    qall_min_kN: np.ndarray
+    qall_max_kN: np.ndarray
+    hist_edges: np.ndarray
+    hist_counts: np.ndarray
+    qall_kN: Optional[np.ndarray] = None
+
+    @property
+    def failure_probability(self) -> np.ndarray:
+        """Peluang Qall < beban rencana (atau tidak terdefinisi) pada tiap kedalaman."""
+        return self.failures / self.n_samples
+
+    @property
+    def reliability_index(self) -> np.ndarray:
+        """Indeks keandalan beta = -Phi^-1(Pf) pada tiap kedalaman."""
+        return np.array([_reliability_index(pf) for pf in self.failure_probability])
+
+    @property
+    def n_valid(self) -> np.ndarray:
+        """Jumlah sampel dengan Qall terdefinisi pada tiap kedalaman."""
+        return self.n_samples - self.undefined
+
+    @property
+    def qall_std_kN(self) -> np.ndarray:
+        """Simpangan baku (populasi) Qall terdefinisi pada tiap kedalaman."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.qall_m2 / self.n_valid)
+
+    def percentiles(self, q: Sequence[float] = (5, 50, 95)) -> dict[float, np.ndarray]:
+        """Persentil Qall (kN) pada tiap kedalaman (tepat bila sampel disimpan)."""
+        if self.qall_kN is not None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # kedalaman tanpa sampel terdefinisi
+                values = np.nanpercentile(self.qall_kN, q, axis=0)
+            return {p: v for p, v in zip(q, values)}
+        # CDF linear per bin; underflow/overflow dibentang sampai nilai min/max
+        lo = np.minimum(self.qall_min_kN, self.hist_edges[:, 0])
+        hi = np.maximum(self.qall_max_kN, self.hist_edges[:, -1])
+        bounds = np.column_stack((lo, self.hist_edges, hi))
+        cdf = np.concatenate((np.zeros((len(self.depth_m), 1)), np.cumsum(self.hist_counts, axis=1)), axis=1)
+        targets = np.asarray(q, dtype=float) / 100.0
+        values = np.full((len(targets), len(self.depth_m)), np.nan)
+        for j in range(len(self.depth_m)):
+            total = cdf[j, -1]
+            if total > 0:
+                values[:, j] = np.interp(targets * total, cdf[j], bounds[j])
+        return {p: v for p, v in zip(q, values)}
+
+    def summary(self, q: Sequence[float] = (5, 50, 95)) -> dict:
+        """Statistik di ujung tiang (kedalaman terakhir)."""
+        pf = float(self.failure_probability[-1])
+        return {
+            "Depth_m": float(self.depth_m[-1]),
+            "n_samples": self.n_samples,
+            "n_undefined": int(self.undefined[-1]),
+            "Qall_mean_kN": float(self.qall_mean_kN[-1]),
+            "Qall_std_kN": float(self.qall_std_kN[-1]),
+            **{f"Qall_P{p:g}_kN": float(v[-1]) for p, v in self.percentiles(q).items()},
+            "Pf": pf,
+            "Beta": _reliability_index(pf),
+        }
+
+    def to_frame(self, q: Sequence[float] = (5, 50, 95)) -> pd.DataFrame:
+        """Tabel per kedalaman: rata-rata, persentil, Pf dan beta."""
+        import pandas as pd
+
+        table = {"Depth_m": self.depth_m, "Qall_mean_kN": self.qall_mean_kN}
+        table.update({f"Qall_P{p:g}_kN": v for p, v in self.percentiles(q).items()})
+        table.update({"Pf": self.failure_probability, "Beta": self.reliability_index, "n_undefined": self.undefined})
+        return pd.DataFrame(table)
+
+    def _add_block(self, qall: np.ndarray) -> None:
+        """Reduksi satu blok sampel (n, n_kedalaman) ke statistik hasil."""
+        finite = np.isfinite(qall)
+        n_b = np.sum(finite, axis=0)
+        with np.errstate(invalid="ignore"):
+            self.failures += np.sum((qall < self.design_load_kN) | ~finite, axis=0)
+            mean_b = np.sum(np.where(finite, qall, 0.0), axis=0) / np.maximum(n_b, 1)
+            m2_b = np.sum(np.where(finite, (qall - mean_b) ** 2, 0.0), axis=0)
+        _, self.qall_mean_kN, self.qall_m2 = _merge_moments(
+            self.n_valid, self.qall_mean_kN, self.qall_m2, n_b, mean_b, m2_b
+        )
+        self.n_samples += len(qall)
+        self.undefined += len(qall) - n_b
+        self.qall_min_kN = np.fmin(self.qall_min_kN, np.fmin.reduce(qall, axis=0))
+        self.qall_max_kN = np.fmax(self.qall_max_kN, np.fmax.reduce(qall, axis=0))
+
+        n_depth, n_slots = self.hist_counts.shape
+        lo = self.hist_edges[:, 0]
+        width = (self.hist_edges[:, -1] - lo) / (n_slots - 2)
+        with np.errstate(invalid="ignore"):
+            slot = np.clip(np.floor((qall - lo) / width), -1, n_slots - 2) + 1
+        finite = np.isfinite(qall)
+        flat = (slot[finite] + (n_slots * np.arange(n_depth))[np.nonzero(finite)[1]]).astype(np.intp)
+        self.hist_counts += np.bincount(flat, minlength=n_depth * n_slots).reshape(n_depth, n_slots)
+
+    @classmethod
+    def combine(cls, results: Sequence["ReliabilityResult"]) -> "ReliabilityResult":
+        """Gabungkan hasil yang dihitung terpisah (mis. di proses berbeda).
+
+        Bila blok-bloknya berurutan dengan ``entropy`` dan ``block_size``
+        yang sama, jumlah kegagalan, histogram dan sampel (bila disimpan)
+        identik dengan satu run berisi semua sampel.
+        """
+        results = sorted(results, key=lambda r: r.first_block)
+        first = results[0]
+        for r in results[1:]:
+            if r.entropy != first.entropy or r.block_size != first.block_size:
+                raise ValueError("Results use different seeds or block sizes")
+            if r.design_load_kN != first.design_load_kN or not np.array_equal(r.depth_m, first.depth_m):
+                raise ValueError("Results use different design loads or depths")
+            if not np.array_equal(r.hist_edges, first.hist_edges):
+                raise ValueError("Results use different histogram bins")
+        n_depth = len(first.depth_m)
+        n, mean, m2 = np.zeros(n_depth, dtype=np.int64), np.full(n_depth, np.nan), np.zeros(n_depth)
+        for r in results:
+            n, mean, m2 = _merge_moments(n, mean, m2, r.n_valid, r.qall_mean_kN, r.qall_m2)
+        keep = all(r.qall_kN is not None for r in results)
+        return cls(
+            depth_m=first.depth_m,
+            design_load_kN=first.design_load_kN,
+            entropy=first.entropy,
+            first_block=first.first_block,
+            block_size=first.block_size,
+            n_samples=sum(r.n_samples for r in results),
+            failures=sum(r.failures for r in results),
+            undefined=sum(r.undefined for r in results),
+            qall_mean_kN=mean,
+            qall_m2=m2,
+            qall_min_kN=np.fmin.reduce([r.qall_min_kN for r in results], axis=0),
+            qall_max_kN=np.fmax.reduce([r.qall_max_kN for r in results], axis=0),
+            hist_edges=first.hist_edges,
+            hist_counts=sum(r.hist_counts for r in results),
+            qall_kN=np.concatenate([r.qall_kN for r in results]) if keep else None,
+        )
+
+
+def _correlation_factor(layer_correlation: Union[float, np.ndarray], n_layers: int) -> np.ndarray:
+    """Faktor Cholesky matriks korelasi antar lapisan (n_layer x n_layer)."""
+    if np.ndim(layer_correlation) == 0:
+        rho = float(layer_correlation)
+        corr = np.full((n_layers, n_layers), rho)
+        np.fill_diagonal(corr, 1.0)
+    else:
+        # Matriks untuk seluruh profil; lapisan di bawah ujung tiang dibuang
+        corr = np.asarray(layer_correlation, dtype=float)[:n_layers, :n_layers]
+        if corr.shape != (n_layers, n_layers):
+            raise ValueError("Layer correlation matrix is smaller than the number of layers")
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        raise ValueError("Layer correlation matrix should be positive definite") from None
+
+
+def _block_rng(entropy: int, block: int) -> np.random.Generator:
+    # Sama dengan SeedSequence(entropy).spawn(n)[block]: tiap blok punya aliran sendiri
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(block,)))
+
+
+def _sample_profile(
+    profile: SoilProfile,
+    uncertainties: Mapping[str, Uncertainty],
+    chol: np.ndarray,
+    rng: np.random.Generator,
+    n: int,
+) -> SoilProfile:
+    """Profil dengan parameter tanah berdimensi (n_sampel, n_lapisan)."""
+    samples = {}
+    # Urutan tetap (SOIL_PARAMS) agar sampel dapat direproduksi
+    for name in SOIL_PARAMS:
+        if name not in uncertainties:
+            continue
+        z = rng.standard_normal((n, len(profile))) @ chol.T
+        samples[name] = uncertainties[name].transform(getattr(profile, name), z)
+    return replace(profile, **samples)
+
+
+def monte_carlo_capacity(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+    uncertainties: Mapping[str, Uncertainty],
+    design_load_kN: float,
+    n_samples: int = 10_000,
+    layer_correlation: Union[float, np.ndarray] = 0.0,
+    seed: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    first_block: int = 0,
+    histogram_bins: int = DEFAULT_HISTOGRAM_BINS,
+    keep_samples: bool = False,
+) -> ReliabilityResult:
+    """Simulasi Monte Carlo Qall pada grid kedalaman ``compute_capacity``.
+
+    ``uncertainties`` memetakan nama parameter (``SOIL_PARAMS``) ke
+    ``Uncertainty``; parameter lain tetap deterministik. Antar parameter
+    saling bebas, sedangkan satu parameter antar lapisan berkorelasi menurut
+    ``layer_correlation`` (skalar untuk semua pasangan lapisan, atau matriks
+    n_layer x n_layer) lewat copula Gauss.
+
+    Sampel dihitung per blok ``block_size`` dan langsung direduksi (jumlah
+    kegagalan, momen, histogram ``histogram_bins`` bin per kedalaman pada
+    rentang 0..``HISTOGRAM_RANGE`` x Qall deterministik), sehingga memori
+    tidak bergantung pada ``n_samples``. Matriks Qall lengkap (n_sampel x
+    n_kedalaman) hanya disimpan bila ``keep_samples=True``. Blok ``b`` memakai
+    aliran acak turunan ``seed`` dan ``b``, jadi run dapat dibagi ke beberapa
+    proses, mis. proses ke-i dengan ``first_block=i * k`` dan
+    ``n_samples=k * block_size``, lalu digabung dengan
+    ``ReliabilityResult.combine``.
+    """
+    validate_inputs(method, diameter_m, pile_depth_m, cutoff_m, fs, dz, layers)
+    unknown = sorted(set(uncertainties) - set(SOIL_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown soil parameter(s): {', '.join(unknown)}")
+    if n_samples <= 0:
+        raise ValueError("n_samples should > 0")
+    if block_size <= 0:
+        raise ValueError("block_size should > 0")
+    if first_block < 0:
+        raise ValueError("first_block should >= 0")
+    if histogram_bins <= 0:
+        raise ValueError("histogram_bins should > 0")
+    entropy = np.random.SeedSequence(seed).entropy
+
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz, n_samples=n_samples):
+        with stage("expand_layers"):
+            profile = _truncated_profile(layers, pile_depth_m)
+            z_vals = np.arange(dz, pile_depth_m + dz, dz)
+            idx = _locate_layers(z_vals, profile.bot_m)
+            chol = _correlation_factor(layer_correlation, len(profile))
+            # Rentang histogram dari Qall deterministik (nilai rata-rata) agar sama di semua proses
+            base = _qall_batch(method, profile, z_vals, idx, diameter_m, cutoff_m, fs, pile_material, pile_types)
+            hi = np.where(np.isfinite(base) & (base > 0.0), HISTOGRAM_RANGE * base, 1.0)
+        n_depth = len(z_vals)
+        result = ReliabilityResult(
+            depth_m=z_vals,
+            design_load_kN=float(design_load_kN),
+            entropy=entropy,
+            first_block=first_block,
+            block_size=block_size,
+            n_samples=0,
+            failures=np.zeros(n_depth, dtype=np.int64),
+            undefined=np.zeros(n_depth, dtype=np.int64),
+            qall_mean_kN=np.full(n_depth, np.nan),
+            qall_m2=np.zeros(n_depth),
+            qall_min_kN=np.full(n_depth, np.nan),
+            qall_max_kN=np.full(n_depth, np.nan),
+            hist_edges=np.linspace(0.0, hi, histogram_bins + 1, axis=1),
+            hist_counts=np.zeros((n_depth, histogram_bins + 2), dtype=np.int64),
+            qall_kN=np.empty((n_samples, n_depth)) if keep_samples else None,
+        )
+        for i0 in range(0, n_samples, block_size):
+            n = min(block_size, n_samples - i0)
+            with stage("sampling"):
+                rng = _block_rng(entropy, first_block + i0 // block_size)
+                sampled = _sample_profile(profile, uncertainties, chol, rng, n)
+            with stage("capacity"):
+                qall = _qall_batch(method, sampled, z_vals, idx, diameter_m, cutoff_m, fs, pile_material, pile_types)
+            with stage("reduce"):
+                result._add_block(qall)
+                if keep_samples:
+                    result.qall_kN[i0 : i0 + n] = qall
+            count("samples", n)
+    return result
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Mapping, Optional
+
+import numpy as np
+
+from .instrument import RunMetrics, stage
+from .models import _BEHAVIOR_NAMES, _SOIL_TYPE_NAMES, SOIL_TYPES, SoilBehavior
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .curve import CapacityCurve
+
+ROUNDED_COLUMNS = ["Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN"]
+
+# Kolom kategori disimpan sebagai kode integer (-1 = tidak dikenal); DataFrame
+# memakai pandas Categorical dengan kategori berikut
+CATEGORY_COLUMNS = {"Soil Behavior": tuple(SoilBehavior), "Soil Type": SOIL_TYPES}
+_CATEGORY_NAMES = {"Soil Behavior": _BEHAVIOR_NAMES, "Soil Type": _SOIL_TYPE_NAMES}
+
+
+def column_labels(name: str, values: np.ndarray) -> np.ndarray:
+    """Nilai kolom ``name``; kode kolom kategori diganti namanya (array object)."""
+    names = _CATEGORY_NAMES.get(name)
+    return values if names is None else names[values]
+
+
+def _to_dataframe(columns: dict[str, np.ndarray]) -> pd.DataFrame:
+    import pandas as pd
+
+    df = pd.DataFrame(
+        {
+            name: pd.Categorical.from_codes(values, CATEGORY_COLUMNS[name]) if name in CATEGORY_COLUMNS else values
+            for name, values in columns.items()
+        }
+    )
+    df[ROUNDED_COLUMNS] = df[ROUNDED_COLUMNS].round(2)
+    return df
+
+
+@dataclass
+class CapacityResult:
+    """Hasil perhitungan kapasitas berbasis array NumPy.
+
+    ``recap`` tersedia langsung; DataFrame (kolom Q dibulatkan 2 desimal,
+    sama dengan ``compute_distributions``) baru dibangun saat ``dataframe``
+    pertama kali diakses, sehingga pemanggil batch yang hanya butuh rekap
+    tidak membayar konversi pandas.
+
+    ``columns`` menyimpan kolom kategori (``CATEGORY_COLUMNS``) sebagai kode
+    integer; ``result[name]`` mengembalikan namanya dan ``dataframe`` memakai
+    pandas Categorical.
+
+    ``metrics`` berisi waktu dan counter per tahap bila run dijalankan dengan
+    instrumentasi aktif (lihat ``axpile.instrument``), selain itu None.
+
+    ``capacity_at`` menjawab kapasitas di kedalaman sembarang tanpa menghitung
+    ulang lewat ``CapacityCurve`` (tepat) yang dibangun ``curve_builder``.
+    """
+
+    columns: dict[str, np.ndarray]
+    recap: Mapping[str, float]
+    metrics: Optional[RunMetrics] = field(default=None, repr=False, compare=False)
+    curve_builder: Optional[Callable[[], CapacityCurve]] = field(default=None, repr=False, compare=False)
+    _dataframe: Optional[pd.DataFrame] = field(default=None, init=False, repr=False, compare=False)
+    _curve: Optional[CapacityCurve] = field(default=None, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.columns["Depth_m"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return column_labels(name, self.columns[name])
+
+    @property
+    def depth_m(self) -> np.ndarray:
+        return self.columns["Depth_m"]
+
+    @property
+    def qall_kN(self) -> np.ndarray:
+        return self.columns["Qall_kN"]
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """DataFrame distribusi kapasitas (dibangun sekali lalu disimpan)."""
+        if self._dataframe is None:
+            with stage("dataframe", self.metrics):
+                self._dataframe = _to_dataframe(self.columns)
+        return self._dataframe
+
+    @property
+    def curve(self) -> Optional[CapacityCurve]:
+        """Kurva analitik hasil ini (dibangun sekali saat pertama diminta), atau None."""
+        if self._curve is None and self.curve_builder is not None:
+            self._curve = self.curve_builder()
+        return self._curve
+
+    def capacity_at(self, depths) -> dict[str, np.ndarray]:
+        """Qb, Qfs, Qult dan Qall (kN) pada kedalaman ``depths`` (skalar atau array).
+
+        Setiap kedalaman dicari dengan bisection (O(log n)), jadi ribuan
+        kedalaman sekaligus tetap murah. Hasil tanpa kurva analitik ditolak
+        (bukan diinterpolasi antar baris) karena interpolasi menghaluskan
+        lompatan Qb di batas lapisan sehingga jawabannya berbeda dari kurva.
+        """
+        curve = self.curve
+        if curve is None:
+            raise ValueError("Result has no capacity curve; recompute it to query arbitrary depths")
+        return curve.evaluate(depths)
@@ -0,0 +1,205 @@
+"""Analisis sensitivitas one-at-a-time (tornado) Qall di ujung tiang.
+
+Setiap parameter numerik lapisan (tebal, NSPT, Su, alpha, gamma_eff, phi)
+serta diameter, cutoff dan dz dinaikkan dan diturunkan ``rel_step`` satu per
+satu; parameter lain tetap. Semua perturbasi parameter tanah dihitung dalam
+satu pass batch (satu baris varian per perturbasi).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .calc import _locate_layers, _qall_batch, _truncated_profile
+from .instrument import count, run_metrics, stage
+from .models import SOIL_PARAMS, Layers, SoilProfile, as_profile, validate_inputs
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PILE_PARAMS = ("diameter_m", "cutoff_m", "dz")
+LAYER_PARAMS = ("thickness_m",) + SOIL_PARAMS
+
+
+@dataclass
+class SensitivityResult:
+    """Swing Qall di ujung tiang per parameter, terurut dari yang terbesar.
+
+    ``layer`` adalah index lapisan (0 = teratas) atau -1 untuk parameter
+    tiang (``PILE_PARAMS``). Perturbasi yang membuat profil tidak mencapai
+    ujung tiang menghasilkan NaN.
+    """
+
+    base_qall_kN: float
+    rel_step: float
+    parameter: np.ndarray
+    layer: np.ndarray
+    value: np.ndarray
+    qall_low_kN: np.ndarray
+    qall_high_kN: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.parameter)
+
+    @property
+    def swing_kN(self) -> np.ndarray:
+        return np.abs(self.qall_high_kN - self.qall_low_kN)
+
+    @property
+    def labels(self) -> list[str]:
+        return [p if k < 0 else f"{p} (layer {k + 1})" for p, k in zip(self.parameter, self.layer)]
+
+    def to_frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "Parameter": self.parameter,
+                "Layer": np.where(self.layer < 0, 0, self.layer + 1),
+                "Value": self.value,
+                "Low": self.value * (1.0 - self.rel_step),
+                "High": self.value * (1.0 + self.rel_step),
+                "Qall_low_kN": self.qall_low_kN,
+                "Qall_high_kN": self.qall_high_kN,
+                "Swing_kN": self.swing_kN,
+            }
+        )
+
+
+def _tip_depth(dz: float, pile_depth_m: float) -> float:
+    """Kedalaman baris terakhir ``compute_capacity`` (ujung tiang pada grid dz)."""
+    return float(np.arange(dz, pile_depth_m + dz, dz)[-1])
+
+
+def _tip_qall(
+    method: str,
+    profile: SoilProfile,
+    z_tip: float,
+    diameter_m,
+    cutoff_m,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+) -> np.ndarray:
+    """Qall di ``z_tip`` untuk tiap varian (NaN bila ``z_tip`` di bawah profil)."""
+    z_vals = np.array([z_tip])
+    if z_tip > profile.bot_m[-1] + 1e-9:
+        return np.full(np.shape(diameter_m)[:1] or (1,), np.nan)
+    idx = _locate_layers(z_vals, profile.bot_m)
+    qall = _qall_batch(method, profile, z_vals, idx, diameter_m, cutoff_m, fs, pile_material, pile_types)
+    return np.atleast_1d(qall[..., 0])
+
+
+def _soil_variants(profile: SoilProfile, rel_step: float):
+    """Profil batch berisi dua varian (turun, naik) per parameter tanah per lapisan."""
+    entries = [
+        (name, i)
+        for name in SOIL_PARAMS
+        for i, v in enumerate(getattr(profile, name))
+        if np.isfinite(v) and v != 0.0
+    ]
+    n = len(entries)
+    factors = np.tile([1.0 - rel_step, 1.0 + rel_step], n)
+    params = {}
+    for name in SOIL_PARAMS:
+        values = np.tile(getattr(profile, name), (2 * n, 1))
+        mine = np.array([k for k, (p, _) in enumerate(entries) if p == name], dtype=int)
+        if len(mine):
+            r = np.concatenate((2 * mine, 2 * mine + 1))
+            i = np.array([entries[k][1] for k in mine] * 2)
+            values[r, i] *= factors[r]
+        params[name] = values
+    return entries, replace(profile, **params)
+
+
+def sensitivity_analysis(
+    method: str,
+    diameter_m: float,
+    pile_depth_m: float,
+    cutoff_m: float,
+    fs: float,
+    pile_material: Optional[str],
+    pile_types: Optional[str],
+    dz: float,
+    layers: Layers,
+    rel_step: float = 0.1,
+) -> SensitivityResult:
+    """Sensitivitas Qall di ujung tiang terhadap perubahan +-``rel_step`` tiap parameter.
+
+    Hanya lapisan yang dilalui tiang yang diperturbasi; parameter kosong
+    atau bernilai nol dilewati. Perturbasi parameter tanah dievaluasi dalam
+    satu panggilan batch; diameter dan cutoff masing-masing satu panggilan
+    batch; tebal lapisan dan dz mengubah geometri sehingga dihitung per varian
+    (hanya di satu kedalaman).
+    """
+    validate_inputs(method, diameter_m, pile_depth_m, cutoff_m, fs, dz, layers)
+    if not 0.0 < rel_step < 1.0:
+        raise ValueError("rel_step should be between 0 and 1")
+    factors = np.array([1.0 - rel_step, 1.0 + rel_step])
+    args = (fs, pile_material, pile_types)
+
+    with run_metrics(method=method, diameter_m=diameter_m, pile_depth_m=pile_depth_m, dz=dz, sensitivity=True):
+        with stage("expand_layers"):
+            full = as_profile(layers)
+            profile = _truncated_profile(full, pile_depth_m)
+            z_tip = _tip_depth(dz, pile_depth_m)
+            # Grid dz yang melewati dasar profil ditolak sama seperti compute_capacity
+            _locate_layers(np.array([z_tip]), profile.bot_m)
+        base = float(_tip_qall(method, profile, z_tip, diameter_m, cutoff_m, *args)[0])
+
+        names, layer_ids, values, qall = [], [], [], []
+
+        def add(name, layer, value, q):
+            names.append(name)
+            layer_ids.append(layer)
+            values.append(value)
+            qall.append(q)
+
+        with stage("soil_params"):
+            entries, batch = _soil_variants(profile, rel_step)
+            count("variants", 2 * len(entries))
+            if entries:
+                q = _tip_qall(method, batch, z_tip, diameter_m, cutoff_m, *args).reshape(-1, 2)
+                for (name, i), pair in zip(entries, q):
+                    add(name, i, float(getattr(profile, name)[i]), pair)
+
+        with stage("pile_params"):
+            q = _tip_qall(method, profile, z_tip, diameter_m * factors[:, None], cutoff_m, *args)
+            add("diameter_m", -1, diameter_m, q)
+            if cutoff_m > 0.0:
+                q = _tip_qall(method, profile, z_tip, diameter_m, cutoff_m * factors[:, None], *args)
+                add("cutoff_m", -1, cutoff_m, q)
+            q = [
+                _tip_qall(method, profile, _tip_depth(dz * f, pile_depth_m), diameter_m, cutoff_m, *args)[0]
+                for f in factors
+            ]
+            add("dz", -1, dz, np.array(q))
+            count("variants", 6)
+
+        with stage("thickness"):
+            for i in range(len(profile)):
+                pair = []
+                for f in factors:
+                    thickness = full.thickness_m.copy()
+                    thickness[i] *= f
+                    top = np.concatenate(([0.0], np.cumsum(thickness)[:-1]))
+                    varied = replace(full, top_m=top, thickness_m=thickness).truncate(pile_depth_m)
+                    pair.append(_tip_qall(method, varied, z_tip, diameter_m, cutoff_m, *args)[0])
+                add("thickness_m", i, float(full.thickness_m[i]), np.array(pair))
+            count("variants", 2 * len(profile))
+
+    qall = np.array(qall, dtype=float).reshape(-1, 2)
+    swing = np.abs(qall[:, 1] - qall[:, 0])
+    # Swing terbesar di atas; NaN di akhir
+    order = np.argsort(-np.nan_to_num(swing, nan=-1.0), kind="stable")
+    return SensitivityResult(
+        base_qall_kN=base,
+        rel_step=rel_step,
+        parameter=np.array(names, dtype=object)[order],
+        layer=np.array(layer_ids, dtype=int)[order],
+        value=np.array(values, dtype=float)[order],
+        qall_low_kN=qall[order, 0],
+        qall_high_kN=qall[order, 1],
+    )
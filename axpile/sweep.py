@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+from .calc import (
+    _locate_layers,
+    _nspt_cumulative,
+    _nspt_window_average,
+    _shaft_at,
+    _shaft_profile,
+    _sigma_at,
+    _sigma_profile,
+)
+from .geometry import (
+    compute_pile_perimeter_m_from_diameter,
+    compute_pile_tip_area_m2_from_diameter,
+)
+from .methods import get_method
+from .models import Layers, as_profile
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class SweepResult:
+    """Hasil sweep parameter sebagai array berlabel.
+
+    Setiap array di ``data`` berdimensi ``dims``; label tiap sumbu ada di
+    ``coords``. Sumbu kedua adalah tipe tiang (Decourt-Quaresma) atau
+    material tiang (Mayerhof); metode tanpa varian (Reese & Wright) tidak
+    memiliki sumbu ini.
+    """
+
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+    data: dict[str, np.ndarray]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Tabel long-form, satu baris per kombinasi parameter."""
+        import pandas as pd
+
+        grids = np.meshgrid(*(self.coords[d] for d in self.dims), indexing="ij")
+        table = {d: g.ravel() for d, g in zip(self.dims, grids)}
+        table.update({name: values.ravel() for name, values in self.data.items()})
+        return pd.DataFrame(table)
+
+
+def sweep_distributions(
+    method: str,
+    diameters: Sequence[float],
+    pile_depths: Sequence[float],
+    cutoff_m: float,
+    fs_values: Sequence[float],
+    layers: Layers,
+    pile_types: Optional[Sequence[str]] = None,
+    pile_materials: Optional[Sequence[str]] = None,
+) -> SweepResult:
+    """Hitung rekap kapasitas untuk seluruh grid diameter x tipe x kedalaman x FS.
+
+    Nilai pada tiap kedalaman tiang sama dengan ``recap`` dari
+    ``compute_distributions`` dengan ``pile_depth_m`` tersebut. Ekspansi
+    lapisan, profil tegangan efektif, profil NSPT kumulatif dan gaya selimut
+    per meter keliling dihitung sekali dan dipakai ulang untuk semua diameter;
+    rata-rata NSPT 4D dipakai ulang untuk semua tipe tiang dan FS.
+    """
+    diameters = np.asarray(diameters, dtype=float)
+    pile_depths = np.asarray(pile_depths, dtype=float)
+    fs_values = np.asarray(fs_values, dtype=float)
+
+    spec = get_method(method)
+    variant_dim = spec.variant
+    given = pile_materials if variant_dim == "pile_material" else pile_types
+    variants = list(given) if given is not None else list(spec.variants)
+    if variant_dim is None:
+        # Satu varian internal; sumbunya dibuang dari hasil
+        variants = [None]
+        variant_args = [(None, None)]
+    elif variant_dim == "pile_material":
+        variant_args = [(None, v) for v in variants]
+    else:
+        variant_args = [(v, None) for v in variants]
+
+    if np.any(diameters <= 0.0):
+        raise ValueError("Pile Diameter should > 0")
+    if np.any(pile_depths <= 0.0):
+        raise ValueError("Depth of Pile should > 0")
+    if np.any(fs_values <= 0.0):
+        raise ValueError("Safety of Factor should > 0")
+
+    profile = as_profile(layers).truncate(float(pile_depths.max()))
+    if len(profile) == 0:
+        raise ValueError("Kedalaman tiang berada di atas semua lapisan (periksa input)")
+    idx = _locate_layers(pile_depths, profile.bot_m)
+
+    # Bagian yang tidak bergantung pada diameter maupun tipe tiang
+    sigma_top = _sigma_profile(profile)
+    sigma_z = _sigma_at(profile, sigma_top, pile_depths, idx)
+
+    # Koefisien per varian: (n_variant, n_layer)
+    coefs = [spec.shaft(profile, t, m) for t, m in variant_args]
+    qs_const = np.stack([c for c, _ in coefs])
+    qs_slope = np.stack([s for _, s in coefs])
+    tip_coef = np.stack([spec.tip(profile, t, m) for t, m in variant_args])
+
+    shaft_top = _shaft_profile(profile, cutoff_m, qs_const, qs_slope, sigma_top)
+    shaft_per_m = _shaft_at(profile, cutoff_m, qs_const, qs_slope, shaft_top, sigma_z, pile_depths, idx)
+    qb_kPa = np.broadcast_to(tip_coef[:, idx], (len(diameters), len(variants), len(pile_depths)))
+
+    if spec.nspt_window:
+        # Zona 4D di bawah ujung terpotong pada kedalaman tiang (sama seperti
+        # compute_distributions dengan pile_depth_m tersebut)
+        nspt_cum = _nspt_cumulative(profile)
+        n_avg = np.stack(
+            [_nspt_window_average(profile, nspt_cum, pile_depths - 4 * d, pile_depths) for d in diameters]
+        )
+        qb_kPa = qb_kPa * n_avg[:, None, :]
+
+    ab_m2 = np.array([compute_pile_tip_area_m2_from_diameter(d) for d in diameters])
+    perim_m = np.array([compute_pile_perimeter_m_from_diameter(d) for d in diameters])
+
+    qb = qb_kPa * ab_m2[:, None, None]
+    qfs = shaft_per_m[None, :, :] * perim_m[:, None, None]
+    qult = qb + qfs
+    shape = qult.shape + (len(fs_values),)
+    data = {
+        "Qb_kN": np.broadcast_to(qb[..., None], shape),
+        "Qfs_kN": np.broadcast_to(qfs[..., None], shape),
+        "Qult_kN": np.broadcast_to(qult[..., None], shape),
+        "Qall_kN": qult[..., None] / fs_values,
+    }
+    if variant_dim is None:
+        data = {name: values[:, 0] for name, values in data.items()}
+        dims = ("diameter_m", "pile_depth_m", "fs")
+        coords = {"diameter_m": diameters, "pile_depth_m": pile_depths, "fs": fs_values}
+        return SweepResult(dims=dims, coords=coords, data=data)
+    dims = ("diameter_m", variant_dim, "pile_depth_m", "fs")
+    coords = {
+        "diameter_m": diameters,
+        variant_dim: np.array(variants, dtype=object),
+        "pile_depth_m": pile_depths,
+        "fs": fs_values,
+    }
+    return SweepResult(dims=dims, coords=coords, data=data)
@@ -0,0 +1,347 @@
+"""Benchmark perhitungan kapasitas, efisiensi kelompok, spasi tiang dan ``plot_pilecap_layout``.
+
+Jalankan dari root repo::
+
+    python benchmarks/bench_capacity.py [--quick] [--output hasil.json] [--compare lama.json]
+
+Profil tanah sintetis dibuat deterministik (seed tetap) sehingga hasil antar
+commit bisa dibandingkan langsung. Setiap kasus dijalankan ``--repeat`` kali;
+yang dicatat adalah waktu minimum dan median (detik). Hasil ditulis sebagai
+JSON ke ``--output`` (default ``benchmarks/results/<commit>.json``). Dengan
+``--compare``, rasio waktu median terhadap file JSON lama ikut dicetak.
+
+Benchmark ``plot_pilecap_layout`` memakai ``--plot-repeat`` tersendiri karena
+mode satu shape per tiang dengan ratusan tiang bisa memakan waktu puluhan
+detik; ukuran JSON figure (``payload_bytes``) dicatat untuk tiap mode.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from axpile.calc import compute_distributions, compute_nspt_average, expand_layers_to_depth  # noqa: E402
+from axpile.models import SoilLayer  # noqa: E402
+
+SEED = 20240601
+PROFILE_DEPTH_M = 80.0
+
+LAYER_COUNTS = (1, 10, 50, 200)
+DZ_VALUES = (0.01, 0.05, 0.25, 1.0)
+PILE_DEPTHS = (10.0, 30.0, 60.0)
+PILE_COUNTS = (16, 100, 400, 2000, 5000)
+SHAPES_MAX_PILES = 400
+LAYOUT_COUNTS = (10, 1000, 10000)
+RAFT_PILE_COUNTS = (1000, 5000, 20000)
+MC_SAMPLE_COUNTS = (1000, 10000)
+
+QUICK_LAYER_COUNTS = (1, 50)
+QUICK_DZ_VALUES = (0.05, 1.0)
+QUICK_PILE_DEPTHS = (30.0,)
+QUICK_PILE_COUNTS = (16, 400)
+QUICK_SHAPES_MAX_PILES = 16
+QUICK_LAYOUT_COUNTS = (10, 1000)
+QUICK_RAFT_PILE_COUNTS = (1000,)
+QUICK_MC_SAMPLE_COUNTS = (1000,)
+
+
+def synthetic_layers(method: str, n_layers: int, seed: int = SEED) -> list[SoilLayer]:
+    """Profil sintetis ``n_layers`` lapisan dengan tebal sama, total ``PROFILE_DEPTH_M``."""
+    rng = np.random.default_rng([seed, n_layers])
+    thickness_m = PROFILE_DEPTH_M / n_layers
+    layers = []
+    for i in range(n_layers):
+        behavior = ("clay", "silt", "sand")[int(rng.integers(3))]
+        if method == "Decourt-Quaresma":
+            layers.append(
+                SoilLayer(
+                    thickness_m=thickness_m,
+                    soil_behavior=behavior,
+                    soil_type=behavior,
+                    nspt=float(np.round(rng.uniform(2.0, 50.0))),
+                )
+            )
+        elif behavior == "sand":
+            layers.append(
+                SoilLayer(
+                    thickness_m=thickness_m,
+                    soil_behavior="sand",
+                    soil_type="sand",
+                    gamma_eff=float(rng.uniform(7.0, 11.0)),
+                    phi=float(rng.uniform(28.0, 40.0)),
+                )
+            )
+        else:
+            layers.append(
+                SoilLayer(
+                    thickness_m=thickness_m,
+                    soil_behavior="clay",
+                    soil_type="clay",
+                    su=float(rng.uniform(20.0, 150.0)),
+                    alpha_tomlinson=float(rng.uniform(0.4, 1.0)),
+                    gamma_eff=float(rng.uniform(6.0, 9.0)),
+                )
+            )
+    return layers
+
+
+def synthetic_piles(n_piles: int, spacing_m: float = 1.8):
+    """Grid tiang persegi (format tabel ``Pile Number``/``X (m)``/``Y (m)`` dari app)."""
+    import pandas as pd
+
+    n_cols = int(np.ceil(np.sqrt(n_piles)))
+    i = np.arange(n_piles)
+    x = (i % n_cols - (n_cols - 1) / 2.0) * spacing_m
+    y = (i // n_cols - (n_cols - 1) / 2.0) * spacing_m
+    width_m = n_cols * spacing_m
+    length_m = (int(np.ceil(n_piles / n_cols))) * spacing_m
+    piles_df = pd.DataFrame({"Pile Number": i + 1, "X (m)": x, "Y (m)": y})
+    return piles_df, width_m, length_m
+
+
+def time_call(fn: Callable[[], object], repeat: int, warmup: bool = True) -> dict:
+    """Waktu ``repeat`` kali pemanggilan ``fn`` (detik)."""
+    if warmup:
+        fn()  # pemanasan: import lazy, cache NumPy
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "repeat": repeat}
+
+
+def bench_distributions(layer_counts, dz_values, pile_depths, repeat: int) -> list[dict]:
+    cases = []
+    for method in ("Decourt-Quaresma", "Mayerhof"):
+        for n_layers in layer_counts:
+            layers = synthetic_layers(method, n_layers)
+            for pile_depth_m in pile_depths:
+                for dz in dz_values:
+                    timing = time_call(
+                        lambda: compute_distributions(
+                            method, 0.6, pile_depth_m, 1.0, 2.5, "Concrete", "Franki piles", dz, layers
+                        ),
+                        repeat,
+                    )
+                    cases.append(
+                        {
+                            "name": "compute_distributions",
+                            "method": method,
+                            "n_layers": n_layers,
+                            "pile_depth_m": pile_depth_m,
+                            "dz": dz,
+                            "n_rows": int(round(pile_depth_m / dz)),
+                            **timing,
+                        }
+                    )
+    return cases
+
+
+def bench_nspt_average(layer_counts, pile_depths, repeat: int) -> list[dict]:
+    cases = []
+    for n_layers in layer_counts:
+        layers = synthetic_layers("Decourt-Quaresma", n_layers)
+        for pile_depth_m in pile_depths:
+            segments = expand_layers_to_depth(layers, pile_depth_m)
+            z_tips = np.linspace(0.5, pile_depth_m, 100)
+
+            def run():
+                for z in z_tips:
+                    compute_nspt_average(float(z), 0.6, segments)
+
+            timing = time_call(run, repeat)
+            cases.append(
+                {
+                    "name": "compute_nspt_average",
+                    "n_layers": n_layers,
+                    "pile_depth_m": pile_depth_m,
+                    "n_calls": len(z_tips),
+                    **timing,
+                }
+            )
+    return cases
+
+
+def bench_group_efficiency(layout_counts, repeat: int) -> list[dict]:
+    from axpile.group import PileLayouts, group_efficiency
+
+    cases = []
+    rng = np.random.default_rng(SEED)
+    for n_layouts in layout_counts:
+        # Layout grid acak 1..8 x 1..8 dengan spasi 1.8 m
+        shapes = rng.integers(1, 9, size=(n_layouts, 2))
+        layouts = [synthetic_piles(int(m * n))[0][["X (m)", "Y (m)"]].to_numpy() for m, n in shapes]
+        packed = PileLayouts.from_layouts(layouts)
+        for method in ("Converse-Labarre", "Feld", "Los Angeles"):
+            timing = time_call(lambda: group_efficiency(packed, 0.6, 1.8, method), repeat)
+            cases.append({"name": "group_efficiency", "method": method, "n_layouts": n_layouts, **timing})
+    return cases
+
+
+def bench_nearest_spacing(pile_counts, repeat: int) -> list[dict]:
+    from axpile.group import PileLayouts, nearest_spacing
+
+    cases = []
+    rng = np.random.default_rng(SEED)
+    for n_piles in pile_counts:
+        # Raft dengan jitter survei +-5 mm
+        xy = synthetic_piles(n_piles)[0][["X (m)", "Y (m)"]].to_numpy()
+        xy = xy + rng.uniform(-0.005, 0.005, xy.shape)
+        layouts = PileLayouts.from_layouts([xy])
+        timing = time_call(lambda: nearest_spacing(layouts), repeat)
+        cases.append({"name": "nearest_spacing", "n_piles": n_piles, **timing})
+    return cases
+
+
+def bench_monte_carlo(sample_counts, repeat: int) -> list[dict]:
+    from axpile.reliability import Uncertainty, monte_carlo_capacity
+
+    uncertainties = {name: Uncertainty(0.3) for name in ("nspt", "su", "gamma_eff")}
+    uncertainties["phi"] = Uncertainty(0.1, "normal")
+    cases = []
+    for method in ("Decourt-Quaresma", "Mayerhof"):
+        layers = synthetic_layers(method, 50)
+        for n_samples in sample_counts:
+            timing = time_call(
+                lambda: monte_carlo_capacity(
+                    method, 0.6, 30.0, 1.0, 2.5, "Concrete", "Franki piles", 0.25, layers,
+                    uncertainties, 1000.0, n_samples, layer_correlation=0.3, seed=SEED,
+                ),
+                repeat,
+            )
+            cases.append({"name": "monte_carlo_capacity", "method": method, "n_samples": n_samples, **timing})
+    return cases
+
+
+def bench_pilecap_layout(pile_counts, repeat: int, shapes_max_piles: int = SHAPES_MAX_PILES) -> list[dict]:
+    from axpile.plots import plot_pilecap_layout
+
+    # Pemanasan sekali dengan layout kecil; layout besar bisa memakan waktu lama per panggilan
+    plot_pilecap_layout(*synthetic_piles(4), 0.6)
+    cases = []
+    for n_piles in pile_counts:
+        piles_df, width_m, length_m = synthetic_piles(n_piles)
+        # Mode satu shape per tiang hanya diukur sampai shapes_max_piles (waktunya kuadratik)
+        modes = ("shapes", "trace") if n_piles <= shapes_max_piles else ("trace",)
+        for mode in modes:
+            timing = time_call(
+                lambda: plot_pilecap_layout(piles_df, width_m, length_m, 0.6, mode=mode), repeat, warmup=False
+            )
+            fig = plot_pilecap_layout(piles_df, width_m, length_m, 0.6, mode=mode)
+            cases.append(
+                {
+                    "name": "plot_pilecap_layout",
+                    "mode": mode,
+                    "n_piles": n_piles,
+                    "payload_bytes": len(fig.to_json()),
+                    **timing,
+                }
+            )
+    return cases
+
+
+def case_key(case: dict) -> str:
+    """Identitas kasus (tanpa hasil waktu) untuk membandingkan dua file JSON."""
+    skip = {"repeat", "payload_bytes"}
+    return json.dumps({k: v for k, v in case.items() if not k.endswith("_s") and k not in skip}, sort_keys=True)
+
+
+def git_commit() -> str | None:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def environment() -> dict:
+    import pandas as pd
+    import plotly
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(cases: list[dict], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {case_key(c): c for c in json.load(f)["cases"]}
+    print(f"{'ratio':>7}  case", file=sys.stderr)
+    for case in cases:
+        old = baseline.get(case_key(case))
+        if old is None:
+            continue
+        ratio = case["median_s"] / old["median_s"] if old["median_s"] > 0 else float("nan")
+        label = case_key(case)
+        print(f"{ratio:7.2f}  {label}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plot-repeat", type=int, default=1, help="jumlah ulangan benchmark grafik")
+    parser.add_argument("--quick", action="store_true", help="grid kecil untuk pengecekan cepat")
+    parser.add_argument("--output", help="path file JSON hasil")
+    parser.add_argument("--compare", help="file JSON hasil run sebelumnya sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        grid = (
+            QUICK_LAYER_COUNTS,
+            QUICK_DZ_VALUES,
+            QUICK_PILE_DEPTHS,
+            QUICK_PILE_COUNTS,
+            QUICK_LAYOUT_COUNTS,
+            QUICK_RAFT_PILE_COUNTS,
+            QUICK_MC_SAMPLE_COUNTS,
+        )
+    else:
+        grid = (LAYER_COUNTS, DZ_VALUES, PILE_DEPTHS, PILE_COUNTS, LAYOUT_COUNTS, RAFT_PILE_COUNTS, MC_SAMPLE_COUNTS)
+    layer_counts, dz_values, pile_depths, pile_counts, layout_counts, raft_pile_counts, mc_sample_counts = grid
+
+    cases = []
+    cases += bench_distributions(layer_counts, dz_values, pile_depths, args.repeat)
+    cases += bench_nspt_average(layer_counts, pile_depths, args.repeat)
+    cases += bench_group_efficiency(layout_counts, args.repeat)
+    cases += bench_nearest_spacing(raft_pile_counts, args.repeat)
+    cases += bench_monte_carlo(mc_sample_counts, args.repeat)
+    shapes_max_piles = QUICK_SHAPES_MAX_PILES if args.quick else SHAPES_MAX_PILES
+    cases += bench_pilecap_layout(pile_counts, args.plot_repeat, shapes_max_piles)
+
+    env = environment()
+    output = args.output
+    if output is None:
+        output = os.path.join(ROOT, "benchmarks", "results", f"{env['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "quick": args.quick, "cases": cases}, f, indent=2)
+    print(f"{len(cases)} kasus ditulis ke {output}", file=sys.stderr)
+
+    if args.compare:
+        compare(cases, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Benchmark waktu import ``axpile`` dan cek bahwa pandas/plotly tidak ikut dimuat.
+
+Jalankan dari root repo::
+
+    python benchmarks/bench_import.py [--repeat 5] [--max-overhead-ms 60]
+
+Setiap pengukuran memakai interpreter baru (``python -X importtime``) supaya
+cache modul tidak mempengaruhi hasil. Waktu import NumPy diukur dengan cara
+yang sama sebagai pembanding, karena NumPy adalah satu-satunya dependensi
+jalur inti. Exit code 1 bila pandas/plotly/streamlit ikut ter-import oleh
+``import axpile`` atau median selisih waktu import axpile terhadap NumPy
+melebihi ``--max-overhead-ms``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modul berat yang tidak boleh ikut dimuat oleh jalur inti
+HEAVY_MODULES = ("pandas", "plotly", "streamlit")
+
+_PROBE = (
+    "import sys, {module}; "
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))"
+)
+
+
+def measure_import(module: str = "axpile") -> dict:
+    """Satu pengukuran import di subprocess baru (mikrodetik, modul berat yang termuat)."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        # format: "import time: self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative_us = int(parts[1])
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return {"cumulative_us": cumulative_us, "heavy_modules": loaded}
+
+
+def run(repeat: int = 5) -> dict:
+    samples = []
+    numpy_ms = []
+    for _ in range(repeat):
+        samples.append(measure_import("axpile"))
+        numpy_ms.append(measure_import("numpy")["cumulative_us"] / 1000.0)
+    times_ms = [s["cumulative_us"] / 1000.0 for s in samples]
+    return {
+        "module": "axpile",
+        "repeat": repeat,
+        "median_ms": statistics.median(times_ms),
+        "min_ms": min(times_ms),
+        "numpy_median_ms": statistics.median(numpy_ms),
+        "overhead_ms": statistics.median(times_ms) - statistics.median(numpy_ms),
+        "heavy_modules": sorted({m for s in samples for m in s["heavy_modules"]}),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-overhead-ms", type=float, default=60.0, help="batas selisih median import axpile vs numpy (ms)"
+    )
+    args = parser.parse_args(argv)
+
+    result = run(args.repeat)
+    print(json.dumps(result, indent=2))
+    if result["heavy_modules"]:
+        print(f"FAIL: import axpile memuat {', '.join(result['heavy_modules'])}", file=sys.stderr)
+        return 1
+    if result["overhead_ms"] > args.max_overhead_ms:
+        print(
+            f"FAIL: import axpile {result['overhead_ms']:.1f} ms di atas numpy > {args.max_overhead_ms} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
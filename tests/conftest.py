@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Jalankan tes terhadap paket di repo ini tanpa instalasi
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,164 @@
+"""Implementasi acuan brute-force untuk tes.
+
+``reference_capacity`` mengikuti algoritma per kedalaman versi awal paket
+(satu kedalaman per iterasi, satu lapisan per iterasi di dalamnya), memakai
+tabel dict asli, sehingga dapat dibandingkan dengan engine vektor.
+"""
+import random
+from math import floor, pi, tan
+from typing import Optional
+
+import numpy as np
+
+from axpile.methods import TSF_KPA
+from axpile.models import Kdp, PileData_alpha, PileData_beta, PileMaterial, SoilLayer, SoilType
+
+
+
+METHODS = ("Decourt-Quaresma", "Mayerhof", "Reese & Wright")
+
+
+def random_case(rng: random.Random, method: str) -> tuple[dict, list[SoilLayer]]:
+    """Input acak yang lolos ``validate_inputs`` (argumen kata kunci dan lapisan)."""
+    layers = []
+    for _ in range(rng.randint(1, 8)):
+        thickness = round(rng.uniform(0.3, 6.0), 2)
+        if method == "Decourt-Quaresma":
+            behavior = rng.choice(["clay", "silt", "sand"])
+            layer = SoilLayer(
+                thickness, behavior, rng.choice(sorted(SoilType[behavior])), nspt=rng.randint(1, 60)
+            )
+        elif method == "Mayerhof":
+            behavior = rng.choice(["clay", "sand"])
+            if behavior == "clay":
+                layer = SoilLayer(
+                    thickness,
+                    behavior,
+                    behavior,
+                    su=rng.uniform(10, 150),
+                    alpha_tomlinson=rng.uniform(0.3, 1.0),
+                    gamma_eff=rng.randint(0, 10),
+                )
+            else:
+                layer = SoilLayer(thickness, behavior, behavior, gamma_eff=rng.randint(5, 11), phi=rng.randint(25, 46))
+        else:
+            behavior = rng.choice(["clay", "sand"])
+            if behavior == "clay":
+                layer = SoilLayer(thickness, behavior, behavior, su=rng.uniform(10, 250))
+            else:
+                layer = SoilLayer(thickness, behavior, behavior, nspt=rng.randint(1, 120))
+        layers.append(layer)
+    total = sum(layer.thickness_m for layer in layers)
+    # Dibulatkan ke bawah agar ujung tiang tidak melewati dasar profil
+    depth = floor(rng.uniform(min(0.5, total), total) * 10) / 10
+    kwargs = dict(
+        method=method,
+        diameter_m=rng.choice([0.3, 0.4, 0.6, 0.8, 1.2]),
+        pile_depth_m=depth,
+        cutoff_m=round(rng.uniform(0.0, min(depth, 2.0)), 1),
+        fs=rng.choice([2.0, 2.5, 3.0]),
+        pile_material=rng.choice(PileMaterial) if method == "Mayerhof" else None,
+        pile_types=rng.choice(list(PileData_alpha)) if method == "Decourt-Quaresma" else None,
+        dz=rng.choice([0.05, 0.1, 0.25, 0.5]),
+    )
+    return kwargs, layers
+
+
+def random_cases(seed: int, n: int, methods=METHODS):
+    """``n`` kasus per metode yang grid dz-nya tidak melewati kedalaman tiang."""
+    rng = random.Random(seed)
+    cases = []
+    for method in methods:
+        found = 0
+        while found < n:
+            kwargs, layers = random_case(rng, method)
+            # np.arange dapat melewati kedalaman tiang satu langkah; kasus itu ditolak compute_capacity
+            z_last = np.arange(kwargs["dz"], kwargs["pile_depth_m"] + kwargs["dz"], kwargs["dz"])[-1]
+            if z_last > kwargs["pile_depth_m"] + 1e-9:
+                continue
+            cases.append((kwargs, layers))
+            found += 1
+    return cases
+
+
+def _segments(layers: list[SoilLayer], pile_depth_m: float) -> list[tuple[float, SoilLayer]]:
+    segs, z_top = [], 0.0
+    for layer in layers:
+        if z_top >= pile_depth_m:
+            break
+        bot = min(z_top + layer.thickness_m, pile_depth_m)
+        segs.append((z_top, SoilLayer(bot - z_top, layer.soil_behavior, layer.soil_type, layer.nspt, layer.su,
+                                      layer.alpha_tomlinson, layer.gamma_eff, layer.phi)))
+        z_top += layer.thickness_m
+    return segs
+
+
+def reference_nspt_average(z: float, diameter_m: float, segs) -> Optional[float]:
+    weighted = thickness = 0.0
+    for z_top, lyr in segs:
+        overlap = min(z_top + lyr.thickness_m, z + 4 * diameter_m) - max(z_top, z - 4 * diameter_m)
+        if overlap > 0 and lyr.nspt is not None and lyr.nspt > 0:
+            weighted += lyr.nspt * overlap
+            thickness += overlap
+    return weighted / thickness if thickness > 0 else None
+
+
+def _unit_tip(method: str, lyr: SoilLayer, pile_types: Optional[str]) -> float:
+    if method == "Decourt-Quaresma":
+        return PileData_alpha[pile_types][lyr.soil_behavior] * Kdp[lyr.soil_type]
+    if method == "Mayerhof":
+        if lyr.soil_behavior == "clay":
+            return 9 * lyr.su if lyr.su is not None else 0.0
+        return 280.19 * min(lyr.phi, 42) - 7845.177
+    if lyr.soil_behavior == "clay":
+        return 9 * lyr.su
+    return min(2 * lyr.nspt / 3, 40) * TSF_KPA
+
+
+def _unit_shaft(method: str, lyr: SoilLayer, sigma: float, pile_material, pile_types) -> float:
+    if method == "Decourt-Quaresma":
+        return PileData_beta[pile_types][lyr.soil_behavior] * 10 * (lyr.nspt / 3 + 1)
+    if method == "Mayerhof":
+        if lyr.soil_behavior == "clay":
+            return lyr.alpha_tomlinson * lyr.su
+        if pile_material == "Steel":
+            delta, ks = 20, 0.029412 * lyr.phi - 0.32353
+        elif pile_material == "Concrete":
+            delta, ks = 0.75 * lyr.phi, 0.029412 * lyr.phi + 0.67647059
+        else:
+            delta, ks = (2 / 3) * lyr.phi, 0.1470588 * lyr.phi - 2.6176470588
+        return ks * sigma * tan(delta * pi / 180.0)
+    if lyr.soil_behavior == "clay":
+        return 0.55 * lyr.su
+    n = min(lyr.nspt, 100)
+    return (n / 34 if n <= 53 else (n - 53) / 450 + 1.6) * TSF_KPA
+
+
+def reference_capacity(method, diameter_m, pile_depth_m, cutoff_m, fs, pile_material, pile_types, dz, layers):
+    """Qb, Qfs, Qult, Qall (kN, tanpa pembulatan) dan Sigma_eff per kedalaman grid dz."""
+    ab_m2 = pi * diameter_m**2 / 4
+    perim_m = pi * diameter_m
+    segs = _segments(layers, pile_depth_m)
+    z_vals = np.arange(dz, pile_depth_m + dz, dz)
+    out = {name: np.zeros(len(z_vals)) for name in ("Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN", "Sigma_eff_kPa")}
+    behavior = np.empty(len(z_vals), dtype=object)
+    for i, z in enumerate(z_vals):
+        tip = next(lyr for z_top, lyr in segs if z_top <= z <= z_top + lyr.thickness_m + 1e-9)
+        qb_kPa = _unit_tip(method, tip, pile_types)
+        if method == "Decourt-Quaresma":
+            n_avg = reference_nspt_average(z, diameter_m, segs)
+            qb_kPa = qb_kPa * n_avg if n_avg is not None else np.nan
+        qs = sigma = 0.0
+        for z_top, lyr in segs:
+            z_bot = z_top + lyr.thickness_m
+            sigma += (lyr.gamma_eff or 0.0) * max(0.0, min(z_bot, z) - z_top)
+            embedded = max(0.0, min(z_bot, z) - max(z_top, cutoff_m))
+            if embedded > 0:
+                qs += _unit_shaft(method, lyr, sigma, pile_material, pile_types) * perim_m * embedded
+        behavior[i] = tip.soil_behavior
+        out["Qb_kN"][i] = qb_kPa * ab_m2
+        out["Qfs_kN"][i] = qs
+        out["Sigma_eff_kPa"][i] = sigma
+    out["Qult_kN"] = out["Qb_kN"] + out["Qfs_kN"]
+    out["Qall_kN"] = out["Qult_kN"] / fs
+    return {"Depth_m": z_vals, "Soil Behavior": behavior, **out}
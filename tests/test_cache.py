@@ -0,0 +1,127 @@
+import dataclasses
+import os
+
+import numpy as np
+import pytest
+
+from axpile.cache import CapacityCache, cache_key
+from axpile.calc import compute_capacity
+from axpile.models import SoilLayer, SoilProfile
+from axpile.result import CapacityResult
+
+LAYERS = [
+    SoilLayer(4.0, "clay", "clay", nspt=8),
+    SoilLayer(3.0, "sand", "silty sand", nspt=25),
+    SoilLayer(5.0, "clay", "sandy clay", nspt=40),
+]
+ARGS = ("Decourt-Quaresma", 0.6, 10.0, 1.0, 2.5, None, "Franki piles", 0.5)
+
+
+def _args(**changes):
+    names = ["method", "diameter_m", "pile_depth_m", "cutoff_m", "fs", "pile_material", "pile_types", "dz"]
+    values = dict(zip(names, ARGS))
+    values.update(changes)
+    return tuple(values[name] for name in names)
+
+
+def test_cache_key_is_canonical():
+    key = cache_key(*ARGS, LAYERS)
+    floats = [dataclasses.replace(layer, nspt=float(layer.nspt)) for layer in LAYERS]
+    assert cache_key(*ARGS, floats) == key
+    assert cache_key(*ARGS, SoilProfile.from_layers(LAYERS)) == key
+    assert cache_key(*_args(diameter_m=0.6000001), LAYERS) != key
+    assert cache_key(*_args(pile_types="Driven wooden piles"), LAYERS) != key
+    assert cache_key(*ARGS, LAYERS[:2] + [dataclasses.replace(LAYERS[2], thickness_m=5.5)]) != key
+    # Nama jenis tanah teks bebas ikut di-hash meskipun kodenya sama-sama "tidak dikenal"
+    named = [dataclasses.replace(LAYERS[0], soil_type="stiff clay")] + LAYERS[1:]
+    renamed = [dataclasses.replace(LAYERS[0], soil_type="soft clay")] + LAYERS[1:]
+    assert cache_key(*ARGS, named) != cache_key(*ARGS, renamed)
+
+
+def test_memory_tier_is_lru():
+    cache = CapacityCache(maxsize=2)
+    first = cache.compute_capacity(*ARGS, LAYERS)
+    assert cache.compute_capacity(*ARGS, LAYERS) is first
+    cache.compute_capacity(*_args(fs=3.0), LAYERS)
+    cache.compute_capacity(*ARGS, LAYERS)  # entri pertama jadi paling baru dipakai
+    cache.compute_capacity(*_args(fs=2.0), LAYERS)  # mengusir fs=3.0
+    assert cache.get(cache_key(*ARGS, LAYERS)) is first
+    assert cache.get(cache_key(*_args(fs=3.0), LAYERS)) is None
+    assert cache.stats() == {"hits": 3, "disk_hits": 0, "misses": 4, "size": 2, "maxsize": 2}
+
+
+def test_cached_result_is_read_only():
+    cache = CapacityCache()
+    result = cache.compute_capacity(*ARGS, LAYERS)
+    with pytest.raises(TypeError):
+        result.recap["Qall_total_kN"] = 0.0
+    with pytest.raises(ValueError):
+        result.columns["Qall_kN"][0] = 0.0
+    df, recap = cache.compute_distributions(*ARGS, LAYERS)
+    recap["Qall_total_kN"] = 0.0
+    df.loc[0, "Qall_kN"] = 0.0
+    assert cache.compute_capacity(*ARGS, LAYERS).recap["Qall_total_kN"] == result.recap["Qall_total_kN"] != 0.0
+    assert cache.compute_capacity(*ARGS, LAYERS).dataframe.loc[0, "Qall_kN"] != 0.0
+
+
+def test_disk_round_trip(tmp_path):
+    fresh = CapacityCache(directory=str(tmp_path)).compute_capacity(*ARGS, LAYERS)
+    cache = CapacityCache(directory=str(tmp_path))
+    result = cache.compute_capacity(*ARGS, LAYERS)
+    assert cache.stats()["disk_hits"] == 1
+    assert list(result.columns) == list(fresh.columns)
+    for name, values in fresh.columns.items():
+        np.testing.assert_array_equal(result.columns[name], values)
+        assert result.columns[name].dtype == values.dtype
+    assert dict(result.recap) == dict(fresh.recap)
+    assert list(result["Soil Type"]) == list(fresh["Soil Type"])
+    with pytest.raises(TypeError):
+        result.recap["FS"] = 1.0
+    # Tanpa memori, setiap get dibaca ulang dari disk
+    cache.clear()
+    assert cache.get(cache_key(*ARGS, LAYERS)) is not None
+    cache.clear(disk=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    writer = CapacityCache(maxsize=0, directory=str(tmp_path))
+    writer.compute_capacity(*ARGS, LAYERS)
+    size = os.path.getsize(tmp_path / f"{cache_key(*ARGS, LAYERS)}.npz")
+    keys = [cache_key(*_args(fs=fs), LAYERS) for fs in (2.0, 3.0, 4.0)]
+
+    cache = CapacityCache(maxsize=0, directory=str(tmp_path), max_disk_bytes=int(2.5 * size))
+    cache.clear(disk=True)
+    for i, fs in enumerate((2.0, 3.0)):
+        cache.compute_capacity(*_args(fs=fs), LAYERS)
+        os.utime(tmp_path / f"{keys[i]}.npz", (1000.0 + i, 1000.0 + i))
+    assert cache.get(keys[0]) is not None  # dibaca -> mtime diperbarui, fs=3.0 jadi paling lama
+    cache.compute_capacity(*_args(fs=4.0), LAYERS)
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{key}.npz" for key in (keys[0], keys[2]))
+
+
+def test_capacity_at_is_the_same_fresh_from_memory_and_from_disk(tmp_path):
+    # Batas lapisan di 7.0 m; Qb melompat di sana sehingga interpolasi antar baris dz akan meleset
+    depths = np.array([6.999, 7.0, 7.001, 7.25])
+    fresh = compute_capacity(*ARGS, LAYERS).capacity_at(depths)
+    memory = CapacityCache()
+    memory.compute_capacity(*ARGS, LAYERS)
+    from_memory = memory.compute_capacity(*ARGS, LAYERS).capacity_at(depths)
+    CapacityCache(directory=str(tmp_path)).compute_capacity(*ARGS, LAYERS)
+    disk = CapacityCache(directory=str(tmp_path))
+    from_disk = disk.compute_capacity(*ARGS, LAYERS).capacity_at(depths)
+    assert memory.stats()["hits"] == 1 and disk.stats()["disk_hits"] == 1
+    for name, values in fresh.items():
+        np.testing.assert_array_equal(from_memory[name], values)
+        np.testing.assert_array_equal(from_disk[name], values)
+    assert abs(fresh["Qall_kN"][2] - fresh["Qall_kN"][1]) > 100.0
+    result = compute_capacity(*ARGS, LAYERS)
+    interpolated = np.interp(depths, result.depth_m, result.qall_kN)
+    assert abs(interpolated[2] - fresh["Qall_kN"][2]) > 100.0
+
+
+def test_capacity_at_requires_a_curve():
+    result = compute_capacity(*ARGS, LAYERS)
+    bare = CapacityResult(result.columns, result.recap)
+    with pytest.raises(ValueError, match="no capacity curve"):
+        bare.capacity_at(7.25)
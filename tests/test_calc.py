@@ -0,0 +1,127 @@
+import dataclasses
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from reference import random_case, random_cases, reference_capacity, reference_nspt_average
+
+from axpile.calc import (
+    compute_capacity,
+    compute_distributions,
+    compute_nspt_average,
+    compute_nspt_averages,
+    expand_layers_to_depth,
+    iter_capacity,
+    iter_distribution_rows,
+    update_capacity,
+    update_distributions,
+)
+from axpile.models import SoilLayer
+
+Q_COLUMNS = ["Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN"]
+CASES = random_cases(seed=1, n=40)
+
+
+@pytest.mark.parametrize("kwargs,layers", CASES)
+def test_compute_capacity_matches_per_depth_reference(kwargs, layers):
+    result = compute_capacity(layers=layers, **kwargs)
+    ref = reference_capacity(layers=layers, **kwargs)
+    np.testing.assert_array_equal(result.depth_m, ref["Depth_m"])
+    for name in Q_COLUMNS:
+        np.testing.assert_allclose(result[name], ref[name], rtol=1e-9, atol=1e-9, equal_nan=True)
+    assert list(result["Soil Behavior"]) == list(ref["Soil Behavior"])
+    if kwargs["method"] == "Mayerhof":
+        np.testing.assert_allclose(result["Sigma_eff_kPa"], ref["Sigma_eff_kPa"], rtol=1e-12, atol=1e-9)
+    assert result.recap["Qall_total_kN"] == pytest.approx(ref["Qall_kN"][-1], rel=1e-9, nan_ok=True)
+
+
+def test_compute_distributions_rounds_q_columns():
+    kwargs, layers = CASES[0]
+    df, recap = compute_distributions(layers=layers, **kwargs)
+    result = compute_capacity(layers=layers, **kwargs)
+    for name in Q_COLUMNS:
+        np.testing.assert_array_equal(df[name], np.round(result[name], 2))
+    assert recap == result.recap
+
+
+def test_nspt_averages_match_scalar_scan():
+    rng = random.Random(3)
+    for _ in range(30):
+        _, layers = random_case(rng, "Decourt-Quaresma")
+        layers = [dataclasses.replace(lyr, nspt=None) if rng.random() < 0.2 else lyr for lyr in layers]
+        segs = expand_layers_to_depth(layers, 1000.0)
+        total = sum(lyr.thickness_m for lyr in layers)
+        z = np.concatenate((np.linspace(-2.0, total + 2.0, 37), np.cumsum([lyr.thickness_m for lyr in layers])))
+        batch = compute_nspt_averages(z, 0.6, segs)
+        for zi, value in zip(z, batch):
+            scalar = compute_nspt_average(zi, 0.6, segs)
+            expected = reference_nspt_average(zi, 0.6, segs)
+            assert (scalar is None) == (expected is None) == np.isnan(value)
+            if expected is not None:
+                assert scalar == pytest.approx(expected, rel=1e-12)
+                assert value == pytest.approx(expected, rel=1e-12)
+
+
+def _perturbed(rng: random.Random, method: str, layer: SoilLayer) -> SoilLayer:
+    if method == "Decourt-Quaresma" or (method == "Reese & Wright" and layer.soil_behavior == "sand"):
+        changed = dataclasses.replace(layer, nspt=rng.randint(1, 60))
+    elif layer.soil_behavior == "clay":
+        changed = dataclasses.replace(layer, su=rng.uniform(10, 150))
+    else:
+        changed = dataclasses.replace(layer, phi=rng.randint(25, 45), gamma_eff=rng.randint(5, 11))
+    if rng.random() < 0.3:
+        changed = dataclasses.replace(changed, thickness_m=changed.thickness_m * rng.uniform(0.5, 1.5))
+    return changed
+
+
+@pytest.mark.parametrize("kwargs,layers", CASES)
+def test_update_capacity_matches_full_recompute(kwargs, layers):
+    rng = random.Random(len(layers))
+    previous = compute_capacity(layers=layers, **kwargs)
+    k = rng.randrange(len(layers))
+    changed = list(layers)
+    changed[k] = _perturbed(rng, kwargs["method"], layers[k])
+    try:
+        full = compute_capacity(layers=changed, **kwargs)
+    except ValueError:
+        with pytest.raises(ValueError):
+            update_capacity(previous, k, layers=changed, **kwargs)
+        return
+    updated = update_capacity(previous, k, layers=changed, **kwargs)
+    for name, values in full.columns.items():
+        np.testing.assert_allclose(updated.columns[name], values, rtol=1e-12, atol=1e-9, equal_nan=True)
+    assert updated.recap == pytest.approx(full.recap, nan_ok=True)
+
+    df, recap = update_distributions((previous.dataframe, previous.recap), k, layers=changed, **kwargs)
+    pd.testing.assert_frame_equal(df, full.dataframe, check_exact=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("kwargs,layers", CASES[::10])
+def test_iter_capacity_chunks_concatenate_to_full_result(kwargs, layers):
+    result = compute_capacity(layers=layers, **kwargs)
+    chunks = list(iter_capacity(layers=layers, chunk_size=7, **kwargs))
+    for name, values in result.columns.items():
+        np.testing.assert_array_equal(np.concatenate([c[name] for c in chunks]), values)
+    rows = list(iter_distribution_rows(layers=layers, chunk_size=7, **kwargs))
+    assert len(rows) == len(result)
+    assert rows[-1]["Qall_kN"] == round(float(result["Qall_kN"][-1]), 2)
+    assert rows[-1]["Soil Behavior"] == result["Soil Behavior"][-1]
+
+
+def test_category_columns_are_integer_codes():
+    kwargs, layers = next(case for case in CASES if case[0]["method"] == "Decourt-Quaresma")
+    result = compute_capacity(layers=layers, **kwargs)
+    assert result.columns["Soil Behavior"].dtype.kind == "i"
+    assert result.columns["Soil Type"].dtype.kind == "i"
+    df = result.dataframe
+    assert isinstance(df["Soil Behavior"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Soil Type"].dtype, pd.CategoricalDtype)
+    assert list(df["Soil Type"]) == list(result["Soil Type"])
+    assert list(df["Soil Behavior"]) == list(result["Soil Behavior"])
+
+
+def test_decourt_quaresma_rejects_unknown_soil_type():
+    layers = [SoilLayer(10.0, "clay", "stiff clay", nspt=10.0)]
+    with pytest.raises(ValueError, match="not supported for Decourt-Quaresma"):
+        compute_capacity("Decourt-Quaresma", 0.6, 5.0, 1.0, 2.5, None, "Franki piles", 0.5, layers)
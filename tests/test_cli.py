@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+
+import pytest
+
+from axpile.calc import compute_capacity
+from axpile.cli import main, read_csv, read_jsonl, run_batch
+from axpile.models import PileConfig, SoilLayer
+
+CONFIG = {
+    "method": "Mayerhof",
+    "diameter_m": 0.6,
+    "pile_depth_m": 8.0,
+    "cutoff_m": 1.0,
+    "fs": 2.5,
+    "dz": 0.5,
+    "pile_material": "Concrete",
+}
+LAYERS = [
+    {"thickness_m": 4.0, "soil_behavior": "clay", "soil_type": "clay", "su": 40, "alpha_tomlinson": 0.8, "gamma_eff": 7},
+    {"thickness_m": 6.0, "soil_behavior": "sand", "soil_type": "sand", "gamma_eff": 9, "phi": 34},
+]
+
+
+def _expected_qall(**changes) -> float:
+    config = {"pile_types": None, **CONFIG, **changes}
+    layers = [SoilLayer(**{k: float(v) if not isinstance(v, str) else v for k, v in layer.items()}) for layer in LAYERS]
+    return compute_capacity(layers=layers, **config).recap["Qall_total_kN"]
+
+
+def _jsonl(*records) -> str:
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+def test_read_jsonl_reports_bad_lines_without_stopping():
+    text = _jsonl({"case_id": "A", **CONFIG, "layers": LAYERS}) + "\n{not json\n" + _jsonl({"method": "Mayerhof"})
+    cases = list(read_jsonl(io.StringIO(text)))
+    assert [case[0] for case in cases] == ["A", "3", "4"]
+    case_id, config, layers = cases[0]
+    assert config == PileConfig(**{k: v if isinstance(v, str) else float(v) for k, v in CONFIG.items()})
+    assert layers[1] == SoilLayer(6.0, "sand", "sand", gamma_eff=9.0, phi=34.0)
+    assert cases[1][1] is None
+    assert cases[2][1] is None and "Missing field(s): diameter_m" in cases[2][2]
+
+
+def test_read_csv_groups_consecutive_rows_by_case_id():
+    stream = io.StringIO()
+    writer = csv.DictWriter(stream, fieldnames=["case_id", *CONFIG, *LAYERS[0], "phi"])
+    writer.writeheader()
+    for case_id in ("A", "B"):
+        for i, layer in enumerate(LAYERS):
+            writer.writerow({"case_id": case_id, **(CONFIG if i == 0 else {}), **layer})
+    stream.seek(0)
+    cases = list(read_csv(stream))
+    assert [(case_id, len(layers)) for case_id, _, layers in cases] == [("A", 2), ("B", 2)]
+    assert cases[1][1].pile_material == "Concrete"
+    with pytest.raises(ValueError, match="case_id"):
+        list(read_csv(io.StringIO("method,diameter_m\nMayerhof,0.6\n")))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_keeps_input_order_and_bounds_pending_chunks(workers):
+    n_cases, chunksize = 24, 2
+    text = _jsonl(*({"case_id": str(i), **CONFIG, "fs": 2.0 + i / 10, "layers": LAYERS} for i in range(n_cases)))
+    consumed = []
+    batches = []
+
+    def cases():
+        for i, case in enumerate(read_jsonl(io.StringIO(text))):
+            consumed.append(i)
+            yield case
+
+    def write(rows):
+        batches.append((len(consumed), rows))
+
+    assert run_batch(cases(), write, workers=workers, chunksize=chunksize) == n_cases
+    rows = [row for _, rows in batches for row in rows]
+    assert [row["case_id"] for row in rows] == [str(i) for i in range(n_cases)]
+    assert rows[3]["Qall_total_kN"] == pytest.approx(_expected_qall(fs=2.3))
+    # Saat potongan ke-k ditulis, paling banyak 2 * workers potongan (lebih dulu) sudah dibaca
+    for k, (n_read, _) in enumerate(batches):
+        assert n_read <= (k + 1 + 2 * max(workers, 1)) * chunksize
+
+
+def test_main_jsonl_to_csv(tmp_path, capsys):
+    source = tmp_path / "cases.jsonl"
+    source.write_text(_jsonl({"case_id": "A", **CONFIG, "layers": LAYERS}, {"case_id": "bad", **CONFIG, "layers": []}))
+    target = tmp_path / "hasil.csv"
+    assert main([str(source), "-o", str(target)]) == 0
+    assert "2 case(s) processed" in capsys.readouterr().err
+    rows = list(csv.DictReader(target.open()))
+    assert float(rows[0]["Qall_total_kN"]) == pytest.approx(_expected_qall())
+    assert rows[0]["Error"] == ""
+    assert rows[1]["Error"] == "1 layer minimun required"
+
+
+def test_main_csv_profiles_to_jsonl(tmp_path):
+    source = tmp_path / "cases.csv"
+    with source.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["case_id", *CONFIG, *LAYERS[0], "phi"])
+        writer.writeheader()
+        for i, layer in enumerate(LAYERS):
+            writer.writerow({"case_id": "A", **(CONFIG if i == 0 else {}), **layer})
+    target = tmp_path / "profil.jsonl"
+    assert main([str(source), "-o", str(target), "--profiles"]) == 0
+    rows = [json.loads(line) for line in target.read_text().splitlines()]
+    assert len(rows) == 16
+    assert rows[0]["Soil Behavior"] == "clay"
+    assert rows[-1]["Qall_kN"] == pytest.approx(round(_expected_qall(), 2))
+
+
+def test_main_reports_missing_input_and_unwritable_output(tmp_path, capsys):
+    assert main([str(tmp_path / "tidak-ada.jsonl")]) == 1
+    assert capsys.readouterr().err.startswith("axpile: ")
+    source = tmp_path / "cases.jsonl"
+    source.write_text(_jsonl({**CONFIG, "layers": LAYERS}))
+    assert main([str(source), "-o", str(tmp_path / "tidak-ada" / "hasil.csv")]) == 1
+    assert capsys.readouterr().err.startswith("axpile: ")
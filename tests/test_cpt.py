@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from axpile.cpt import CptSounding, _schmertmann_tip, compute_schmertmann
+from axpile.geometry import compute_pile_perimeter_m_from_diameter, compute_pile_tip_area_m2_from_diameter
+
+
+def brute_force_tip(qc: np.ndarray, h: float, diameter_m: float) -> tuple[np.ndarray, np.ndarray]:
+    """qc1 dan qc2 per ujung dengan mencoba setiap panjang zona secara langsung."""
+    n = len(qc)
+    n07 = max(1, round(0.7 * diameter_m / h))
+    n4 = max(n07, round(4 * diameter_m / h))
+    n8 = max(1, round(8 * diameter_m / h))
+    qc1 = np.empty(n)
+    qc2 = np.empty(n)
+    for t in range(n):
+        lengths = range(n07, min(n4, n - 1 - t) + 1) if n - 1 - t >= n07 else [n - 1 - t]
+        best, best_min = np.inf, None
+        for k in lengths:
+            zone = qc[t : t + k + 1]
+            path = [zone[i:].min() for i in range(len(zone))]
+            value = 0.5 * (zone.mean() + np.mean(path))
+            if value < best:
+                best, best_min = value, zone.min()
+        qc1[t] = best
+        running, total, count = best_min, 0.0, 0
+        for j in range(t, max(t - n8, 0) - 1, -1):
+            running = min(running, qc[j])
+            total += running
+            count += 1
+        qc2[t] = total / count
+    return qc1, qc2
+
+
+@pytest.mark.parametrize("diameter_m", [0.2, 0.3, 0.6])
+@pytest.mark.parametrize("seed", range(3))
+def test_schmertmann_tip_matches_brute_force(diameter_m, seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(50, 200))
+    qc = np.abs(np.cumsum(rng.normal(0, 500, n))) + rng.uniform(100, 5000, n)
+    qc1, qc2 = _schmertmann_tip(qc, 0.02, diameter_m)
+    ref1, ref2 = brute_force_tip(qc, 0.02, diameter_m)
+    np.testing.assert_allclose(qc1, ref1, rtol=1e-12)
+    np.testing.assert_allclose(qc2, ref2, rtol=1e-12)
+
+
+def test_schmertmann_tip_short_sounding():
+    qc = np.array([3000.0, 1000.0, 2000.0])
+    qc1, qc2 = _schmertmann_tip(qc, 0.02, 0.6)
+    ref1, ref2 = brute_force_tip(qc, 0.02, 0.6)
+    np.testing.assert_allclose(qc1, ref1, rtol=1e-12)
+    np.testing.assert_allclose(qc2, ref2, rtol=1e-12)
+
+
+def test_compute_schmertmann_uniform_sounding():
+    # qc dan sleeve konstan: qc1 = qc2 = qc, integral selimut berbobot analitik
+    diameter_m, qc, sleeve = 0.5, 4000.0, 50.0
+    z = np.round(np.arange(0, 751) * 0.02, 10)
+    cpt = CptSounding(z, np.full(len(z), qc), np.full(len(z), sleeve))
+    result = compute_schmertmann(diameter_m, 12.0, 1.0, 2.5, 0.5, cpt)
+    np.testing.assert_allclose(result["Qb_kN"], qc * compute_pile_tip_area_m2_from_diameter(diameter_m))
+    depth = result.depth_m
+    weighted = np.where(depth < 8 * diameter_m, depth**2 / (16 * diameter_m), depth - 4 * diameter_m)
+    shaft = sleeve * (weighted - 1.0**2 / (16 * diameter_m))
+    expected = np.maximum(shaft, 0.0) * compute_pile_perimeter_m_from_diameter(diameter_m)
+    np.testing.assert_allclose(result["Qfs_kN"], expected, rtol=1e-9, atol=1e-9)
+
+
+def _random_sounding(seed: int, length_m: float = 15.0) -> CptSounding:
+    rng = np.random.default_rng(seed)
+    z = np.round(np.arange(0, int(length_m / 0.02) + 1) * 0.02, 10)
+    qc = np.abs(np.cumsum(rng.normal(0, 300, len(z)))) + rng.uniform(500, 8000, len(z))
+    # Sleeve sedikit negatif di beberapa bacaan (drift sensor): integral selimut tidak monoton
+    sleeve = 0.015 * qc + rng.normal(0, 60, len(z))
+    return CptSounding(z, qc, sleeve)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_schmertmann_capacity_at_matches_columns_at_any_dz(seed):
+    cpt = _random_sounding(seed)
+    args = dict(diameter_m=0.45, pile_depth_m=12.0, cutoff_m=1.013, fs=2.5, cpt=cpt, ks=0.8)
+    coarse = compute_schmertmann(dz=0.5, **args)
+    assert coarse.curve.max_depth_m == pytest.approx(12.0)
+    for dz in (0.5, 0.075, 0.015):
+        fine = compute_schmertmann(dz=dz, **args)
+        at = coarse.capacity_at(fine.depth_m)
+        for name in ("Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN"):
+            np.testing.assert_allclose(at[name], fine[name], rtol=1e-9, atol=1e-9, err_msg=f"{name} dz={dz}")
+    # Di atas cutoff tidak ada friksi; satu kedalaman skalar juga bisa
+    assert coarse.capacity_at(0.5)["Qfs_kN"] == 0.0
+    assert coarse.capacity_at(6.0)["Qall_kN"] == pytest.approx(compute_schmertmann(dz=6.0, **args)["Qall_kN"][0])
+    with pytest.raises(ValueError):
+        coarse.capacity_at(12.5)
+
+
+def test_schmertmann_curve_follows_shaft_clipping_between_readings():
+    # Sleeve negatif di 1.2-1.6 m: integral selimut turun di bawah nilai cutoff lalu naik lagi,
+    # titik nolnya jatuh di antara bacaan sehingga kurva butuh titik patah tambahan
+    z = np.round(np.arange(0, 251) * 0.02, 10)
+    sleeve = np.where((z > 1.2) & (z < 1.6), -150.0, 40.0)
+    cpt = CptSounding(z, np.full(len(z), 3000.0), sleeve)
+    args = dict(diameter_m=0.3, pile_depth_m=4.0, cutoff_m=1.1, fs=2.0, cpt=cpt)
+    result = compute_schmertmann(dz=0.5, **args)
+    fine = compute_schmertmann(dz=0.0025, **args)
+    qfs = fine["Qfs_kN"]
+    assert np.any(qfs[(fine.depth_m > 1.2) & (fine.depth_m < 2.5)] == 0.0) and qfs[-1] > 0.0
+    assert len(result.curve.breaks) > len(np.unique(np.concatenate(([0.0, 1.1], z[z <= 4.0]))))
+    np.testing.assert_allclose(result.capacity_at(fine.depth_m)["Qfs_kN"], qfs, rtol=1e-9, atol=1e-9)
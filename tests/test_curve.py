@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from reference import random_cases
+
+from axpile.calc import compute_capacity
+from axpile.curve import capacity_curve
+
+Q_COLUMNS = ["Qb_kN", "Qfs_kN", "Qult_kN", "Qall_kN"]
+CASES = random_cases(seed=2, n=30)
+
+
+def _curve_args(kwargs):
+    return {name: value for name, value in kwargs.items() if name != "dz"}
+
+
+@pytest.mark.parametrize("kwargs,layers", CASES)
+def test_curve_matches_grid_at_every_depth(kwargs, layers):
+    result = compute_capacity(layers=layers, **kwargs)
+    curve = capacity_curve(layers=layers, **_curve_args(kwargs))
+    evaluated = curve.evaluate(result.depth_m)
+    via_result = result.capacity_at(result.depth_m)
+    for name in Q_COLUMNS:
+        np.testing.assert_allclose(evaluated[name], result[name], rtol=1e-8, atol=1e-8, equal_nan=True)
+        np.testing.assert_array_equal(via_result[name], evaluated[name])
+
+
+@pytest.mark.parametrize("kwargs,layers", CASES[::6])
+def test_curve_sample_uses_compute_capacity_grid(kwargs, layers):
+    result = compute_capacity(layers=layers, **kwargs)
+    sampled = capacity_curve(layers=layers, **_curve_args(kwargs)).sample(kwargs["dz"])
+    np.testing.assert_array_equal(sampled["Depth_m"], result.depth_m)
+    np.testing.assert_allclose(sampled["Qall_kN"], result["Qall_kN"], rtol=1e-8, atol=1e-8, equal_nan=True)
+
+
+def test_curve_scalar_and_out_of_range_depths():
+    kwargs, layers = CASES[0]
+    curve = capacity_curve(layers=layers, **_curve_args(kwargs))
+    depth = curve.max_depth_m
+    assert np.ndim(curve(depth)) == 0
+    assert float(curve(depth)) == pytest.approx(float(curve([depth])[0]))
+    with pytest.raises(ValueError):
+        curve(-0.1)
+    with pytest.raises(ValueError):
+        curve(depth + 1.0)
@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from axpile.group import (
+    PileLayouts,
+    check_layouts,
+    converse_labarre,
+    feld,
+    grid_shape,
+    group_efficiency,
+    los_angeles,
+    nearest_spacing,
+)
+
+
+def brute_force_nearest(layouts: PileLayouts) -> np.ndarray:
+    """Jarak tetangga terdekat per tiang dengan perbandingan semua pasangan O(n^2)."""
+    best = np.full(len(layouts.x), np.inf)
+    for g in range(len(layouts)):
+        lo, hi = layouts.offsets[g], layouts.offsets[g + 1]
+        x, y = layouts.x[lo:hi], layouts.y[lo:hi]
+        d = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+        np.fill_diagonal(d, np.inf)
+        if hi - lo > 1:
+            best[lo:hi] = d.min(axis=1)
+    return best
+
+
+def _random_layout(rng: np.random.Generator) -> np.ndarray:
+    n = int(rng.integers(0, 60))
+    kind = rng.choice(["uniform", "grid", "line", "cluster", "duplicates"])
+    if kind == "uniform":
+        xy = rng.uniform(0, rng.uniform(0.5, 50), (n, 2))
+    elif kind == "grid":
+        s = rng.uniform(0.5, 3.0)
+        xy = np.array([(i * s, j * s) for i in range(int(np.sqrt(n)) + 1) for j in range(int(np.sqrt(n)) + 1)])
+        xy += rng.normal(0, 0.005, xy.shape)
+    elif kind == "line":
+        xy = np.column_stack((rng.uniform(0, 20, n), np.full(n, 3.0)))
+    elif kind == "cluster":
+        # Klaster rapat dengan beberapa tiang jauh: spasi jauh di bawah ukuran sel
+        xy = np.vstack((rng.normal(0, 0.05, (n, 2)), rng.uniform(-500, 500, (3, 2))))
+    else:
+        xy = rng.uniform(0, 5, (max(n // 2, 1), 2))
+        xy = np.vstack((xy, xy[rng.integers(0, len(xy), n - len(xy) // 2)]))
+    return xy + rng.uniform(-1e3, 1e3, 2)
+
+
+def test_nearest_spacing_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        layouts = PileLayouts.from_layouts([_random_layout(rng) for _ in range(int(rng.integers(1, 8)))])
+        np.testing.assert_allclose(nearest_spacing(layouts), brute_force_nearest(layouts), rtol=1e-12)
+
+
+def test_duplicate_piles_have_zero_spacing():
+    layouts = PileLayouts.from_layouts([[(0, 0), (0, 0), (3, 0)], [(1, 1)] * 4])
+    np.testing.assert_array_equal(nearest_spacing(layouts), [0.0, 0.0, 3.0, 0.0, 0.0, 0.0, 0.0])
+
+
+def test_single_and_empty_layouts():
+    layouts = PileLayouts.from_layouts([[(5, 5)], np.zeros((0, 2)), [(0, 0), (0, 2)], [(1, 1)]])
+    np.testing.assert_array_equal(nearest_spacing(layouts), [np.inf, 2.0, 2.0, np.inf])
+    assert len(nearest_spacing(PileLayouts.from_layouts([]))) == 0
+    check = check_layouts(layouts, 0.6)
+    np.testing.assert_array_equal(check.min_spacing_m, [np.inf, np.inf, 2.0, np.inf])
+    np.testing.assert_array_equal(check.n_too_close, [0, 0, 0, 0])
+
+
+def test_spacing_below_cell_size():
+    # Dua tiang jauh membuat sel ~ ratusan meter, pasangan rapat harus tetap tepat
+    xy = np.array([(0.0, 0.0), (0.3, 0.0), (0.3, 0.4), (1000.0, 1000.0), (1000.0, -1000.0)])
+    layouts = PileLayouts.from_layouts([xy])
+    np.testing.assert_allclose(nearest_spacing(layouts), brute_force_nearest(layouts), rtol=1e-12)
+    check = check_layouts(layouts, 0.6)
+    assert check.n_overlapping[0] == 3
+    assert check.min_spacing_m[0] == pytest.approx(0.3)
+
+
+def test_grid_shape_with_survey_tolerance():
+    xy = [(x + 0.004 * (y % 2), y) for x in (0.0, 1.5, 3.0) for y in (0.0, 1.5)]
+    n_rows, n_cols = grid_shape(PileLayouts.from_layouts([xy, [(0, 0)]]))
+    np.testing.assert_array_equal(n_rows, [2, 1])
+    np.testing.assert_array_equal(n_cols, [3, 1])
+    n_rows, n_cols = grid_shape(PileLayouts.from_layouts([xy]), tol_m=0.0)
+    assert (n_rows[0], n_cols[0]) == (2, 6)
+
+
+def _grid(n_rows: int, n_cols: int, spacing_m: float, jitter_m: float = 0.0) -> np.ndarray:
+    return np.array([(j * spacing_m + jitter_m * (i % 2), i * spacing_m) for i in range(n_rows) for j in range(n_cols)])
+
+
+# D = 0.6 m, s = 1.5 m: theta = atan(0.4) = 21.8014 derajat
+#   Converse-Labarre 2x2: 1 - theta (1*2 + 1*2) / (90*4)            = 0.757762
+#   Converse-Labarre 3x3: 1 - theta (2*3 + 2*3) / (90*9)            = 0.677016
+#   Feld 2x2: tiap tiang 3 tetangga -> 1 - 3/16                     = 0.8125
+#   Feld 3x3: 4 sudut x 3 + 4 tepi x 5 + 1 tengah x 8 = 40 -> 1 - 40/(16*9) = 0.722222
+#   Los Angeles 2x2: 1 - 0.6/(pi*1.5*4) (2 + 2 + sqrt2)             = 0.827660
+#   Los Angeles 3x3: 1 - 0.6/(pi*1.5*9) (6 + 6 + 4 sqrt2)           = 0.750207
+HAND_COMPUTED = {
+    "Converse-Labarre": (0.757762, 0.677016),
+    "Feld": (0.8125, 0.722222),
+    "Los Angeles": (0.827660, 0.750207),
+}
+
+
+@pytest.mark.parametrize("method", list(HAND_COMPUTED))
+def test_group_efficiency_matches_hand_computed_values(method):
+    layouts = [_grid(2, 2, 1.5), _grid(3, 3, 1.5, jitter_m=0.004), np.zeros((0, 2))]
+    result = group_efficiency(layouts, 0.6, 1.5, method=method)
+    np.testing.assert_array_equal(result.n_rows, [2, 3, 0])
+    np.testing.assert_array_equal(result.n_cols, [2, 3, 0])
+    np.testing.assert_allclose(result.efficiency[:2], HAND_COMPUTED[method], atol=5e-7)
+    assert np.isnan(result.efficiency[2])
+    expected_kN = np.array(HAND_COMPUTED[method]) * [400.0, 900.0]
+    np.testing.assert_allclose(result.group_capacity(100.0)[:2], expected_kN, atol=1e-3)
+
+
+def test_efficiency_formulas_broadcast_per_layout():
+    rows, cols = np.array([2, 3]), np.array([2, 3])
+    np.testing.assert_allclose(converse_labarre(rows, cols, 0.6, 1.5), HAND_COMPUTED["Converse-Labarre"], atol=5e-7)
+    np.testing.assert_allclose(feld(rows, cols), HAND_COMPUTED["Feld"], atol=5e-7)
+    np.testing.assert_allclose(los_angeles(rows, cols, 0.6, 1.5), HAND_COMPUTED["Los Angeles"], atol=5e-7)
+    # Diameter per layout: D/s = 0.5 -> theta = 26.5651 derajat, 2x2 -> 1 - theta/90 = 0.704833
+    result = group_efficiency([_grid(2, 2, 1.5), _grid(2, 2, 1.2)], [0.6, 0.6], [1.5, 1.2])
+    np.testing.assert_allclose(result.efficiency, [0.757762, 0.704833], atol=5e-7)
+    np.testing.assert_allclose(result.theta_deg, [21.801409, 26.565051], atol=5e-7)
+    # Satu tiang dan satu baris tanpa tetangga diagonal
+    np.testing.assert_allclose(feld([1, 1], [1, 4]), [1.0, 1 - 2 * 3 / 64])
+
+
+def test_group_efficiency_tolerance_clusters_survey_offsets():
+    # Kolom bergeser 4 mm di baris ganjil: satu kolom pada toleransi default, dua kolom bila tol_m = 0
+    layout = _grid(2, 2, 1.5, jitter_m=0.004)
+    default = group_efficiency([layout], 0.6, 1.5, method="Feld")
+    exact = group_efficiency([layout], 0.6, 1.5, method="Feld", tol_m=0.0)
+    assert (default.n_rows[0], default.n_cols[0]) == (2, 2)
+    assert (exact.n_rows[0], exact.n_cols[0]) == (2, 4)
+    assert default.efficiency[0] == pytest.approx(0.8125)
+    # Rantai celah <= tol_m tetap satu klaster walau ujung ke ujung > tol_m
+    chain = [(0.0, 0.0), (0.008, 1.5), (0.016, 3.0)]
+    assert grid_shape(PileLayouts.from_layouts([chain]))[1][0] == 1
+    with pytest.raises(ValueError, match="Tolerance"):
+        group_efficiency([layout], 0.6, 1.5, tol_m=-0.1)
+    with pytest.raises(ValueError, match="not supported"):
+        group_efficiency([layout], 0.6, 1.5, method="Seiler-Keeney")
+    with pytest.raises(ValueError, match="Spacing"):
+        group_efficiency([layout], 0.6, 0.0)
+
+
+def test_check_layouts_flags_close_and_overlapping_piles():
+    # Spasi minimum default 2.5D = 1.5 m
+    layouts = [_grid(2, 2, 1.5), _grid(2, 2, 1.2), np.vstack((_grid(2, 2, 2.0), [(0.4, 0.0)]))]
+    check = check_layouts(layouts, 0.6)
+    np.testing.assert_allclose(check.min_spacing_m, [1.5, 1.2, 0.4])
+    np.testing.assert_array_equal(check.n_too_close, [0, 4, 2])
+    np.testing.assert_array_equal(check.n_overlapping, [0, 0, 2])
+    np.testing.assert_allclose(check.nearest_m[8:], [0.4, 1.6, 2.0, 2.0, 0.4])
+    check = check_layouts(layouts, [0.6, 0.3, 0.6], min_spacing_m=1.0)
+    np.testing.assert_array_equal(check.n_too_close, [0, 0, 2])
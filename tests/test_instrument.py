@@ -0,0 +1,116 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from axpile import instrument as ins
+from axpile.calc import compute_capacity, compute_distributions
+from axpile.models import SoilLayer
+
+LAYERS = [SoilLayer(4.0, "clay", "clay", nspt=6.0), SoilLayer(8.0, "sand", "sand", nspt=30.0)]
+
+
+def _run(dz: float):
+    return compute_capacity("Decourt-Quaresma", 0.6, 8.0, 1.0, 2.5, None, "Franki piles", dz, LAYERS)
+
+
+@pytest.fixture(autouse=True)
+def _no_global_session():
+    ins.disable()
+    yield
+    ins.disable()
+
+
+def test_disabled_instrumentation_records_nothing():
+    assert ins.current_session() is None
+    assert _run(0.5).metrics is None
+    with ins.run_metrics(method="x") as metrics:
+        assert metrics is None
+        assert ins.stage("tip") is ins._NULL_STAGE
+        ins.count("depths", 3)
+
+
+def test_each_run_gets_its_own_metrics_and_sink_record(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    with ins.instrument(ins.JsonLinesSink(str(path))) as session:
+        coarse = _run(0.5)
+        fine = _run(0.1)
+    assert ins.current_session() is None
+    assert coarse.metrics is not fine.metrics
+    assert coarse.metrics.counters["depths"] == 16
+    assert fine.metrics.counters["depths"] == 80
+    assert coarse.metrics.info == {"method": "Decourt-Quaresma", "diameter_m": 0.6, "pile_depth_m": 8.0, "dz": 0.5}
+    assert {"expand_layers", "shaft", "tip", "total"} <= set(coarse.metrics.timings_s)
+    summary = session.summary()
+    assert summary["runs"] == 2
+    assert summary["counters"]["depths"] == 96
+    assert summary["timings_s"]["total"] == pytest.approx(
+        coarse.metrics.timings_s["total"] + fine.metrics.timings_s["total"]
+    )
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records == [coarse.metrics.as_dict(), fine.metrics.as_dict()]
+    # Run di luar blok tidak lagi dicatat
+    assert _run(0.5).metrics is None and session.summary()["runs"] == 2
+
+
+def test_nested_runs_share_the_outer_metrics():
+    records = []
+    with ins.instrument(records.append) as session:
+        compute_distributions("Decourt-Quaresma", 0.6, 8.0, 1.0, 2.5, None, "Franki piles", 0.5, LAYERS)
+        with ins.run_metrics(kind="outer") as outer:
+            inner_result = _run(0.5)
+            with ins.run_metrics(kind="inner") as inner:
+                ins.count("extra", 2)
+    assert inner is outer and inner_result.metrics is outer
+    assert outer.info == {"kind": "outer"}
+    assert outer.counters["depths"] == 16 and outer.counters["extra"] == 2
+    # compute_distributions: satu run berisi tahap dataframe dan depths dihitung sekali
+    assert len(records) == session.runs == 2
+    assert records[0]["counters"]["depths"] == 16
+    assert "dataframe" in records[0]["timings_s"]
+    # Setelah run terluar selesai, run berikutnya kembali mendapat metrik baru
+    with ins.instrument():
+        assert _run(0.5).metrics is not outer
+
+
+def test_concurrent_runs_are_isolated():
+    n_threads = 4
+    barrier = threading.Barrier(n_threads)
+
+    def step(i):
+        # Sesi per thread (ContextVar): hanya run thread ini yang tercatat
+        with ins.instrument() as session:
+            with ins.run_metrics(thread=i) as metrics:
+                for _ in range(3):
+                    barrier.wait()  # semua thread berada di dalam run-nya pada saat yang sama
+                    ins.count("ticks", i + 1)
+                    with ins.stage("work"):
+                        pass
+            result = _run(0.5 / (i + 1))
+        return session.summary(), metrics, result.metrics
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        outputs = list(executor.map(step, range(n_threads)))
+    assert ins.current_session() is None
+    for i, (summary, metrics, run) in enumerate(outputs):
+        assert metrics.info == {"thread": i}
+        assert metrics.counters == {"ticks": 3 * (i + 1)}
+        assert set(metrics.timings_s) == {"work", "total"}
+        assert run.counters["depths"] == 16 * (i + 1)
+        assert summary["runs"] == 2
+        assert summary["counters"] == {"ticks": 3 * (i + 1), **run.counters}
+
+
+def test_global_session_collects_all_threads_with_separate_run_metrics():
+    session = ins.enable()
+    dz_values = [0.5, 0.25, 0.1, 0.05]
+    with ThreadPoolExecutor(len(dz_values)) as executor:
+        runs = list(executor.map(lambda dz: _run(dz).metrics, dz_values * 3))
+    ins.disable()
+    assert len({id(m) for m in runs}) == len(runs)
+    np.testing.assert_array_equal([m.counters["depths"] for m in runs], [8 / dz for dz in dz_values * 3])
+    assert session.runs == len(runs)
+    assert session.summary()["counters"]["depths"] == sum(m.counters["depths"] for m in runs)
+    assert _run(0.5).metrics is None
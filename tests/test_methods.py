@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from axpile.calc import compute_capacity
+from axpile.geometry import compute_pile_perimeter_m_from_diameter, compute_pile_tip_area_m2_from_diameter
+from axpile.methods import METHODS, CapacityMethod, get_method, register_method
+from axpile.models import SoilLayer, validate_inputs
+
+
+@pytest.fixture
+def constant_method():
+    """Metode uji: qs = 40 kPa + 0.5 sigma_eff, qb = 900 kPa di semua lapisan."""
+
+    def shaft(profile, pile_type, pile_material):
+        return np.full(len(profile), 40.0), np.full(len(profile), 0.5)
+
+    def tip(profile, pile_type, pile_material):
+        return np.full(len(profile), 900.0)
+
+    def columns(profile, idx, sigma_z, pile_type, pile_material):
+        return {"Soil Behavior": profile.behavior_code[idx]}
+
+    method = register_method(
+        CapacityMethod(name="Constant", shaft=shaft, tip=tip, columns=columns, required={"clay": ("gamma_eff",)})
+    )
+    yield method
+    del METHODS[method.name]
+
+
+def test_registered_method_runs_through_compute_capacity(constant_method):
+    layers = [SoilLayer(4.0, "clay", "clay", gamma_eff=8.0), SoilLayer(6.0, "clay", "clay", gamma_eff=10.0)]
+    validate_inputs("Constant", 0.6, 8.0, 1.0, 2.5, 0.5, layers)
+    result = compute_capacity("Constant", 0.6, 8.0, 1.0, 2.5, None, None, 0.5, layers)
+    z = result.depth_m
+    sigma = np.where(z <= 4.0, 8.0 * z, 32.0 + 10.0 * (z - 4.0))
+    # Seperti Mayerhof: tiap lapisan memakai sigma_eff di dasarnya (maks. z), selimut dari cutoff 1 m
+    overlap_1 = np.clip(np.minimum(z, 4.0) - 1.0, 0.0, None)
+    overlap_2 = np.maximum(z - 4.0, 0.0)
+    qs_sum = 40.0 * (overlap_1 + overlap_2) + 0.5 * (8.0 * np.minimum(z, 4.0) * overlap_1 + sigma * overlap_2)
+    qfs = compute_pile_perimeter_m_from_diameter(0.6) * qs_sum
+    np.testing.assert_allclose(result["Qfs_kN"], qfs, rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(result["Qb_kN"], 900.0 * compute_pile_tip_area_m2_from_diameter(0.6))
+    with pytest.raises(ValueError, match="Clay Layer #1: Fill Effective Unit Weight"):
+        validate_inputs("Constant", 0.6, 8.0, 1.0, 2.5, 0.5, [SoilLayer(4.0, "clay", "clay")])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError, match="Method 'Schmertmann' is not supported"):
+        get_method("Schmertmann")
+
+
+def test_validate_inputs_reports_missing_parameters():
+    layers = [SoilLayer(3.0, "clay", "clay", su=40.0), SoilLayer(5.0, "sand", "sand")]
+    with pytest.raises(ValueError, match="Sand Layer #2: Fill NSPT"):
+        validate_inputs("Reese & Wright", 0.6, 6.0, 1.0, 2.5, 0.5, layers)
+    with pytest.raises(ValueError, match="Clay Layer #1: Fill Alpha"):
+        validate_inputs("Mayerhof", 0.6, 6.0, 1.0, 2.5, 0.5, layers)
+    with pytest.raises(ValueError, match="Sand Layer #2: NSPT should > 0"):
+        validate_inputs("Reese & Wright", 0.6, 6.0, 1.0, 2.5, 0.5, [layers[0], SoilLayer(5.0, "sand", "sand", nspt=0)])
+    with pytest.raises(ValueError, match="layer #1 thickness should > 0"):
+        validate_inputs("Mayerhof", 0.6, 6.0, 1.0, 2.5, 0.5, [SoilLayer(0.0, "clay", "clay")])
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from axpile.models import (
+    KDP_KPA,
+    PILE_ALPHA,
+    PILE_BETA,
+    PILE_TYPES,
+    SOIL_TYPES,
+    Kdp,
+    PileData_alpha,
+    PileData_beta,
+    SoilBehavior,
+    SoilLayer,
+    SoilProfile,
+    pile_type_code,
+    soil_type_table_index,
+)
+
+
+def test_lookup_tables_match_dictionaries():
+    for pile_type in PILE_TYPES:
+        code = pile_type_code(pile_type)
+        for b, behavior in enumerate(SoilBehavior):
+            assert PILE_ALPHA[code, b] == PileData_alpha[pile_type][behavior]
+            assert PILE_BETA[code, b] == PileData_beta[pile_type][behavior]
+        assert np.isnan(PILE_ALPHA[code, -1])
+    np.testing.assert_array_equal(KDP_KPA[: len(SOIL_TYPES)], [Kdp[name] for name in SOIL_TYPES])
+    with pytest.raises(ValueError, match="is not supported"):
+        pile_type_code("Franki pile")
+
+
+def test_profile_round_trip_keeps_free_text_soil_types():
+    layers = [
+        SoilLayer(2.0, "clay", "stiff clay", su=50.0),
+        SoilLayer(3.0, "sand", "dense gravelly sand", nspt=30.0),
+        SoilLayer(1.0, "sand", "silty sand", nspt=12.0),
+        SoilLayer(1.0, "sand", None, nspt=12.0),
+    ]
+    profile = SoilProfile.from_layers(layers)
+    assert profile.to_layers() == layers
+    assert list(profile.truncate(4.0).soil_type) == ["stiff clay", "dense gravelly sand"]
+    # Jenis tanah teks bebas jatuh ke sentinel NaN pada tabel Kdp
+    kdp = KDP_KPA[soil_type_table_index(profile.soil_type_code)]
+    assert np.isnan(kdp[[0, 1, 3]]).all()
+    assert kdp[2] == Kdp["silty sand"]
+
+
+def test_unknown_soil_behavior_is_coded_minus_one():
+    profile = SoilProfile.from_layers([SoilLayer(1.0, "peat", "peat"), SoilLayer(1.0, "clay", "clay")])
+    np.testing.assert_array_equal(profile.behavior_code, [-1, SoilBehavior.index("clay")])
+    assert list(profile.behavior) == [None, "clay"]
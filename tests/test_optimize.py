@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from reference import METHODS, random_cases
+
+from axpile.calc import compute_capacity
+from axpile.models import SoilLayer
+from axpile.optimize import PileOptimizer
+
+DIAMETERS = [0.3, 0.6, 1.2]
+DZ = 0.5
+
+
+def _scan(method, layers, cutoff_m, fs, depths, diameter_m, pile_material=None, pile_types=None) -> np.ndarray:
+    """Qall recap per kedalaman kandidat, satu ``compute_capacity`` per kedalaman."""
+    return np.array(
+        [
+            compute_capacity(method, diameter_m, depth, cutoff_m, fs, pile_material, pile_types, DZ, layers).recap[
+                "Qall_total_kN"
+            ]
+            for depth in depths
+        ]
+    )
+
+
+def _brute_force(curves: dict, depths: np.ndarray, cutoff_m: float, target_kN: float):
+    """(volume, kedalaman, diameter) termurah dengan Qall >= target, dicari linear."""
+    best = None
+    for d, curve in curves.items():
+        ok = np.flatnonzero(curve >= target_kN)  # NaN tidak pernah memenuhi
+        if len(ok) == 0:
+            continue
+        depth = depths[ok[0]]
+        candidate = (np.pi * d**2 / 4.0 * (depth - cutoff_m), depth, d)
+        if best is None or candidate[:2] < best[:2]:
+            best = candidate
+    return best
+
+
+def _check(optimizer: PileOptimizer, curves: dict, cutoff_m: float) -> None:
+    for d, curve in curves.items():
+        np.testing.assert_allclose(optimizer.curve(d), curve, rtol=1e-9, equal_nan=True)
+    # Target di tengah dua nilai Qall berurutan, agar selisih pembulatan tidak mengubah pilihan
+    finite = np.unique(np.concatenate([c[np.isfinite(c)] for c in curves.values()]))
+    mids = 0.5 * (finite[1:] + finite[:-1])
+    targets = np.concatenate(([finite[0] - 1.0], mids[:: max(1, len(mids) // 12)], [finite[-1] + 1.0]))
+    for target in targets:
+        best = optimizer.optimize(target, list(curves))
+        expected = _brute_force(curves, optimizer.depths, cutoff_m, target)
+        if expected is None:
+            assert best is None
+            continue
+        volume, depth, d = expected
+        assert (best.diameter_m, best.pile_depth_m) == (d, depth)
+        assert best.volume_m3 == pytest.approx(volume)
+        assert best.qall_kN >= target
+        assert best.qall_kN == pytest.approx(curves[d][np.searchsorted(optimizer.depths, depth)], rel=1e-9)
+
+
+def test_optimizer_matches_brute_force_with_undefined_and_non_monotone_capacity():
+    # Tanpa NSPT di 3 m teratas -> Qall NaN di kedalaman dangkal; lempung lunak di 9-11 m menurunkan Qall
+    layers = [
+        SoilLayer(3.0, "clay", "clay", nspt=0.0),
+        SoilLayer(6.0, "sand", "sand", nspt=45.0),
+        SoilLayer(2.0, "clay", "clay", nspt=3.0),
+        SoilLayer(4.0, "sand", "sand", nspt=30.0),
+    ]
+    args = ("Decourt-Quaresma", layers, 1.0, 2.5)
+    optimizer = PileOptimizer(*args, max_depth_m=20.0, dz=DZ, pile_types="Franki piles")
+    # Kedalaman kandidat dibatasi dasar profil (15 m) dan dimulai di bawah cutoff
+    np.testing.assert_allclose(optimizer.depths, np.arange(1.5, 15.0 + DZ / 2, DZ))
+    curves = {d: _scan(*args, optimizer.depths, d, pile_types="Franki piles") for d in DIAMETERS}
+    assert all(np.isnan(c[:3]).all() and np.isfinite(c[4:]).all() for c in curves.values())
+    assert any(np.any(np.diff(c[np.isfinite(c)]) < 0.0) for c in curves.values())
+    _check(optimizer, curves, cutoff_m=1.0)
+    assert optimizer.minimum_depth(0.6, 1.0) == optimizer.depths[np.isfinite(curves[0.6])][0]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_optimizer_matches_brute_force_on_random_profiles(method):
+    # Reese & Wright tanpa sumbu varian; Decourt-Quaresma per tipe tiang; Mayerhof per material
+    for kwargs, layers in random_cases(seed=5, n=3, methods=[method]):
+        if kwargs["pile_depth_m"] <= kwargs["cutoff_m"] + DZ:
+            continue
+        variant = dict(pile_material=kwargs["pile_material"], pile_types=kwargs["pile_types"])
+        optimizer = PileOptimizer(
+            method, layers, kwargs["cutoff_m"], kwargs["fs"], kwargs["pile_depth_m"], DZ, **variant
+        )
+        curves = {
+            d: _scan(method, layers, kwargs["cutoff_m"], kwargs["fs"], optimizer.depths, d, **variant)
+            for d in DIAMETERS
+        }
+        _check(optimizer, curves, kwargs["cutoff_m"])
@@ -0,0 +1,136 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from axpile.calc import compute_capacity
+from axpile.geometry import compute_pile_perimeter_m_from_diameter, compute_pile_tip_area_m2_from_diameter
+from axpile.models import SoilLayer
+from axpile.reliability import ReliabilityResult, Uncertainty, monte_carlo_capacity
+
+MAYERHOF = dict(
+    method="Mayerhof",
+    diameter_m=0.6,
+    pile_depth_m=9.0,
+    cutoff_m=1.0,
+    fs=2.5,
+    pile_material="Concrete",
+    pile_types=None,
+    dz=0.5,
+    layers=[
+        SoilLayer(4.0, "clay", "clay", su=40.0, alpha_tomlinson=0.8, gamma_eff=7.0),
+        SoilLayer(3.0, "sand", "sand", gamma_eff=9.0, phi=33.0),
+        SoilLayer(4.0, "clay", "clay", su=90.0, alpha_tomlinson=0.6, gamma_eff=8.0),
+    ],
+)
+UNCERTAINTIES = {"su": Uncertainty(0.3), "phi": Uncertainty(0.1, "normal"), "gamma_eff": Uncertainty(0.05)}
+
+
+def test_split_runs_combine_to_the_single_run():
+    args = dict(
+        MAYERHOF,
+        uncertainties=UNCERTAINTIES,
+        design_load_kN=150.0,
+        block_size=100,
+        seed=42,
+        layer_correlation=0.5,
+        keep_samples=True,
+    )
+    full = monte_carlo_capacity(n_samples=1000, **args)
+    parts = [monte_carlo_capacity(n_samples=n, first_block=b, **args) for b, n in [(5, 500), (0, 300), (3, 200)]]
+    combined = ReliabilityResult.combine(parts)
+    assert combined.n_samples == 1000
+    np.testing.assert_array_equal(combined.qall_kN, full.qall_kN)
+    np.testing.assert_array_equal(combined.failures, full.failures)
+    np.testing.assert_array_equal(combined.hist_counts, full.hist_counts)
+    np.testing.assert_array_equal(combined.qall_min_kN, full.qall_min_kN)
+    np.testing.assert_allclose(combined.qall_mean_kN, full.qall_mean_kN, rtol=1e-12)
+    np.testing.assert_allclose(combined.qall_std_kN, full.qall_std_kN, rtol=1e-9)
+    np.testing.assert_allclose(full.qall_mean_kN, full.qall_kN.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(full.qall_std_kN, full.qall_kN.std(axis=0), rtol=1e-9)
+    # Seed sama, tanpa first_block: sampel identik; seed lain: berbeda
+    again = monte_carlo_capacity(n_samples=1000, **args)
+    np.testing.assert_array_equal(again.qall_kN, full.qall_kN)
+    other = monte_carlo_capacity(n_samples=1000, **{**args, "seed": 43})
+    assert not np.array_equal(other.qall_kN, full.qall_kN)
+    with pytest.raises(ValueError, match="different seeds"):
+        ReliabilityResult.combine([full, other])
+
+
+def test_histogram_percentiles_match_kept_samples():
+    args = dict(MAYERHOF, uncertainties=UNCERTAINTIES, design_load_kN=150.0, n_samples=20_000, seed=7)
+    kept = monte_carlo_capacity(keep_samples=True, **args)
+    sketch = monte_carlo_capacity(**args)
+    np.testing.assert_array_equal(sketch.hist_counts, kept.hist_counts)
+    width = sketch.hist_edges[:, 1] - sketch.hist_edges[:, 0]
+    exact = np.percentile(kept.qall_kN, [5, 50, 95], axis=0)
+    for values, (p, approx) in zip(exact, sketch.percentiles((5, 50, 95)).items()):
+        np.testing.assert_array_equal(kept.percentiles((p,))[p], values)
+        assert np.all(np.abs(approx - values) <= width)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal"])
+def test_zero_variance_reproduces_deterministic_run(distribution):
+    qall = compute_capacity(**MAYERHOF).qall_kN
+    design_load = float(np.median(qall))
+    uncertainties = {name: Uncertainty(0.0, distribution) for name in ("su", "phi", "gamma_eff")}
+    result = monte_carlo_capacity(
+        **MAYERHOF, uncertainties=uncertainties, design_load_kN=design_load, n_samples=50, block_size=16, seed=1
+    )
+    np.testing.assert_allclose(result.qall_mean_kN, qall, rtol=1e-12)
+    np.testing.assert_allclose(result.qall_std_kN, 0.0, atol=1e-9)
+    np.testing.assert_array_equal(result.failure_probability, (qall < design_load).astype(float))
+    np.testing.assert_array_equal(result.reliability_index, np.where(qall < design_load, -np.inf, np.inf))
+    assert result.undefined.sum() == 0
+
+
+def test_failure_probability_matches_lognormal_closed_form():
+    # Satu lapisan lempung Mayerhof: Qall linear terhadap Su, jadi Pf = Phi((ln(Q_d / Q_mean) + s^2 / 2) / s)
+    layers = [SoilLayer(12.0, "clay", "clay", su=60.0, alpha_tomlinson=0.7, gamma_eff=8.0)]
+    args = dict(MAYERHOF, layers=layers)
+    qall = compute_capacity(**args).qall_kN[-1]
+    ab_m2 = compute_pile_tip_area_m2_from_diameter(0.6)
+    perim_m = compute_pile_perimeter_m_from_diameter(0.6)
+    assert qall == pytest.approx(60.0 * (9 * ab_m2 + 0.7 * perim_m * 8.0) / 2.5)
+    cov, design_load = 0.3, 0.7 * qall
+    s = math.sqrt(math.log1p(cov**2))
+    pf = NormalDist().cdf((math.log(design_load / qall) + 0.5 * s**2) / s)
+    result = monte_carlo_capacity(
+        **args, uncertainties={"su": Uncertainty(cov)}, design_load_kN=design_load, n_samples=200_000, seed=3
+    )
+    n = result.n_samples
+    assert result.failure_probability[-1] == pytest.approx(pf, abs=4 * math.sqrt(pf * (1 - pf) / n))
+    assert result.summary()["Beta"] == pytest.approx(-NormalDist().inv_cdf(pf), abs=0.02)
+
+
+def test_undefined_samples_are_counted_as_failures_and_excluded_from_statistics():
+    # NSPT normal dengan cov 1 terpotong di nol pada ~16% sampel: zona 4D tanpa NSPT -> Qall NaN
+    result = monte_carlo_capacity(
+        method="Decourt-Quaresma",
+        diameter_m=0.6,
+        pile_depth_m=8.0,
+        cutoff_m=1.0,
+        fs=2.5,
+        pile_material=None,
+        pile_types="Franki piles",
+        dz=0.5,
+        layers=[SoilLayer(12.0, "sand", "sand", nspt=20.0)],
+        uncertainties={"nspt": Uncertainty(1.0, "normal")},
+        design_load_kN=1.0,
+        n_samples=3000,
+        block_size=256,
+        seed=11,
+        keep_samples=True,
+    )
+    undefined = np.isnan(result.qall_kN)
+    assert undefined.any()
+    np.testing.assert_array_equal(result.undefined, undefined.sum(axis=0))
+    np.testing.assert_array_equal(result.failures, ((result.qall_kN < 1.0) | undefined).sum(axis=0))
+    np.testing.assert_allclose(result.qall_mean_kN, np.nanmean(result.qall_kN, axis=0), rtol=1e-12)
+    np.testing.assert_allclose(result.qall_std_kN, np.nanstd(result.qall_kN, axis=0), rtol=1e-9)
+    np.testing.assert_array_equal(result.qall_min_kN, np.nanmin(result.qall_kN, axis=0))
+    np.testing.assert_array_equal(result.hist_counts.sum(axis=1), (~undefined).sum(axis=0))
+    summary = result.summary()
+    assert summary["n_undefined"] == undefined[:, -1].sum()
+    assert math.isfinite(summary["Qall_mean_kN"]) and math.isfinite(summary["Qall_P50_kN"])
@@ -0,0 +1,63 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from reference import METHODS, random_cases
+
+from axpile.calc import compute_capacity
+from axpile.models import SoilLayer
+from axpile.plots import plot_tornado
+from axpile.sensitivity import sensitivity_analysis
+
+REL_STEP = 0.1
+
+
+def _tip_qall(kwargs: dict, layers) -> float:
+    """Qall di baris terakhir ``compute_capacity`` (NaN bila input ditolak)."""
+    try:
+        return float(compute_capacity(layers=layers, **kwargs).qall_kN[-1])
+    except ValueError:
+        return np.nan
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_one_at_a_time_matches_scaled_compute_capacity(method):
+    for kwargs, layers in random_cases(seed=22, n=6, methods=[method]):
+        result = sensitivity_analysis(layers=layers, rel_step=REL_STEP, **kwargs)
+        assert result.base_qall_kN == pytest.approx(_tip_qall(kwargs, layers), rel=1e-12)
+        for name, k, value, low, high in zip(
+            result.parameter, result.layer, result.value, result.qall_low_kN, result.qall_high_kN
+        ):
+            for factor, got in ((1.0 - REL_STEP, low), (1.0 + REL_STEP, high)):
+                if k < 0:
+                    assert value == kwargs[name]
+                    expected = _tip_qall({**kwargs, name: value * factor}, layers)
+                else:
+                    assert value == getattr(layers[k], name)
+                    scaled = list(layers)
+                    scaled[k] = replace(layers[k], **{name: value * factor})
+                    expected = _tip_qall(kwargs, scaled)
+                np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9, err_msg=f"{name} layer {k}")
+
+
+def test_tornado_is_ordered_by_swing_with_undefined_last():
+    layers = [
+        SoilLayer(2.0, "clay", "clay", nspt=4.0),
+        SoilLayer(3.0, "sand", "sand", nspt=25.0),
+        SoilLayer(5.0, "sand", "sand", nspt=40.0),
+    ]
+    # Tebal lapisan terakhir -10%: profil berakhir di 9.5 m, di atas ujung tiang 10 m -> NaN
+    result = sensitivity_analysis("Decourt-Quaresma", 0.6, 10.0, 1.0, 2.5, None, "Franki piles", 0.5, layers)
+    swing = result.swing_kN
+    defined = ~np.isnan(swing)
+    assert not defined.all() and np.all(defined[: defined.sum()])
+    assert np.all(np.diff(swing[defined]) <= 0.0)
+    assert ("thickness_m", 2) in zip(result.parameter[~defined], result.layer[~defined])
+    # Diameter (Ab ~ D^2) paling dominan; NSPT lapisan ujung di atas NSPT lapisan teratas
+    assert result.labels[0] == "diameter_m"
+    assert result.labels.index("nspt (layer 3)") < result.labels.index("nspt (layer 1)")
+
+    fig = plot_tornado(result, top_n=4)
+    assert list(fig.data[0].y) == result.labels[:4]
+    np.testing.assert_allclose(fig.data[0].x + fig.data[0].base, result.qall_low_kN[:4])
+    np.testing.assert_allclose(fig.data[1].x + fig.data[1].base, result.qall_high_kN[:4])
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+import pytest
+from reference import METHODS, random_case
+
+from axpile.calc import compute_capacity
+from axpile.methods import get_method
+from axpile.models import PileMaterial
+from axpile.sweep import sweep_distributions
+
+DIAMETERS = [0.4, 0.8]
+FS_VALUES = [2.0, 3.0]
+DZ = 0.1
+
+
+def _cases(method, n=8, seed=4):
+    rng = random.Random(seed)
+    for _ in range(n):
+        kwargs, layers = random_case(rng, method)
+        # Kedalaman kelipatan dz agar baris terakhir grid jatuh tepat di ujung tiang
+        depths = np.round(np.arange(1, int(kwargs["pile_depth_m"] / DZ) + 1) * DZ, 1)[::5]
+        yield kwargs["cutoff_m"], depths, layers
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_sweep_matches_per_case_loop(method):
+    spec = get_method(method)
+    variants = {"pile_type": list(spec.variants)[:3], "pile_material": list(PileMaterial), None: [None]}[spec.variant]
+    for cutoff_m, depths, layers in _cases(method):
+        sweep = sweep_distributions(
+            method,
+            DIAMETERS,
+            depths,
+            cutoff_m,
+            FS_VALUES,
+            layers,
+            pile_types=variants if spec.variant == "pile_type" else None,
+            pile_materials=variants if spec.variant == "pile_material" else None,
+        )
+        qall = sweep.data["Qall_kN"]
+        if spec.variant is None:
+            assert sweep.dims == ("diameter_m", "pile_depth_m", "fs")
+            qall = qall[:, None]
+        else:
+            assert sweep.dims == ("diameter_m", spec.variant, "pile_depth_m", "fs")
+        assert qall.shape == (len(DIAMETERS), len(variants), len(depths), len(FS_VALUES))
+        for a, diameter in enumerate(DIAMETERS):
+            for b, variant in enumerate(variants):
+                for c, depth in enumerate(depths):
+                    for d, fs in enumerate(FS_VALUES):
+                        try:
+                            recap = compute_capacity(
+                                method, diameter, depth, cutoff_m, fs,
+                                variant if spec.variant == "pile_material" else None,
+                                variant if spec.variant == "pile_type" else None,
+                                DZ, layers,
+                            ).recap
+                        except ValueError:
+                            continue
+                        assert qall[a, b, c, d] == pytest.approx(recap["Qall_total_kN"], rel=1e-7, abs=1e-6, nan_ok=True)
+
+
+def test_sweep_frame_has_one_row_per_combination():
+    _, depths, layers = next(_cases("Reese & Wright"))
+    sweep = sweep_distributions("Reese & Wright", DIAMETERS, depths, 0.5, FS_VALUES, layers)
+    frame = sweep.to_frame()
+    assert list(frame.columns[:3]) == ["diameter_m", "pile_depth_m", "fs"]
+    assert len(frame) == len(DIAMETERS) * len(depths) * len(FS_VALUES)